@@ -66,6 +66,9 @@ class StatDist:
         Type of statistical distribution
     parameters : namedtuple
         Statistical distribution parameters
+    buffer_size : int
+        Number of values drawn at a time for single draws, single draws
+        are not buffered if the buffer size is 1 or less
 
 
     Methods
@@ -73,6 +76,8 @@ class StatDist:
     draw(random_instance, size)
         Returns array of drawn instances of the statistical distribution
         of given size
+    clear_buffer()
+        Discards the buffered values of the statistical distribution
     get_pdf(x)
         Returns the probability distribution function of
         the statistical distribution
@@ -86,15 +91,42 @@ class StatDist:
         self,
         stat_dist_type: StatDistType,
         parameters: namedtuple,
+        buffer_size: int = 1000,
     ):
         self.stat_dist_type = stat_dist_type
         self.parameters = parameters
+        self.buffer_size = buffer_size
+        self.clear_buffer()
+
+    def clear_buffer(self):
+        """
+        Discards the buffered values of the statistical distribution,
+        the next single draw draws a new block of values
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self._buffer = np.empty(0)
+        self._buffer_pos = 0
+        self._buffer_instance = None
 
     def draw(self, random_instance, size: int = 1):
         """
         Returns array of drawn instances of the statistical distribution
         of given size
 
+        Single draws are handed out from a buffer of values drawn a block
+        at a time from the random generator. The buffer is refilled when
+        it is empty, and when the draw is given another random generator
+        than the buffer was drawn from, so the drawn values only depend
+        on the random generator
+
         Parameters
         ----------
         random_instance : np.random.Generator
@@ -111,6 +143,42 @@ class StatDist:
         """
         if random_instance is None:
             random_instance = np.random.default_rng()
+        elif size == 1 and self.buffer_size > 1:
+            if (
+                random_instance is not self._buffer_instance
+                or self._buffer_pos >= len(self._buffer)
+            ):
+                self._buffer = self._draw_values(
+                    random_instance, self.buffer_size
+                )
+                self._buffer_pos = 0
+                self._buffer_instance = random_instance
+            drawn_values = self._buffer[
+                self._buffer_pos : self._buffer_pos + 1
+            ].copy()
+            self._buffer_pos += 1
+            return drawn_values
+        return self._draw_values(random_instance, size)
+
+    def _draw_values(self, random_instance, size: int):
+        """
+        Returns array of drawn instances of the statistical distribution
+        of given size, drawn directly from the random generator
+
+        Parameters
+        ----------
+        random_instance : np.random.Generator
+            Instance of a random generator
+        size : int
+            Size of drawn values
+
+        Returns
+        ----------
+        drawn_values : np.ndarray
+            Array of drawn instances of the statistical distribution
+            of given size
+
+        """
         drawn_values = None
         if self.stat_dist_type == StatDistType.UNIFORM_FLOAT:
             drawn_values = random_instance.uniform(
@@ -33,6 +33,11 @@ class TimeUnit(Enum):
     YEAR = 7
 
 
+# Types of the time quantities that are numbers without the slower
+# check against the abstract number type
+_NUMBER_TYPES = frozenset([int, float])
+
+
 class Time:
 
     """
@@ -80,6 +85,8 @@ class Time:
 
     """
 
+    __slots__ = ("quantity", "unit")
+
     SEC_per_MIN = 60
     MIN_per_HOUR = 60
     HOUR_per_DAY = 24
@@ -88,7 +95,9 @@ class Time:
     MONTH_per_YEAR = 12
 
     def __init__(self, quantity: float, unit: TimeUnit = TimeUnit.HOUR):
-        if not isinstance(quantity, Number):
+        if type(quantity) not in _NUMBER_TYPES and not isinstance(
+            quantity, Number
+        ):
             raise Exception("The time quantity must be a number.")
         self.quantity = quantity
         self.unit = unit
@@ -192,6 +201,8 @@ class Time:
             The time quantity of the class instance in the given unit
 
         """
+        if unit is self.unit:
+            return self.quantity
         time_quantity = 0
         if unit == TimeUnit.SECOND:
             time_quantity = self.get_seconds()
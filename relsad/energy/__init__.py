@@ -1,8 +1,13 @@
+from .cache import SheddingCache, SheddingStructure
 from .shedding import (
     shed_energy,
     _build_A_matrix,
+    _covers_demand,
+    _get_structure,
     _get_generation_bounds,
     _gather_bounds,
+    _get_supply_trees,
+    _shed_radial_loads,
     _shed_active_loads,
     _shed_active_energy,
     _shed_reactive_loads,
@@ -0,0 +1,226 @@
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SheddingStructure:
+    """
+    Structure of the energy shedding problem of a network, which only
+    depends on the buses, the connected lines and the line directions
+
+    ...
+
+    Attributes
+    ----------
+    buses : list
+        List of the buses in the problem
+    lines : list
+        List of the connected lines in the problem
+    A : scipy.sparse.csr_matrix
+        LHS constraint matrix
+    trafo_bus : np.ndarray
+        Boolean array that is True for the buses that are trafo buses
+        of a transmission network, with unlimited generation
+    neighbors : list
+        List with the neighbors of each bus, given as tuples of the
+        index of the neighboring bus and the index of the line
+    radial : bool
+        Indicates if the connected lines form a single radial tree
+        spanning all the buses
+    line_buses : np.ndarray
+        Index of the from bus (first column) and the to bus (second
+        column) of each line, None if a line has a bus outside the
+        problem
+    admittance : np.ndarray
+        Conductance (first row) and susceptance (second row) of each
+        line
+    stored_buses : tuple
+        The state store the bus state was last read from and the
+        indices of the buses in the store
+    """
+
+    def __init__(self, buses: list, lines: list, A, trafo_bus):
+        self.buses = buses
+        self.lines = lines
+        self.A = A
+        self.trafo_bus = trafo_bus
+        bus_index = {id(bus): idx for idx, bus in enumerate(buses)}
+        self.neighbors = [[] for _ in buses]
+        line_buses = list()
+        inside = True
+        for line_idx, line in enumerate(lines):
+            fbus_idx = bus_index.get(id(line.fbus))
+            tbus_idx = bus_index.get(id(line.tbus))
+            if fbus_idx is None or tbus_idx is None:
+                inside = False
+                continue
+            line_buses.append((fbus_idx, tbus_idx))
+            self.neighbors[fbus_idx].append((tbus_idx, line_idx))
+            self.neighbors[tbus_idx].append((fbus_idx, line_idx))
+        self.line_buses = (
+            np.array(line_buses, dtype=int).reshape(len(lines), 2)
+            if inside
+            else None
+        )
+        admittance = [1.0 / complex(line.r_pu, line.x_pu) for line in lines]
+        self.admittance = np.array(
+            [
+                [y.real for y in admittance],
+                [y.imag for y in admittance],
+            ],
+            dtype=float,
+        ).reshape(2, len(lines))
+        self.stored_buses = None
+        # The lines form a radial tree if they connect all buses
+        # without cycles
+        visited = [False] * len(buses)
+        if len(buses) > 0:
+            visited[0] = True
+            stack = [0]
+            while len(stack) > 0:
+                for neighbor_idx, _ in self.neighbors[stack.pop()]:
+                    if not visited[neighbor_idx]:
+                        visited[neighbor_idx] = True
+                        stack.append(neighbor_idx)
+        self.radial = (
+            inside
+            and len(buses) > 0
+            and len(lines) == len(buses) - 1
+            and all(visited)
+        )
+
+
+class SheddingCache:
+    """
+    Bounded least recently used cache of energy shedding problem
+    structures
+
+    The entries are keyed by the buses and the connected lines of a
+    network, including the line directions. The components are compared
+    by name, so the entries stay valid when the cache is pickled to the
+    Monte Carlo workers together with the power system
+
+    ...
+
+    Attributes
+    ----------
+    maxsize : int
+        The maximum number of cached structures
+    entries : OrderedDict
+        The cached structures, ordered from least to most recently used
+    hits : int
+        The number of lookups where the structure was found in the cache
+    misses : int
+        The number of lookups where the structure had to be built
+
+    Methods
+    ----------
+    get_key(buses, lines)
+        Returns the cache key of a network
+    get(key)
+        Returns the cached structure of a key, None if it is not cached
+    add(key, structure)
+        Adds a structure to the cache
+    clear()
+        Removes all entries and resets the counters
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise Exception("The shedding cache must hold at least one entry")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self):
+        return f"SheddingCache(hits={self.hits}, misses={self.misses})"
+
+    def __repr__(self):
+        return (
+            f"SheddingCache(maxsize={self.maxsize}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+    @staticmethod
+    def get_key(buses: list, lines: list):
+        """
+        Returns the cache key of a network
+
+        Parameters
+        ----------
+        buses : list
+            List of the buses in the network
+        lines : list
+            List of the connected lines in the network
+
+        Returns
+        ----------
+        key : tuple
+            The cache key
+
+        """
+        return (
+            tuple(buses),
+            tuple((line, line.fbus) for line in lines),
+        )
+
+    def get(self, key: tuple):
+        """
+        Returns the cached structure of a key, None if it is not cached
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key
+
+        Returns
+        ----------
+        structure : SheddingStructure
+            The cached structure
+
+        """
+        structure = self.entries.get(key)
+        if structure is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return structure
+
+    def add(self, key: tuple, structure: SheddingStructure):
+        """
+        Adds a structure to the cache
+
+        Parameters
+        ----------
+        key : tuple
+            The cache key
+        structure : SheddingStructure
+            The structure of the shedding problem
+
+        Returns
+        ----------
+        None
+
+        """
+        self.entries[key] = structure
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
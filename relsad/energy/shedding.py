@@ -2,11 +2,14 @@ import warnings
 
 import numpy as np
 from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
 
 from relsad.network.systems import PowerSystem, Transmission
 from relsad.Time import Time
 from relsad.utils import INF
 
+from .cache import SheddingCache, SheddingStructure
+
 np.set_printoptions(suppress=True, linewidth=np.nan)
 warnings.filterwarnings("ignore")
 
@@ -15,12 +18,20 @@ def shed_energy(
     power_system: PowerSystem,
     dt: Time,
     alpha: float = 1e-4,
+    shedding_cache: SheddingCache = None,
+    state_store=None,
 ):
     """
     Sheds the unsupplied loads of the power system over the
     time period, dt, using a linear minimization
     problem solved with linear programming
 
+    The problem is skipped when _covers_demand shows that the supply
+    covers the demand. When the connected lines form a radial tree, the
+    problem is solved directly on the tree by _shed_radial_loads, and
+    linear programming is only used for meshed networks and networks
+    with several connected generating buses
+
     See :doc:`/theory/opt` for more details.
 
     Parameters
@@ -31,6 +42,13 @@ def shed_energy(
         The current time step
     alpha : float
         Slack variable to cope with numerical noise
+    shedding_cache : SheddingCache, optional
+        Cache of problem structures, used to skip building the
+        constraint matrix when the power system has been analyzed
+        before with the same buses and connected lines
+    state_store : StateStore, optional
+        The state store of the power system the buses are attached to,
+        where the bus state is read from when the store is attached
 
     Problem formulation
     --------------------
@@ -56,33 +74,60 @@ def shed_energy(
 
     Returns
     -------
-    None
+    n_skipped : int
+        The number of shedding problems (active and reactive) that were
+        solved without linear programming, either skipped because the
+        supply covers the demand or solved by _shed_radial_loads
 
     """
-    buses = list(power_system.buses)
-    lines = [x for x in power_system.lines if x.connected]
+    # Get the problem structure with the lhs constraint matrix
+    structure = _get_structure(power_system, shedding_cache)
+    buses = structure.buses
+    lines = structure.lines
+    A = structure.A
     N_D = len(buses)
     N_L = len(lines)
     # Define cost function
-    c = [x.get_cost() for x in buses] + [0] * N_L + [0] * N_D + [0]
-    # Get loads
-    p_b = [max(0, bus.pload) for bus in buses]  # Active bus load
-    q_b = [max(0, bus.qload) for bus in buses]  # Reactive bus load
-    # Building lhs contraint matrix
-    A = _build_A_matrix(power_system)
+    c = np.zeros(N_D + N_L + N_D + 1)
+    c[:N_D] = [x.get_cost() for x in buses]
     # Gather bounds
-    p_bounds, q_bounds = _gather_bounds(power_system, alpha)
-    if sum(p_b) > alpha:
-        # Shed active loads
-        shedded_active_bus_loads = _shed_active_loads(
+    p_bounds, q_bounds = _gather_bounds(
+        power_system, alpha, structure, state_store
+    )
+    # Get loads
+    p_b = p_bounds[:N_D, 1].copy()  # Active bus load
+    q_b = q_bounds[:N_D, 1].copy()  # Reactive bus load
+    n_skipped = 0
+    if sum(p_b) > alpha and _covers_demand(
+        structure=structure,
+        c=c,
+        bounds=p_bounds,
+    ):
+        # No active load has to be shed
+        n_skipped += 1
+    elif sum(p_b) > alpha:
+        # Shed active loads, using the tree solver for radial
+        # single source networks
+        shedded_active_bus_loads = _shed_radial_loads(
+            structure=structure,
             c=c,
-            A=A,
-            p_b=p_b,
-            p_bounds=p_bounds,
-            buses=buses,
-            lines=lines,
-            alpha=alpha,
+            bounds=p_bounds,
         )
+        if shedded_active_bus_loads is None:
+            shedded_active_bus_loads = _shed_active_loads(
+                c=c,
+                A=A,
+                p_b=p_b,
+                p_bounds=p_bounds,
+                buses=buses,
+                lines=lines,
+                alpha=alpha,
+            )
+        else:
+            # Solved without linear programming
+            n_skipped += 1
+            if c[:N_D] @ shedded_active_bus_loads <= 0:
+                shedded_active_bus_loads = None
         if shedded_active_bus_loads is not None:
             # Shed active energy
             _shed_active_energy(
@@ -91,17 +136,36 @@ def shed_energy(
                 alpha=alpha,
                 dt=dt,
             )
-    if sum(q_b) > alpha:
-        # Shed reactive loads
-        shedded_reactive_bus_loads = _shed_reactive_loads(
+    if sum(q_b) > alpha and _covers_demand(
+        structure=structure,
+        c=c,
+        bounds=q_bounds,
+    ):
+        # No reactive load has to be shed
+        n_skipped += 1
+    elif sum(q_b) > alpha:
+        # Shed reactive loads, using the tree solver for radial
+        # single source networks
+        shedded_reactive_bus_loads = _shed_radial_loads(
+            structure=structure,
             c=c,
-            A=A,
-            q_b=q_b,
-            q_bounds=q_bounds,
-            buses=buses,
-            lines=lines,
-            alpha=alpha,
+            bounds=q_bounds,
         )
+        if shedded_reactive_bus_loads is None:
+            shedded_reactive_bus_loads = _shed_reactive_loads(
+                c=c,
+                A=A,
+                q_b=q_b,
+                q_bounds=q_bounds,
+                buses=buses,
+                lines=lines,
+                alpha=alpha,
+            )
+        else:
+            # Solved without linear programming
+            n_skipped += 1
+            if c[:N_D] @ shedded_reactive_bus_loads <= 0:
+                shedded_reactive_bus_loads = None
         if shedded_reactive_bus_loads is not None:
             # Shed reactive energy
             _shed_reactive_energy(
@@ -110,6 +174,56 @@ def shed_energy(
                 alpha=alpha,
                 dt=dt,
             )
+    return n_skipped
+
+
+def _get_structure(
+    power_system: PowerSystem,
+    shedding_cache: SheddingCache = None,
+):
+    """
+    Returns the structure of the shedding problem of the power system,
+    from the cache if it has been built before
+
+    Parameters
+    ----------
+    power_system : PowerSystem
+        The power system that is under consideration
+    shedding_cache : SheddingCache, optional
+        Cache of problem structures
+
+    Returns
+    -------
+    structure : SheddingStructure
+        The structure of the shedding problem
+
+    """
+    buses = list(power_system.buses)
+    lines = [x for x in power_system.lines if x.connected]
+    if shedding_cache is not None:
+        key = shedding_cache.get_key(buses, lines)
+        structure = shedding_cache.get(key)
+        if structure is not None:
+            return structure
+    structure = SheddingStructure(
+        buses=buses,
+        lines=lines,
+        A=_build_A_matrix(power_system),
+        trafo_bus=np.array(
+            [
+                any(
+                    bus == child_network.get_trafo_bus()
+                    for child_network in power_system.child_network_list
+                    if isinstance(child_network, Transmission)
+                )
+                for bus in buses
+            ],
+            dtype=bool,
+        ),
+    )
+    if shedding_cache is not None:
+        shedding_cache.add(key, structure)
+    return structure
 
 
 def _build_A_matrix(power_system: PowerSystem):
@@ -124,7 +238,7 @@ def _build_A_matrix(power_system: PowerSystem):
 
     Returns
     -------
-    A : array
+    A : scipy.sparse.csr_matrix
         LHS Constraint matrix
 
     """
@@ -133,22 +247,34 @@ def _build_A_matrix(power_system: PowerSystem):
     lines = [x for x in power_system.lines if x.connected]
     N_D = len(buses)
     N_L = len(lines)
-    A = np.zeros((N_D, N_D + N_L + N_D + 1))
+    line_index = {line: index for index, line in enumerate(lines)}
+    rows = list()
+    cols = list()
+    data = list()
     for j, bus in enumerate(buses):
         # Load shed coefficients
-        A[j, j] = 1  # mu_md
+        rows.append(j)
+        cols.append(j)
+        data.append(1)  # mu_md
         # Line load coefficients
         for line in bus.connected_lines:
             if line.connected:
-                index = lines.index(line)
-                if bus == line.fbus:
-                    A[j, N_D + index] = -1
-                else:
-                    A[j, N_D + index] = 1
+                rows.append(j)
+                cols.append(N_D + line_index[line])
+                data.append(-1 if bus == line.fbus else 1)
         # Generation coefficients
-        A[j, N_D + N_L + j] = 1  # lambda_md
+        rows.append(j)
+        cols.append(N_D + N_L + j)
+        data.append(1)  # lambda_md
         # Slack parameter
-        A[j, -1] = 1
+        rows.append(j)
+        cols.append(N_D + N_L + N_D)
+        data.append(1)
+    A = csr_matrix(
+        (data, (rows, cols)),
+        shape=(N_D, N_D + N_L + N_D + 1),
+        dtype=float,
+    )
     return A
 
 
@@ -189,62 +315,415 @@ def _get_generation_bounds(power_system: PowerSystem):
 def _gather_bounds(
     power_system: PowerSystem,
     alpha: float,
+    structure: SheddingStructure = None,
+    state_store=None,
 ):
     """
     Returns the flow bounds between the components in the power system.
 
+    The bus state is read from the arrays of the state store when the
+    buses are attached to it, and the line flows are then found from
+    the bus voltages for all lines at once
+
     Parameters
     ----------
     power_system : PowerSystem
         The power system that is under consideration
     alpha : float
         Slack variable to cope with numerical noise
+    structure : SheddingStructure, optional
+        The structure of the shedding problem of the power system
+    state_store : StateStore, optional
+        The state store of the power system
 
     Returns
     -------
-    p_bounds : list
-        The active power bounds for a component
-    q_bounds : list
-        The reactive power bounds for a component
+    p_bounds : np.ndarray
+        The active power bounds for a component, one row per variable
+    q_bounds : np.ndarray
+        The reactive power bounds for a component, one row per variable
     """
 
+    if structure is None:
+        structure = _get_structure(power_system)
     # Gather bounds
-    buses = list(power_system.buses)
-    lines = [x for x in power_system.lines if x.connected]
+    buses = structure.buses
+    lines = structure.lines
     N_D = len(buses)
     N_L = len(lines)
-    # Get loads
-    p_b = [max(0, bus.pload) for bus in buses]  # Active bus load
-    q_b = [max(0, bus.qload) for bus in buses]  # Reactive bus load
-    p_bounds = list()
-    q_bounds = list()
-    # Get generation bounds
-    p_gen, q_gen = _get_generation_bounds(power_system)
-    for n in range(N_D + N_L + N_D):
-        if n < N_D:
-            # Bus load
-            p_bounds.append((0, p_b[n]))
-            q_bounds.append((0, q_b[n]))
-        elif N_D <= n < N_D + N_L:
-            # Line flow
-            line = lines[n - N_D]
-            # Line flow in MW
-            max_available_p_flow = line.get_line_load()[0] * line.s_ref
-            max_available_q_flow = line.get_line_load()[1] * line.s_ref
-            PL_p_max = min(line.capacity, abs(max_available_p_flow))
-            PL_q_max = min(line.capacity, abs(max_available_q_flow))
-            p_bounds.append((-PL_p_max, PL_p_max))
-            q_bounds.append((-PL_q_max, PL_q_max))
-        else:
-            # Bus generation
-            p_bounds.append((0, p_gen[n - (N_D + N_L)]))
-            q_bounds.append((0, q_gen[n - (N_D + N_L)]))
+    p_bounds = np.zeros((N_D + N_L + N_D + 1, 2))
+    q_bounds = np.zeros((N_D + N_L + N_D + 1, 2))
+    stored = state_store is not None and state_store.attached
+    if stored:
+        # Read the bus state from the arrays of the state store
+        if (
+            structure.stored_buses is None
+            or structure.stored_buses[0] is not state_store
+        ):
+            structure.stored_buses = (
+                state_store,
+                state_store.get_bus_indices(buses),
+            )
+        arrays = state_store.bus_arrays
+        indices = structure.stored_buses[1]
+        pload = arrays["pload"][indices]
+        qload = arrays["qload"][indices]
+        pprod = arrays["pprod"][indices]
+        qprod = arrays["qprod"][indices]
+    else:
+        pload = [bus.pload for bus in buses]
+        qload = [bus.qload for bus in buses]
+        pprod = [bus.pprod for bus in buses]
+        qprod = [bus.qprod for bus in buses]
+    # Bus load
+    p_bounds[:N_D, 1] = np.maximum(0, pload)
+    q_bounds[:N_D, 1] = np.maximum(0, qload)
+    # Line flow in MW
+    if stored and structure.line_buses is not None:
+        line_loads = _get_line_loads(
+            structure=structure,
+            vomag=arrays["vomag"][indices],
+            voang=arrays["voang"][indices],
+        )
+    else:
+        line_loads = np.array(
+            [line.get_line_load()[:2] for line in lines], dtype=float
+        ).reshape(N_L, 2)
+    s_ref = np.array([line.s_ref for line in lines], dtype=float)
+    capacity = np.array([line.capacity for line in lines], dtype=float)
+    PL_p_max = np.minimum(capacity, np.abs(line_loads[:, 0] * s_ref))
+    PL_q_max = np.minimum(capacity, np.abs(line_loads[:, 1] * s_ref))
+    p_bounds[N_D : N_D + N_L] = np.column_stack((-PL_p_max, PL_p_max))
+    q_bounds[N_D : N_D + N_L] = np.column_stack((-PL_q_max, PL_q_max))
+    # Bus generation
+    p_bounds[N_D + N_L : -1, 1] = np.where(
+        structure.trafo_bus,
+        INF,
+        np.maximum(0, pprod),
+    )
+    q_bounds[N_D + N_L : -1, 1] = np.where(
+        structure.trafo_bus,
+        INF,
+        np.maximum(0, qprod),
+    )
     # alpha bounds
-    p_bounds.append((-alpha, alpha))
-    q_bounds.append((-alpha, alpha))
+    p_bounds[-1] = (-alpha, alpha)
+    q_bounds[-1] = (-alpha, alpha)
     return p_bounds, q_bounds
 
 
+def _get_line_loads(
+    structure: SheddingStructure,
+    vomag: np.ndarray,
+    voang: np.ndarray,
+):
+    """
+    Returns the active and reactive power sent from each line in PU,
+    found from the bus voltages in the same way as Line.get_line_load
+
+    Parameters
+    ----------
+    structure : SheddingStructure
+        The structure of the shedding problem
+    vomag : np.ndarray
+        The voltage magnitude of each bus
+    voang : np.ndarray
+        The voltage angle of each bus
+
+    Returns
+    -------
+    line_loads : np.ndarray
+        The active (first column) and reactive (second column) power
+        sent from each line
+
+    """
+    g, b = structure.admittance
+    fbus_idx = structure.line_buses[:, 0]
+    tbus_idx = structure.line_buses[:, 1]
+    v1 = vomag[fbus_idx]
+    v2 = vomag[tbus_idx]
+    teta = voang[fbus_idx] - voang[tbus_idx]
+    p_from = g * v1 * v1 - v1 * v2 * (g * np.cos(teta) + b * np.sin(teta))
+    q_from = -b * v1 * v1 - v1 * v2 * (g * np.sin(teta) - b * np.cos(teta))
+    return np.column_stack((p_from, q_from))
+
+
+def _get_supply_trees(
+    structure: SheddingStructure,
+    bounds: np.ndarray,
+):
+    """
+    Splits the network into supply trees, each supplied by at most one
+    generating bus
+
+    The trees are found with a breadth first search from the generating
+    buses (and from the first bus of the buses that are not reached),
+    only following lines with flow capacity. For meshed networks the
+    trees span the buses with a subset of the lines, and the remaining
+    lines are left without flow
+
+    Parameters
+    ----------
+    structure : SheddingStructure
+        The structure of the shedding problem
+    bounds : np.ndarray
+        Variable boundaries, one row per variable
+
+    Returns
+    -------
+    order : list
+        Indices of the buses in breadth first order of the trees
+    parent : np.ndarray
+        Index of the parent bus of each bus, -1 for the roots
+    feed : np.ndarray
+        Capacity of the line feeding each bus, the generation for
+        the roots
+    is_root : np.ndarray
+        Boolean array that is True for the roots of the trees
+    size : np.ndarray
+        Number of buses in the subtree of each bus
+    subtree_demand : np.ndarray
+        Demand of the subtree of each bus
+    slack : float
+        Largest slack value that can satisfy the lower limits
+
+    None is returned if a tree has several generating buses, if the
+    bounds are undefined, or if the lower limits cannot be satisfied
+
+    """
+    if np.isnan(bounds).any():
+        return None
+    N_D = len(structure.buses)
+    N_L = len(structure.lines)
+    demand = bounds[:N_D, 1]
+    capacity = bounds[N_D : N_D + N_L, 1]
+    gen_max = bounds[N_D + N_L : N_D + N_L + N_D, 1]
+    # Find the trees, starting from the generating buses
+    parent = np.full(N_D, -1)
+    feed = np.zeros(N_D)
+    is_root = np.zeros(N_D, dtype=bool)
+    visited = np.zeros(N_D, dtype=bool)
+    order = list()
+    for root in np.concatenate(
+        (np.flatnonzero(gen_max > 0), np.flatnonzero(gen_max <= 0))
+    ):
+        if visited[root]:
+            if gen_max[root] > 0:
+                # Several generating buses in the tree
+                return None
+            continue
+        visited[root] = True
+        is_root[root] = True
+        feed[root] = gen_max[root]
+        position = len(order)
+        order.append(root)
+        while position < len(order):
+            idx = order[position]
+            position += 1
+            for neighbor_idx, line_idx in structure.neighbors[idx]:
+                if not visited[neighbor_idx] and capacity[line_idx] > 0:
+                    visited[neighbor_idx] = True
+                    parent[neighbor_idx] = idx
+                    feed[neighbor_idx] = capacity[line_idx]
+                    order.append(neighbor_idx)
+    # Number of buses and demand of each subtree
+    size = np.ones(N_D)
+    subtree_demand = demand.copy()
+    for idx in reversed(order):
+        if not is_root[idx]:
+            size[parent[idx]] += size[idx]
+            subtree_demand[parent[idx]] += subtree_demand[idx]
+    # Largest slack value that can satisfy the lower limits
+    slack = min(
+        bounds[-1, 1],
+        np.min(
+            np.where(is_root, subtree_demand, feed + subtree_demand) / size
+        ),
+    )
+    if slack < bounds[-1, 0]:
+        return None
+    return order, parent, feed, is_root, size, subtree_demand, slack
+
+
+def _covers_demand(
+    structure: SheddingStructure,
+    c: np.ndarray,
+    bounds: np.ndarray,
+):
+    """
+    Checks if the supply of the network covers the demand, so that no
+    load has to be shed
+
+    The total demand is first compared to the available generation,
+    which is unlimited for the trafo bus of a transmission network.
+    Then the demand of each subtree of the supply trees is compared to
+    the capacity of the line feeding the subtree, found from the load
+    flow results, and the demand of each tree is compared to the
+    generation of the tree. The check is sufficient, but not
+    necessary, for the loads to be covered
+
+    Parameters
+    ----------
+    structure : SheddingStructure
+        The structure of the shedding problem
+    c : np.ndarray
+        Coefficients of the objective function
+    bounds : np.ndarray
+        Variable boundaries, one row per variable
+
+    Returns
+    -------
+    covered : bool
+        Indicates if the demand is covered
+
+    """
+    N_D = len(structure.buses)
+    N_L = len(structure.lines)
+    if np.any(c[:N_D] < 0):
+        return False
+    # Total demand against available generation
+    total_generation = bounds[N_D + N_L : N_D + N_L + N_D, 1].sum()
+    if bounds[:N_D, 1].sum() > total_generation + N_D * bounds[-1, 1]:
+        return False
+    # Subtree demand against line capacity and generation
+    supply_trees = _get_supply_trees(structure, bounds)
+    if supply_trees is None:
+        return False
+    _, _, feed, _, size, subtree_demand, slack = supply_trees
+    return bool(np.all(subtree_demand <= size * slack + feed + 1e-9))
+
+
+def _shed_radial_loads(
+    structure: SheddingStructure,
+    c: np.ndarray,
+    bounds: np.ndarray,
+):
+    """
+    Solves the shedding problem of a radial network without linear
+    programming
+
+    The lines without flow capacity split the radial network into
+    islands, each supplied by at most one generating bus, which is used
+    as the root of the island (the first bus of the island is used if
+    there is none). The served load of each subtree is then limited by
+    the capacity of the line feeding the subtree, and the served load
+    of each island is limited by the generation. The loads are served
+    greedily in order of decreasing cost, each bus getting as much as
+    the remaining capacity on the path to the root allows, which is
+    optimal for these nested limits. The slack variable is set to the
+    largest value that can satisfy the lower limits of the line flows
+    and the generation
+
+    When loads with equal cost compete for the same exhausted capacity,
+    the optimal solution is not unique, and the choice between the
+    loads is left to linear programming so that the shedding is the
+    same as with _shed_active_loads and _shed_reactive_loads
+
+    Parameters
+    ----------
+    structure : SheddingStructure
+        The structure of the shedding problem
+    c : np.ndarray
+        Coefficients of the objective function
+    bounds : np.ndarray
+        Variable boundaries, one row per variable
+
+    Returns
+    -------
+    shedded_bus_loads : np.ndarray
+        The shedded bus loads of the current time increment, None if
+        the network is meshed, if an island has several generating
+        buses, if the bounds are undefined, if the solution does not
+        satisfy the lower limits, or if the optimal solution is not
+        unique
+
+    """
+    if not structure.radial:
+        return None
+    N_D = len(structure.buses)
+    cost = c[:N_D]
+    if np.any(cost < 0):
+        return None
+    supply_trees = _get_supply_trees(structure, bounds)
+    if supply_trees is None:
+        return None
+    order, parent, feed, is_root, size, _, slack = supply_trees
+    demand = bounds[:N_D, 1]
+    upper = size * slack + feed
+    lower = np.where(is_root, size * slack, size * slack - feed)
+    # Serve the loads in order of decreasing cost
+    paths = dict()
+    for idx in order:
+        paths[idx] = [idx] if is_root[idx] else [idx] + paths[parent[idx]]
+    residual = upper.copy()
+    served = np.zeros(N_D)
+    for idx in np.argsort(-cost, kind="stable"):
+        path = paths[idx]
+        served[idx] = max(0, min(demand[idx], residual[path].min()))
+        residual[path] -= served[idx]
+    # Check the lower limits of the served load of each subtree
+    subtree_served = served.copy()
+    for idx in reversed(order):
+        if not is_root[idx]:
+            subtree_served[parent[idx]] += subtree_served[idx]
+    if np.any(subtree_served < lower - 1e-9):
+        return None
+    if _has_equal_cost_alternative(
+        paths=paths,
+        cost=cost,
+        demand=demand,
+        served=served,
+        residual=residual,
+    ):
+        return None
+    return demand - served
+
+
+def _has_equal_cost_alternative(
+    paths: dict,
+    cost: np.ndarray,
+    demand: np.ndarray,
+    served: np.ndarray,
+    residual: np.ndarray,
+):
+    """
+    Checks if the served loads of the radial solver can be moved
+    between loads with equal cost without changing the cost of the
+    shedding, in which case the optimal solution is not unique
+
+    This is the case when a load that is not fully served is limited by
+    an exhausted capacity on the path to the root, and another load
+    with the same cost is served through the same capacity
+
+    Parameters
+    ----------
+    paths : dict
+        Indices of the buses on the path from each bus to the root
+    cost : np.ndarray
+        Cost of the load of each bus
+    demand : np.ndarray
+        Demand of each bus
+    served : np.ndarray
+        Served load of each bus
+    residual : np.ndarray
+        Remaining capacity of the subtree of each bus
+
+    Returns
+    -------
+    alternative : bool
+        Indicates if the optimal solution is not unique
+
+    """
+    tol = 1e-9
+    exhausted = residual <= tol
+    for idx in np.flatnonzero(served < demand - tol):
+        limits = {k for k in paths[idx] if exhausted[k]}
+        for other_idx in np.flatnonzero((cost == cost[idx]) & (served > tol)):
+            if other_idx != idx and not limits.isdisjoint(paths[other_idx]):
+                return True
+    return False
+
+
 def _shed_active_loads(
     c: list,
     A: list,
@@ -1,5 +1,6 @@
 from relsad.examples.tutorial.system import *
 
+from relsad.results.storage import read_results
 from relsad.simulation import Simulation
 
 sim = Simulation(power_system=ps, random_seed=0)
@@ -29,23 +30,20 @@ sim.run_monte_carlo(
     n_procs=1,
 )
 
-path = os.path.join(
-    "results",
-    "monte_carlo",
-    "ps1",
-    "ENS.csv",
+df = read_results(
+    os.path.join("results", "monte_carlo"),
+    components=["ps1"],
+    attributes=["ENS"],
 )
-
-df = pd.read_csv(path, index_col=0)
 fig, ax = plt.subplots()
-df.hist(ax=ax)
+df["value"].hist(ax=ax)
 
 fig.savefig(
     "ENS.png",
     dpi=600,
 )
 
-print(df.describe())
+print(df["value"].describe())
 
 import shutil
 
@@ -1,5 +1,6 @@
 from relsad.examples.tutorial.system import *
 
+from relsad.results.storage import read_results
 from relsad.simulation import Simulation
 
 
@@ -36,18 +37,15 @@ sim.run_sequential(
     save_dir="results",
 )
 
-path = os.path.join(
-    "results",
-    "sequence",
-    "ps1",
-    "ENS.csv",
+df = read_results(
+    os.path.join("results", "sequence"),
+    components=["ps1"],
+    attributes=["ENS"],
 )
-
-df = pd.read_csv(path)
 fig, ax = plt.subplots()
 df.plot(
     x="HOUR",
-    y="ps1",
+    y="value",
     ax=ax,
 )
 
@@ -56,7 +54,7 @@ fig.savefig(
     dpi=600,
 )
 
-print(df.describe())
+print(df["value"].describe())
 
 import shutil
 
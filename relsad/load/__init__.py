@@ -1,5 +1,10 @@
 from .bus import CostFunction
 
+from .profiles import (
+    MappedProfile,
+    ProfileRegistry,
+)
+
 __all__ = []
 for v in dir():
     if not v.startswith("__") and v != "relsad":
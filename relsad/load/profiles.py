@@ -0,0 +1,339 @@
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from relsad.utils import interpolate
+
+# The memory-mapped files opened in this process by file path
+_MAPPED_FILES = {}
+
+
+def _open_mapped_file(file_path: str, shape: tuple):
+    """
+    Returns the memory-mapped prepared profiles of a file, opened once
+    per process
+
+    Parameters
+    ----------
+    file_path : str
+        The path of the file
+    shape : tuple
+        The shape of the prepared profiles in the file
+
+    Returns
+    ----------
+    values : np.memmap
+        The prepared profiles, read-only
+
+    """
+    values = _MAPPED_FILES.get(file_path)
+    if values is None or values.shape != shape:
+        values = np.memmap(file_path, dtype=float, mode="r", shape=shape)
+        _MAPPED_FILES[file_path] = values
+    return values
+
+
+def _open_mapped_profile(file_path: str, shape: tuple, row: int):
+    """
+    Returns a prepared profile from a memory-mapped file
+
+    Parameters
+    ----------
+    file_path : str
+        The path of the file
+    shape : tuple
+        The shape of the prepared profiles in the file
+    row : int
+        The row of the profile in the file
+
+    Returns
+    ----------
+    profile : MappedProfile
+        The prepared profile
+
+    """
+    profile = np.asarray(_open_mapped_file(file_path, shape)[row]).view(
+        MappedProfile
+    )
+    profile.file_path = file_path
+    profile.file_shape = shape
+    profile.row = row
+    return profile
+
+
+class MappedProfile(np.ndarray):
+    """
+    Prepared profile held in a row of a memory-mapped file
+
+    The profile is pickled as a reference to its row in the file, so
+    that Monte Carlo workers map the file instead of receiving a copy
+    of the profile. Arrays derived from the profile are pickled as
+    ordinary arrays
+
+    ...
+
+    Attributes
+    ----------
+    file_path : str
+        The path of the file, None if the array is derived from a
+        profile
+    file_shape : tuple
+        The shape of the prepared profiles in the file
+    row : int
+        The row of the profile in the file
+    """
+
+    def __array_finalize__(self, obj):
+        self.file_path = None
+        self.file_shape = None
+        self.row = None
+
+    def __reduce__(self):
+        if self.file_path is None:
+            return np.asarray(self).__reduce__()
+        return (
+            _open_mapped_profile,
+            (self.file_path, self.file_shape, self.row),
+        )
+
+
+class ProfileRegistry:
+    """
+    Registry of the distinct load and production profiles of a power
+    system
+
+    Each distinct profile is stored once and interpolated once per
+    time grid, and the buses and production components reference the
+    profiles by id. Profiles are the same if they are the same array,
+    or if they are arrays with the same values. The prepared profiles
+    are held in memory, or in memory-mapped files if a directory for
+    the files is given before the profiles are prepared. The files of a
+    time grid are removed when the profiles are prepared for another
+    number of time increments, and all the files are removed when the
+    registry is closed
+
+    ...
+
+    Attributes
+    ----------
+    memmap_dir : str
+        Directory of the memory-mapped files of the prepared profiles,
+        the prepared profiles are held in memory if None
+    profiles : list
+        The distinct profiles
+    time_size : int
+        The number of time increments of the prepared profiles
+    prepared : list
+        The prepared profiles, interpolated to the time increments
+    file_paths : list
+        The paths of the memory-mapped files of the prepared profiles
+
+    Methods
+    ----------
+    add_profile(profile)
+        Adds a profile to the registry and returns the id of the
+        profile
+    get_profile(profile_id)
+        Returns a profile as added to the registry
+    prepare(time_indices)
+        Interpolates the profiles to the time increments
+    get_prepared(profile_id)
+        Returns a prepared profile
+    close()
+        Removes the memory-mapped files of the prepared profiles
+    """
+
+    def __init__(self, memmap_dir: str = None):
+        self.memmap_dir = memmap_dir
+        self.profiles = []
+        self.time_size = None
+        self.prepared = []
+        self.file_paths = []
+        # Distinct profiles and their ids by array id
+        self._ids_by_array = {}
+        # Profile ids by profile content
+        self._ids_by_content = {}
+
+    def __len__(self):
+        return len(self.profiles)
+
+    def __repr__(self):
+        return f"ProfileRegistry(profiles={len(self)})"
+
+    def add_profile(self, profile: np.ndarray):
+        """
+        Adds a profile to the registry and returns the id of the
+        profile, the id of the same profile if it is already added. The
+        distinct profile of the id is given by get_profile
+
+        Parameters
+        ----------
+        profile : np.ndarray
+            The profile
+
+        Returns
+        ----------
+        profile_id : int
+            The id of the profile
+
+        """
+        entry = self._ids_by_array.get(id(profile))
+        if entry is not None and entry[0] is profile:
+            return entry[1]
+        array = np.asarray(profile)
+        key = (
+            array.dtype.str,
+            array.shape,
+            hashlib.sha1(np.ascontiguousarray(array).tobytes()).digest(),
+        )
+        profile_id = None
+        for candidate_id in self._ids_by_content.get(key, []):
+            if np.array_equal(self.profiles[candidate_id], array):
+                profile_id = candidate_id
+                break
+        if profile_id is None:
+            profile_id = len(self.profiles)
+            self.profiles.append(array)
+            self._ids_by_content.setdefault(key, []).append(profile_id)
+            self._ids_by_array[id(array)] = (array, profile_id)
+        return profile_id
+
+    def get_profile(self, profile_id: int):
+        """
+        Returns a profile as added to the registry
+
+        Parameters
+        ----------
+        profile_id : int
+            The id of the profile
+
+        Returns
+        ----------
+        profile : np.ndarray
+            The profile
+
+        """
+        return self.profiles[profile_id]
+
+    def prepare(self, time_indices: np.ndarray):
+        """
+        Interpolates the profiles to the time increments, where only
+        the profiles that are not prepared for the number of time
+        increments are interpolated
+
+        Parameters
+        ----------
+        time_indices : np.ndarray
+            Time indices used to discretize the profiles
+
+        Returns
+        ----------
+        None
+
+        """
+        if time_indices.size != self.time_size:
+            # The files of the previous time grid are no longer used
+            self._remove_files()
+            self.time_size = time_indices.size
+            self.prepared = []
+        new_prepared = [
+            interpolate(array=profile, time_indices=time_indices)
+            for profile in self.profiles[len(self.prepared) :]
+        ]
+        if self.memmap_dir is not None and len(new_prepared) > 0:
+            new_prepared = self._map_prepared(new_prepared)
+        self.prepared.extend(new_prepared)
+
+    def _map_prepared(self, prepared: list):
+        """
+        Writes prepared profiles to a new memory-mapped file, and
+        returns the rows of the file
+
+        Parameters
+        ----------
+        prepared : list
+            The prepared profiles
+
+        Returns
+        ----------
+        mapped_profiles : list
+            The prepared profiles as rows of the file
+
+        """
+        os.makedirs(self.memmap_dir, exist_ok=True)
+        file_descriptor, file_path = tempfile.mkstemp(
+            prefix="profiles_",
+            suffix=".dat",
+            dir=self.memmap_dir,
+        )
+        os.close(file_descriptor)
+        shape = (len(prepared), self.time_size)
+        values = np.memmap(file_path, dtype=float, mode="w+", shape=shape)
+        values[:] = prepared
+        values.flush()
+        del values
+        self.file_paths.append(file_path)
+        return [
+            _open_mapped_profile(file_path, shape, row)
+            for row in range(len(prepared))
+        ]
+
+    def _remove_files(self):
+        """
+        Removes the memory-mapped files of the prepared profiles
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        for file_path in self.file_paths:
+            _MAPPED_FILES.pop(file_path, None)
+            if os.path.isfile(file_path):
+                os.remove(file_path)
+        self.file_paths = []
+
+    def close(self):
+        """
+        Removes the memory-mapped files of the prepared profiles, after
+        which the profiles must be prepared again before they are used.
+        Prepared profiles that are already held by components can still
+        be read in this process, but can no longer be pickled
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self._remove_files()
+        self.time_size = None
+        self.prepared = []
+
+    def get_prepared(self, profile_id: int):
+        """
+        Returns a prepared profile
+
+        Parameters
+        ----------
+        profile_id : int
+            The id of the profile
+
+        Returns
+        ----------
+        profile : np.ndarray
+            The profile interpolated to the time increments
+
+        """
+        if profile_id >= len(self.prepared):
+            raise Exception("The profile is not prepared")
+        return self.prepared[profile_id]
@@ -6,6 +6,10 @@ from .bfs import (
     run_bfs_load_flow,
     update_voltage,
 )
+from .bfs_vectorized import (
+    run_vectorized_bfs_load_flow,
+    solve_radial_load_flow,
+)
 
 __all__ = []
 for v in dir():
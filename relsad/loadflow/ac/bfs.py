@@ -5,9 +5,14 @@ from relsad.topology.load_flow.bfs import (
     configure_bfs_load_flow_setup,
     is_cyclic,
 )
+from relsad.topology.load_flow.cache import TopologyCache
 
 
-def run_bfs_load_flow(network: PowerNetwork, maxit: int = 5):
+def run_bfs_load_flow(
+    network: PowerNetwork,
+    maxit: int = 5,
+    topology_cache: TopologyCache = None,
+):
     """
     Solves the load flow with a specified number of iterations
     The two first septs are to set up additions topology information
@@ -23,20 +28,29 @@ def run_bfs_load_flow(network: PowerNetwork, maxit: int = 5):
         The analyzed network
     maxit : int
         The number of iterations
+    topology_cache : TopologyCache, optional
+        Cache of topologies, used to skip the topology setup when the
+        network has been analyzed before with the same slack bus and
+        connected lines
 
     Returns
     -------
     network.buses : list
         List of network buses
     """
-    # Check if network is radial
-    if is_cyclic(network) is True:
-        raise Exception("The network is not radial, cannot run BFS")
-
-    # Configure topology list
-    topology_list, network.buses = configure_bfs_load_flow_setup(
-        network.buses, network.lines
-    )
+    if topology_cache is not None:
+        topology_list = topology_cache.get_topology(
+            network, configure_bfs_load_flow_setup
+        )
+    else:
+        # Check if network is radial
+        if is_cyclic(network) is True:
+            raise Exception("The network is not radial, cannot run BFS")
+
+        # Configure topology list
+        topology_list, network.buses = configure_bfs_load_flow_setup(
+            network.buses, network.lines
+        )
 
     # Run Backward Forward Sweep
     for _ in range(maxit):
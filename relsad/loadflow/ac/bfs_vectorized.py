@@ -0,0 +1,232 @@
+import numpy as np
+
+from relsad.network.containers import get_stored_indices
+from relsad.network.systems.PowerNetwork import PowerNetwork
+from relsad.topology.load_flow.bfs import is_cyclic
+from relsad.topology.load_flow.cache import TopologyCache
+from relsad.topology.load_flow.radial import (
+    RadialTopology,
+    compile_radial_topology,
+)
+
+
+def run_vectorized_bfs_load_flow(
+    network: PowerNetwork,
+    maxit: int = 5,
+    topology_cache: TopologyCache = None,
+):
+    """
+    Solves the load flow with a specified number of iterations using
+    array operations
+
+    The radial tree of the network is compiled into index arrays,
+    before the backward sweeps (load update and loss calculation) and
+    forward sweeps (voltage updates) are run level by level on the
+    arrays. The results are written back to the buses and lines.
+    Gives the same results as run_bfs_load_flow
+
+    Parameters
+    ----------
+    network : PowerNetwork
+        The analyzed network
+    maxit : int
+        The number of iterations
+    topology_cache : TopologyCache, optional
+        Cache of topologies, used to skip the topology compilation when
+        the network has been analyzed before with the same slack bus and
+        connected lines
+
+    Returns
+    -------
+    network.buses : list
+        List of network buses
+    """
+    if topology_cache is not None:
+        topology = topology_cache.get_topology(
+            network, compile_radial_topology
+        )
+    else:
+        # Check if network is radial
+        if is_cyclic(network) is True:
+            raise Exception("The network is not radial, cannot run BFS")
+
+        # Compile topology arrays
+        topology, network.buses = compile_radial_topology(
+            network.buses, network.lines
+        )
+
+    solve_radial_load_flow(topology, maxit)
+    return network.buses
+
+
+def solve_radial_load_flow(topology: RadialTopology, maxit: int = 5):
+    """
+    Runs the backward and forward sweeps on a compiled radial topology
+    and writes the results to the buses and lines
+
+    The sweeps are run level by level on the parent indices of the
+    topology. The backward sweep adds the loads and losses of each
+    level to the parent buses, starting from the deepest level, and the
+    forward sweep updates the voltages of each level from the voltages
+    of the parent buses. When the buses and lines are attached to a
+    state store, the bus and line state is read from and written to
+    the arrays of the store
+
+    Parameters
+    ----------
+    topology : RadialTopology
+        The compiled radial topology
+    maxit : int
+        The number of iterations
+
+    Returns
+    -------
+    None
+
+    """
+    buses = topology.buses
+    lines = topology.lines
+    levels = topology.levels
+    parent_levels = topology.parent_levels
+    rx = topology.rx
+    z2 = (rx**2).sum(axis=0)
+    topology.stored_buses = get_stored_indices(buses, topology.stored_buses)
+    topology.stored_lines = get_stored_indices(
+        topology.feeding_lines, topology.stored_lines
+    )
+    stored = (
+        topology.stored_buses is not None and topology.stored_lines is not None
+    )
+    if stored:
+        bus_arrays, bus_indices = topology.stored_buses
+        line_arrays, line_indices = topology.stored_lines
+        # Losses are only added for connected feeding lines
+        connected = np.zeros(len(buses), dtype=bool)
+        connected[topology.has_line] = line_arrays["connected"][line_indices]
+        # Net load [PU]
+        relative_load = np.array(
+            [
+                bus_arrays["pload_pu"][bus_indices]
+                - bus_arrays["pprod_pu"][bus_indices],
+                bus_arrays["qload_pu"][bus_indices]
+                - bus_arrays["qprod_pu"][bus_indices],
+            ]
+        )
+        # Bus state
+        vomag = bus_arrays["vomag"][bus_indices]
+        voang = bus_arrays["voang"][bus_indices]
+        loss_downstream = np.array(
+            [
+                bus_arrays["p_loss_downstream"][bus_indices],
+                bus_arrays["q_loss_downstream"][bus_indices],
+            ]
+        )
+    else:
+        # Losses are only added for connected feeding lines
+        connected = np.array(
+            [line is not None and line.connected for line in lines],
+            dtype=bool,
+        )
+        # Net load [PU]
+        relative_load = np.array(
+            [
+                [bus.pload_pu - bus.pprod_pu for bus in buses],
+                [bus.qload_pu - bus.qprod_pu for bus in buses],
+            ]
+        )
+        # Bus state
+        vomag = np.array([bus.vomag for bus in buses], dtype=float)
+        voang = np.array([bus.voang for bus in buses], dtype=float)
+        loss_downstream = np.array(
+            [
+                [bus.p_loss_downstream for bus in buses],
+                [bus.q_loss_downstream for bus in buses],
+            ],
+            dtype=float,
+        )
+    rx_connected = rx * connected
+    # Active and reactive losses of the line feeding each bus
+    losses = np.zeros((2, len(buses)))
+    # Active and reactive losses of the lines below each bus
+    losses_below = np.zeros((2, len(buses)))
+
+    for _ in range(maxit):
+        ## Backward sweep
+        vomag2 = vomag**2
+        zip_factor = (
+            topology.zip[:, 0] * vomag2
+            + topology.zip[:, 1] * vomag
+            + topology.zip[:, 2]
+        )
+        load_downstream = relative_load * zip_factor
+        losses_below[:] = 0.0
+        for level, parent_level in zip(
+            reversed(levels), reversed(parent_levels)
+        ):
+            # Find the flow to the downstream buses
+            flow = load_downstream[:, level] + losses_below[:, level]
+            # Estimate the losses of the branches
+            losses[:, level] = rx_connected[:, level] * (
+                (flow**2).sum(axis=0) / vomag2[level]
+            )
+            if level[0] == 0:
+                # The slack bus has no parent bus
+                break
+            # Add the loads and losses to the parent buses
+            np.add.at(
+                load_downstream,
+                (slice(None), parent_level),
+                load_downstream[:, level],
+            )
+            np.add.at(
+                losses_below,
+                (slice(None), parent_level),
+                losses[:, level] + losses_below[:, level],
+            )
+        # Add the losses to the downstream buses
+        loss_downstream = np.where(
+            connected, losses + losses_below, loss_downstream
+        )
+
+        ## Forward sweep
+        tload = load_downstream + loss_downstream
+        term2 = 2 * (rx * tload).sum(axis=0)
+        term3 = (tload**2).sum(axis=0) * z2
+        for level, parent_level in zip(levels[1:], parent_levels[1:]):
+            fvomag2 = vomag[parent_level] ** 2
+            vomag[level] = np.sqrt(
+                fvomag2 - term2[level] + term3[level] / fvomag2
+            )
+        # Voltage angle calculation
+        fvomag = vomag[topology.parent[1:]]
+        busvoltreal = fvomag - term2[1:] / 2 / fvomag
+        busvoltimag = (
+            tload[1, 1:] * rx[0, 1:] - tload[0, 1:] * rx[1, 1:]
+        ) / fvomag
+        voang_diff = np.zeros(len(buses))
+        voang_diff[1:] = np.arctan2(busvoltimag, busvoltreal)
+        for level, parent_level in zip(levels[1:], parent_levels[1:]):
+            voang[level] = voang[parent_level] + voang_diff[level]
+
+    ## Write results to buses and lines
+    if stored:
+        bus_arrays["p_load_downstream"][bus_indices] = load_downstream[0]
+        bus_arrays["q_load_downstream"][bus_indices] = load_downstream[1]
+        bus_arrays["p_loss_downstream"][bus_indices] = loss_downstream[0]
+        bus_arrays["q_loss_downstream"][bus_indices] = loss_downstream[1]
+        bus_arrays["vomag"][bus_indices] = vomag
+        bus_arrays["voang"][bus_indices] = voang
+        connected_lines = line_indices[connected[topology.has_line]]
+        line_arrays["ploss"][connected_lines] = losses[0, connected]
+        line_arrays["qloss"][connected_lines] = losses[1, connected]
+        return
+    for idx, bus in enumerate(buses):
+        bus.p_load_downstream = load_downstream[0, idx]
+        bus.q_load_downstream = load_downstream[1, idx]
+        bus.p_loss_downstream = loss_downstream[0, idx]
+        bus.q_loss_downstream = loss_downstream[1, idx]
+        bus.vomag = vomag[idx]
+        bus.voang = voang[idx]
+    for idx in np.flatnonzero(connected):
+        lines[idx].ploss = losses[0, idx]
+        lines[idx].qloss = losses[1, idx]
@@ -4,7 +4,7 @@ from numbers import Number
 import numpy as np
 
 from relsad.Time import Time, TimeUnit
-from relsad.utils import INF
+from relsad.utils import INF, History
 
 from .Bus import Bus
 from .Component import Component
@@ -228,7 +228,7 @@ class Battery(Component):
         self.state = BatteryState.ACTIVE
 
         ## History
-        self.history = {}
+        self.history = History()
         self.initialize_history()
 
     def __str__(self):
@@ -346,7 +346,7 @@ class Battery(Component):
         """
 
         if (
-            self.remaining_survival_time > Time(0)
+            self.remaining_survival_time.quantity > 0
             and self.mode == MicrogridMode.SURVIVAL
         ):
             self.remaining_survival_time -= dt
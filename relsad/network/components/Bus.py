@@ -2,11 +2,12 @@ import matplotlib.lines as mlines
 import numpy as np
 
 from relsad.load.bus import CostFunction
+from relsad.load.profiles import ProfileRegistry
 from relsad.StatDist import StatDist, StatDistType, UniformParameters
 from relsad.Time import Time, TimeUnit
 from relsad.utils import (
+    History,
     convert_yearly_fail_rate,
-    interpolate,
     random_choice,
     eq,
 )
@@ -38,6 +39,15 @@ class Bus(Component):
         List of active power load data
     qload_data : list
         List of reactive power load data
+    pload_profiles : list
+        List of active power load profiles as added to the bus
+    qload_profiles : list
+        List of reactive power load profiles as added to the bus
+    load_scales : list
+        List of scale factors of the load profiles
+    load_profile_ids : list
+        List of the ids of the active and reactive power load profiles
+        in the profile registry
     ZIP : list
         List showing the ZIP load model
     p_load_downstream : float
@@ -117,6 +127,9 @@ class Bus(Component):
         Current number of interruptions experienced by the bus
     acc_interruptions : float
         Accumulated number of interruptions experienced by the bus
+    index_accumulators : list
+        List of the reliability index accumulators of the networks of
+        the bus
     trafo_failed : bool
         Failure status of the transformer
     remaining_outage_time : Time
@@ -141,9 +154,11 @@ class Bus(Component):
         Resets the load at the bus by setting the load to 0
     reset_prod()
         Resets the generation at the bus by setting the generation to 0
-    add_load_data(pload_data, qload_data, cost_function)
+    add_load_data(pload_data, qload_data, cost_function, scale)
         Adds load data to the bus
-    prepare_load_data(time_indices)
+    register_load_profiles(profile_registry)
+        Adds the load profiles of the bus to a profile registry
+    prepare_load_data(time_indices, profile_registry)
         Prepares the load data for the current time step configuration
     add_load(pload, qload)
         Adds load to the bus
@@ -241,6 +256,10 @@ class Bus(Component):
         self.cost_functions = []
         self.pload_data = []
         self.qload_data = []
+        self.pload_profiles = []
+        self.qload_profiles = []
+        self.load_scales = []
+        self.load_profile_ids = []
         self.ZIP = ZIP
         self.p_load_downstream = 0.0  # Active accumulated load at node
         self.q_load_downstream = 0.0  # Reactive accumulated load at node
@@ -281,6 +300,7 @@ class Bus(Component):
         self.interruption_fraction = 0
         self.curr_interruptions = 0
         self.acc_interruptions = 0
+        self.index_accumulators = []
 
         ## Status attribute
         self.trafo_failed = False
@@ -292,7 +312,7 @@ class Bus(Component):
         self.battery = None
 
         ## History
-        self.history = {}
+        self.history = History()
         self.monte_carlo_history = {}
         self.initialize_history()
 
@@ -368,6 +388,7 @@ class Bus(Component):
         pload_data: np.ndarray,
         qload_data: np.ndarray = None,
         cost_function: CostFunction = CostFunction(A=1, B=0),
+        scale: float = 1,
     ):
         """
         Adds load data to the bus
@@ -380,46 +401,97 @@ class Bus(Component):
             Reactive power load array
         cost_function : CostFunction
             Load cost function
+        scale : float
+            Scale factor of the load arrays, letting buses share the
+            same load arrays with different magnitudes
 
         Returns
         ----------
         None
 
         """
+        if qload_data is None:
+            qload_data = np.zeros_like(pload_data)
         self.cost_functions.append(cost_function)
+        self.pload_profiles.append(pload_data)
+        self.qload_profiles.append(qload_data)
+        self.load_scales.append(float(scale))
         self.pload_data.append(pload_data)
-        if qload_data is None:
-            self.qload_data.append(np.zeros_like(pload_data))
-        else:
-            self.qload_data.append(qload_data)
+        self.qload_data.append(qload_data)
+        # The load data must be prepared again
+        self.load_profile_ids = []
+
+    def register_load_profiles(self, profile_registry: ProfileRegistry):
+        """
+        Adds the load profiles of the bus to a profile registry, where
+        profiles that are already in the registry are referenced by the
+        id of the existing profile
+
+        Parameters
+        ----------
+        profile_registry : ProfileRegistry
+            The profile registry
+
+        Returns
+        ----------
+        None
+
+        """
+        self.load_profile_ids = [
+            (
+                profile_registry.add_profile(pload_profile),
+                profile_registry.add_profile(qload_profile),
+            )
+            for pload_profile, qload_profile in zip(
+                self.pload_profiles, self.qload_profiles
+            )
+        ]
+        # The bus keeps the distinct profiles of the registry instead
+        # of its own copies
+        self.pload_profiles = [
+            profile_registry.get_profile(pload_id)
+            for pload_id, _ in self.load_profile_ids
+        ]
+        self.qload_profiles = [
+            profile_registry.get_profile(qload_id)
+            for _, qload_id in self.load_profile_ids
+        ]
 
     def prepare_load_data(
         self,
         time_indices: np.ndarray,
+        profile_registry: ProfileRegistry = None,
     ):
         """
-        Prepares the load data for the current time step configuration
+        Prepares the load data for the current time step configuration,
+        where the load data of the bus are the prepared profiles of
+        the profile registry
 
         Parameters
         ----------
         time_indices : np.ndarray
             Time indices used to discretize the load data
+        profile_registry : ProfileRegistry, optional
+            The profile registry of the power system, the bus uses a
+            profile registry of its own if None
 
         Returns
         ----------
         None
 
         """
-        for i, pload_array in enumerate(self.pload_data):
-            self.pload_data[i] = interpolate(
-                array=pload_array,
-                time_indices=time_indices,
-            )
-        for i, qload_array in enumerate(self.qload_data):
-            self.qload_data[i] = interpolate(
-                array=qload_array,
-                time_indices=time_indices,
-            )
+        if profile_registry is None:
+            profile_registry = ProfileRegistry()
+        self.register_load_profiles(profile_registry)
+        profile_registry.prepare(time_indices)
+        self.pload_data = [
+            profile_registry.get_prepared(pload_id)
+            for pload_id, _ in self.load_profile_ids
+        ]
+        self.qload_data = [
+            profile_registry.get_prepared(qload_id)
+            for _, qload_id in self.load_profile_ids
+        ]
 
     def add_load(
         self,
@@ -475,9 +547,10 @@ class Bus(Component):
                     type_cost,
                     cost_function.A + cost_function.B * 1,
                 )
+                scale = self.load_scales[i] * self.n_customers
                 self.add_load(
-                    pload=self.pload_data[i][inc_idx] * self.n_customers,
-                    qload=self.qload_data[i][inc_idx] * self.n_customers,
+                    pload=self.pload_data[i][inc_idx] * scale,
+                    qload=self.qload_data[i][inc_idx] * scale,
                 )
         if type_cost > 0:
             self.set_cost(type_cost)
@@ -591,7 +664,7 @@ class Bus(Component):
         """
         return self.prod
 
-    def update_fail_status(self, dt: Time):
+    def update_fail_status(self, dt: Time, p_fail: float = None):
         """
         Updates the fail status of the transformer.
         Sets the fail status to failed if the transformer is failed
@@ -601,6 +674,9 @@ class Bus(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
@@ -609,7 +685,7 @@ class Bus(Component):
         """
         if self.trafo_failed:
             self.remaining_outage_time -= dt
-            if self.remaining_outage_time <= Time(0):
+            if self.remaining_outage_time.quantity <= 0:
                 self.trafo_not_fail()
                 self.remaining_outage_time = Time(0)
             else:
@@ -617,7 +693,8 @@ class Bus(Component):
                 if self.prod is not None:
                     self.prod.reset_prod()
         else:
-            p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
+            if p_fail is None:
+                p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
             if random_choice(self.ps_random, p_fail):
                 self.trafo_fail(dt)
             else:
@@ -713,12 +790,16 @@ class Bus(Component):
         self.acc_p_energy_shed += self.p_energy_shed_stack
         self.acc_q_energy_shed += self.q_energy_shed_stack
         dt = curr_time - prev_time if prev_time is not None else curr_time
-        self.acc_outage_time += dt if self.p_energy_shed_stack > 0 else Time(0)
+        outage_hours = 0
+        if self.p_energy_shed_stack > 0:
+            self.acc_outage_time += dt
+            outage_hours = dt.get_hours()
+        acc_interruptions = self.acc_interruptions
         self.avg_outage_time = (
             Time(
                 self.acc_outage_time / curr_time, curr_time.unit
             )
-            if curr_time != Time(0, curr_time.unit)
+            if curr_time.quantity != 0
             else Time(0, curr_time.unit)
         )
         self.avg_fail_rate = self.get_avg_fail_rate(curr_time)
@@ -741,6 +822,19 @@ class Bus(Component):
             self.curr_interruptions = 0
             self.num_consecutive_interruptions = 0
 
+        # Update the reliability index sums of the networks of the bus
+        if (
+            self.p_energy_shed_stack > 0
+            or self.acc_interruptions != acc_interruptions
+        ):
+            for index_accumulator in self.index_accumulators:
+                index_accumulator.add(
+                    n_customers=self.n_customers,
+                    interruptions=self.acc_interruptions - acc_interruptions,
+                    outage_hours=outage_hours,
+                    energy_shed=self.p_energy_shed_stack,
+                )
+
         if save_flag:
             time = curr_time.get_unit_quantity(curr_time.unit)
             self.history["pload"][time] = self.pload
@@ -886,6 +980,8 @@ class Bus(Component):
 
         """
         self.ps_random = random_gen
+        # Values buffered from a previous random generator are discarded
+        self.repair_time_dist.clear_buffer()
 
     def get_avg_fail_rate(self, curr_time: Time):
         """
@@ -929,6 +1025,8 @@ class Bus(Component):
         self.trafo_failed = False
         self.remaining_outage_time = Time(0)
         self.acc_outage_time = Time(0)
+        self.avg_outage_time = Time(0)
+        self.avg_fail_rate = 0
         self.reset_load_and_prod_attributes()
         self.cost = 0  # cost
         self.clear_energy_shed_stack()
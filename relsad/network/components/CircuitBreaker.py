@@ -3,7 +3,7 @@ import numpy as np
 
 from relsad.network.containers import SectionState
 from relsad.Time import Time, TimeUnit
-from relsad.utils import unique
+from relsad.utils import History, unique
 
 from .Component import Component
 from .Line import Line
@@ -120,7 +120,7 @@ class CircuitBreaker(Component, Switch):
         self.line.circuitbreaker = self
 
         ## History
-        self.history = {}
+        self.history = History()
         self.initialize_history()
 
     def __str__(self):
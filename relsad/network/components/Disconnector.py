@@ -2,6 +2,7 @@ import matplotlib.lines as mlines
 import numpy as np
 
 from relsad.Time import Time, TimeUnit
+from relsad.utils import History
 
 from .Bus import Bus
 from .Component import Component
@@ -136,7 +137,7 @@ class Disconnector(Component, Switch):
         self.intelligent_switch = None
 
         ## History
-        self.history = {}
+        self.history = History()
         self.initialize_history()
 
     def __str__(self):
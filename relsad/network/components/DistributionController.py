@@ -4,7 +4,12 @@ import numpy as np
 from relsad.network.containers import SectionState
 from relsad.Time import Time, TimeUnit
 from relsad.topology.ICT.dfs import is_connected
-from relsad.utils import convert_yearly_fail_rate, random_choice, unique
+from relsad.utils import (
+    History,
+    convert_yearly_fail_rate,
+    random_choice,
+    unique,
+)
 
 from .Component import Component
 from .Controller import Controller, ControllerState
@@ -134,7 +139,7 @@ class DistributionController(Component, Controller):
         self.failed_sections = []
 
         ## History
-        self.history = {}
+        self.history = History()
         self.monte_carlo_history = {}
         self.initialize_history()
 
@@ -174,7 +179,7 @@ class DistributionController(Component, Controller):
 
         """
         if self.power_network.connected_line.circuitbreaker.is_open:
-            if self.sectioning_time <= Time(0):
+            if self.sectioning_time.quantity <= 0:
                 self.disconnect_failed_sections()
                 if not self.power_network.connected_line.failed:
                     # Sectioning time finished
@@ -201,7 +206,7 @@ class DistributionController(Component, Controller):
 
         """
         if self.power_network.connected_line.circuitbreaker.is_open:
-            if self.sectioning_time <= Time(0):
+            if self.sectioning_time.quantity <= 0:
                 self.disconnect_failed_sections()
                 if (
                     not self.power_network.connected_line.failed
@@ -388,12 +393,12 @@ class DistributionController(Component, Controller):
         # Update current sectioning time
         self.sectioning_time = (
             self.sectioning_time - dt
-            if self.sectioning_time > Time(0)
+            if self.sectioning_time.quantity > 0
             else Time(0)
         )
         if (
             self.power_network.connected_line.circuitbreaker.is_open
-            and self.sectioning_time <= Time(0)
+            and self.sectioning_time.quantity <= 0
         ):
             # Failure occured in current time step
             self.check_components = True
@@ -475,12 +480,12 @@ class DistributionController(Component, Controller):
         # Update current sectioning time
         self.sectioning_time = (
             self.sectioning_time - dt
-            if self.sectioning_time > Time(0)
+            if self.sectioning_time.quantity > 0
             else Time(0)
         )
         if (
             self.power_network.connected_line.circuitbreaker.is_open
-            and self.sectioning_time <= Time(0)
+            and self.sectioning_time.quantity <= 0
         ):
             # Failure occured in current time step
             self.check_components = True
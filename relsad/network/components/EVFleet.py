@@ -0,0 +1,412 @@
+import numpy as np
+
+from relsad.Time import Time
+from relsad.utils import INF
+
+
+class EVFleet:
+    """
+    Fleet of the EVs available in an EV park
+
+    The EVs share the power and energy limits of the EV park, and the
+    energy level of each EV battery is stored in an array. The EVs are
+    dispatched in order, where each EV charges or discharges as the
+    battery of an EV does, given the power balance left by the EVs
+    before it. While every EV is limited by its own capacity, the EVs
+    are dispatched in array operations, and the remaining EVs are
+    dispatched one by one until the power balance is covered
+
+    ...
+
+    Attributes
+    ----------
+    inj_p_max : float
+        The active power charging/discharging capacity of an EV battery
+        [MW]
+    inj_q_max : float
+        The reactive power discharging capacity of an EV battery [MVar]
+    inj_max : float
+        The total power discharging capacity of an EV battery [MW]
+    E_max : float
+        The maximum energy capacity of an EV battery [MWh]
+    SOC_min : float
+        The minimal state of charge level of an EV battery
+    SOC_max : float
+        The maximum state of charge level of an EV battery
+    n_battery : float
+        The EV battery efficiency
+    E_battery : np.ndarray
+        The energy level of each EV battery [MWh]
+
+    Methods
+    ----------
+    set_SOC_states(soc_states)
+        Sets the EVs of the fleet from their states of charge
+    clear()
+        Removes the EVs from the fleet
+    get_SOC()
+        Returns the state of charge of each EV battery
+    get_demand(dt)
+        Returns the active power demand of the fleet
+    dispatch(p, q, dt, v2g_flag)
+        Charges or discharges the EVs based on the power balance
+    """
+
+    def __init__(
+        self,
+        inj_p_max: float,
+        inj_q_max: float,
+        E_max: float,
+        SOC_min: float,
+        SOC_max: float,
+        n_battery: float,
+    ):
+        self.inj_p_max = inj_p_max  # MW
+        self.inj_q_max = inj_q_max  # MVar
+        self.inj_max = inj_p_max
+        self.E_max = E_max  # MWh
+        self.SOC_min = SOC_min
+        self.SOC_max = SOC_max
+        self.n_battery = n_battery
+        self.E_battery = np.empty(0)
+
+    def __len__(self):
+        return len(self.E_battery)
+
+    def __repr__(self):
+        return f"EVFleet(num_cars={len(self)})"
+
+    def set_SOC_states(self, soc_states: np.ndarray):
+        """
+        Sets the EVs of the fleet from their states of charge
+
+        Parameters
+        ----------
+        soc_states : np.ndarray
+            The state of charge of each EV battery
+
+        Returns
+        ----------
+        None
+
+        """
+        self.E_battery = np.asarray(soc_states, dtype=float) * self.E_max
+
+    def clear(self):
+        """
+        Removes the EVs from the fleet
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.E_battery = np.empty(0)
+
+    def get_SOC(self):
+        """
+        Returns the state of charge of each EV battery
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        SOC : np.ndarray
+            The state of charge of each EV battery
+
+        """
+        return self.E_battery / self.E_max
+
+    def get_demand(self, dt: Time):
+        """
+        Returns the active power demand of the fleet, the power needed
+        to charge every EV battery to the maximum state of charge
+
+        Parameters
+        ----------
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        p_demand : float
+            The active power demand of the fleet [MW]
+
+        """
+        demand = np.minimum(
+            self.inj_p_max,
+            (self.E_max * self.SOC_max - self.E_battery) / dt.get_hours(),
+        )
+        return sum(demand.tolist())
+
+    def _limit_charge(self, p_ch: float):
+        """
+        Returns the part of a charging power above the capacity of an EV
+        battery, and the charging power within the capacity
+        """
+        p_ch_remaining = 0
+        if p_ch > self.inj_p_max:
+            p_ch_remaining += p_ch - self.inj_p_max
+            if p_ch >= INF:
+                # "Infinite" power source available
+                p_ch = self.inj_p_max
+            else:
+                p_ch -= p_ch_remaining
+        return p_ch_remaining, p_ch
+
+    def _limit_discharge(self, p_dis: float, q_dis: float):
+        """
+        Returns the parts of a discharging power above the capacity of
+        an EV battery, and the discharging power within the capacity
+        """
+        p_dis_remaining = 0
+        q_dis_remaining = 0
+        if p_dis > self.inj_p_max:
+            p_dis_remaining += p_dis - self.inj_p_max
+            p_dis -= p_dis_remaining
+        if q_dis > self.inj_q_max:
+            q_dis_remaining += q_dis - self.inj_q_max
+            q_dis -= q_dis_remaining
+        if p_dis + q_dis > self.inj_max:
+            f_p = p_dis / (p_dis + q_dis)  # active fraction
+            f_q = 1 - f_p  # reactive fraction
+            diff = p_dis + q_dis - self.inj_max
+            p_dis_remaining += diff * (1 - f_p)
+            q_dis_remaining += diff * (1 - f_q)
+            p_dis -= diff * (1 - f_p)
+            q_dis -= diff * (1 - f_q)
+        return p_dis_remaining, q_dis_remaining, p_dis, q_dis
+
+    def _charge(self, E_battery: np.ndarray, p_ch: float, h: float):
+        """
+        Charges EV batteries with the same desired charging power, and
+        returns the new energy levels and the power each battery is not
+        able to charge
+        """
+        p_ch_remaining, p_ch = self._limit_charge(p_ch)
+        dE = self.n_battery * p_ch * h  # MWh
+        SOC_tr = (E_battery + dE) / self.E_max
+        dSOC = dE / self.E_max
+        over = SOC_tr > self.SOC_max
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f = np.where(over, 1 - (SOC_tr - self.SOC_max) / dSOC, 1.0)
+        return (
+            np.where(over, E_battery + f * dE, E_battery + dE),
+            np.where(over, p_ch_remaining + (1 - f) * p_ch, p_ch_remaining),
+        )
+
+    def _discharge(
+        self,
+        E_battery: np.ndarray,
+        p_dis: float,
+        q_dis: float,
+        h: float,
+    ):
+        """
+        Discharges EV batteries with the same wanted discharging power,
+        and returns the new energy levels and the power each battery is
+        not able to discharge
+        """
+        p_dis_remaining, q_dis_remaining, p_dis, q_dis = self._limit_discharge(
+            p_dis, q_dis
+        )
+        dE = 1 / self.n_battery * (p_dis + q_dis) * h  # MWh/MVarh
+        SOC_tr = (E_battery - dE) / self.E_max
+        dSOC = dE / self.E_max
+        under = (SOC_tr < self.SOC_min) & (dSOC > 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            f = np.where(under, 1 - (self.SOC_min - SOC_tr) / dSOC, 1.0)
+        return (
+            np.where(under, E_battery - f * dE, E_battery - dE),
+            np.where(
+                under, p_dis_remaining + (1 - f) * p_dis, p_dis_remaining
+            ),
+            np.where(
+                under, q_dis_remaining + (1 - f) * q_dis, q_dis_remaining
+            ),
+        )
+
+    def _charge_car(self, E_battery: float, p_ch: float, h: float):
+        """
+        Charges one EV battery, and returns the new energy level and
+        the power the battery is not able to charge
+        """
+        p_ch_remaining, p_ch = self._limit_charge(p_ch)
+        dE = self.n_battery * p_ch * h  # MWh
+        SOC_tr = (E_battery + dE) / self.E_max
+        dSOC = dE / self.E_max
+        if SOC_tr > self.SOC_max:
+            # Factor to scale the energy level
+            f = 1 - (SOC_tr - self.SOC_max) / dSOC
+            E_battery += f * dE
+            p_ch_remaining += (1 - f) * p_ch
+        else:
+            E_battery += dE
+        return E_battery, p_ch_remaining
+
+    def _discharge_car(
+        self,
+        E_battery: float,
+        p_dis: float,
+        q_dis: float,
+        h: float,
+    ):
+        """
+        Discharges one EV battery, and returns the new energy level and
+        the power the battery is not able to discharge
+        """
+        p_dis_remaining, q_dis_remaining, p_dis, q_dis = self._limit_discharge(
+            p_dis, q_dis
+        )
+        dE = 1 / self.n_battery * (p_dis + q_dis) * h  # MWh/MVarh
+        SOC_tr = (E_battery - dE) / self.E_max
+        dSOC = dE / self.E_max
+        if SOC_tr < self.SOC_min and dSOC > 0:
+            f = 1 - (self.SOC_min - SOC_tr) / dSOC
+            E_battery -= f * dE
+            p_dis_remaining += (1 - f) * p_dis
+            q_dis_remaining += (1 - f) * q_dis
+        else:
+            E_battery -= dE
+        return E_battery, p_dis_remaining, q_dis_remaining
+
+    def _dispatch_car(self, idx: int, p: float, q: float, h: float):
+        """
+        Charges or discharges one EV based on the power balance, as
+        Battery.update_bus_load_and_prod, and returns the remaining
+        power balance and the production and load of the EV
+        """
+        E_battery = float(self.E_battery[idx])
+        pprod, qprod, pload = 0, 0, 0
+        if p >= 0 and q >= 0:
+            E_battery, p_rem, q_rem = self._discharge_car(E_battery, p, q, h)
+            pprod = p - p_rem
+            qprod = q - q_rem
+        elif p < 0 and q >= 0:
+            E_battery, p_rem = self._charge_car(E_battery, -p, h)
+            E_battery, _, q_rem = self._discharge_car(E_battery, 0, q, h)
+            pload = -p - p_rem
+            qprod = q - q_rem
+        elif p >= 0 and q < 0:
+            E_battery, p_rem, _ = self._discharge_car(E_battery, p, 0, h)
+            pprod = p - p_rem
+        else:
+            E_battery, p_rem = self._charge_car(E_battery, -p, h)
+            pload = -p - p_rem
+        self.E_battery[idx] = E_battery
+        return p + pload - pprod, q - qprod, pprod, qprod, pload
+
+    def _dispatch_saturated(self, p: float, q: float, h: float):
+        """
+        Charges or discharges the first EVs of the fleet that are
+        limited by their capacity, where the remaining power balance
+        does not change the dispatch of an EV, in array operations.
+        Returns the number of dispatched EVs, the remaining power
+        balance and the production and load of the dispatched EVs
+        """
+        p_req = min(abs(p), self.inj_p_max)
+        q_req = min(q, self.inj_q_max) if q > 0 else 0
+        pprod = np.zeros(len(self))
+        qprod = np.zeros(len(self))
+        pload = np.zeros(len(self))
+        if p < 0:
+            E_battery, p_rem = self._charge(self.E_battery, p_req, h)
+            pload = p_req - p_rem
+            if q >= 0:
+                E_battery, _, q_rem = self._discharge(E_battery, 0, q_req, h)
+                qprod = q_req - q_rem
+        else:
+            E_battery, p_rem, q_rem = self._discharge(
+                self.E_battery, p_req, q_req, h
+            )
+            pprod = p_req - p_rem
+            qprod = q_req - q_rem
+        # Power balance before each EV
+        p_before = p + np.concatenate(([0], np.cumsum(pload - pprod)))
+        q_before = q - np.concatenate(([0], np.cumsum(qprod)))
+        saturated = np.ones(len(self), dtype=bool)
+        if p != 0:
+            saturated &= np.abs(p_before[:-1]) >= self.inj_p_max
+        else:
+            # A reactive discharge limited by the total capacity gives a
+            # negative active production, so the active balance of the
+            # next EV is no longer zero
+            saturated &= p_before[:-1] == 0
+        if q > 0:
+            saturated &= q_before[:-1] >= self.inj_q_max
+        n_saturated = (
+            int(np.argmin(saturated)) if not saturated.all() else len(self)
+        )
+        self.E_battery[:n_saturated] = E_battery[:n_saturated]
+        return (
+            n_saturated,
+            float(p_before[n_saturated]),
+            float(q_before[n_saturated]),
+            float(pprod[:n_saturated].sum()),
+            float(qprod[:n_saturated].sum()),
+            float(pload[:n_saturated].sum()),
+        )
+
+    def dispatch(self, p: float, q: float, dt: Time, v2g_flag: bool):
+        """
+        Charges or discharges the EVs based on the power balance, where
+        every EV charges when the balance is negative, and discharges
+        when the balance is positive and the EVs contribute with V2G
+        services
+
+        Parameters
+        ----------
+        p : float
+            Active power balance of the parent power system
+        q : float
+            Reactive power balance of the parent power system
+        dt : Time
+            The current time step
+        v2g_flag : bool
+            Indicates if the EVs contribute with V2G services
+
+        Returns
+        ----------
+        p : float
+            Remaining active power balance of the parent power system
+        q : float
+            Remaining reactive power balance of the parent power system
+        pprod : float
+            Active power production of the EVs [MW]
+        qprod : float
+            Reactive power production of the EVs [MVar]
+        pload : float
+            Active power load of the EVs [MW]
+        num_dispatched : int
+            The number of dispatched EVs
+
+        """
+        if len(self) == 0 or (not v2g_flag and p >= 0):
+            return p, q, 0, 0, 0, 0
+        h = dt.get_hours()
+        (
+            num_dispatched,
+            p,
+            q,
+            pprod,
+            qprod,
+            pload,
+        ) = self._dispatch_saturated(p, q, h)
+        for idx in range(num_dispatched, len(self)):
+            if (p == 0 and q <= 0) or (not v2g_flag and p >= 0):
+                # The remaining EVs are not dispatched
+                break
+            p, q, car_pprod, car_qprod, car_pload = self._dispatch_car(
+                idx, p, q, h
+            )
+            pprod += car_pprod
+            qprod += car_qprod
+            pload += car_pload
+            num_dispatched += 1
+        return p, q, pprod, qprod, pload, num_dispatched
@@ -3,10 +3,11 @@ import numpy as np
 
 from relsad.Table import Table
 from relsad.Time import Time, TimeUnit
+from relsad.utils import History
 
-from .Battery import Battery, BatteryType
 from .Bus import Bus
 from .Component import Component
+from .EVFleet import EVFleet
 from .MicrogridController import MicrogridMode
 
 
@@ -46,8 +47,8 @@ class EVPark(Component):
         Current active power that are being charged/dischared [MW]
     curr_q_charge : float
         Current reactive power that are being charged/dischared [MVar]
-    available_cars : list
-        List of available cars in the EV park
+    fleet : EVFleet
+        The fleet of available cars in the EV park
     available_num_cars : int
         Number of available cars in the EV park
     num_cars : int
@@ -178,7 +179,14 @@ class EVPark(Component):
 
         self.v2g_flag = v2g_flag
 
-        self.available_cars = list()
+        self.fleet = EVFleet(
+            inj_p_max=inj_p_max,
+            inj_q_max=inj_q_max,
+            E_max=E_max,
+            SOC_min=SOC_min,
+            SOC_max=SOC_max,
+            n_battery=n_battery,
+        )
         self.available_num_cars = 0
         self.num_cars = round(max(self.num_ev_dist.y))
 
@@ -195,7 +203,7 @@ class EVPark(Component):
         self.acc_interruption_duration = Time(0)
 
         ## History
-        self.history = {}
+        self.history = History()
         self.initialize_history()
 
     def __str__(self):
@@ -239,24 +247,9 @@ class EVPark(Component):
             size=self.available_num_cars,
         )
 
-        # Create the current cars in the EV park with
+        # Set the current cars in the EV park with
         # their respective status
-        self.available_cars = [
-            Battery(
-                name="ev{:d}_{}".format(i, self.name),
-                bus=self.bus,
-                inj_p_max=self.inj_p_max,
-                inj_q_max=self.inj_q_max,
-                E_max=self.E_max,
-                SOC_min=self.SOC_min,
-                SOC_max=self.SOC_max,
-                n_battery=self.n_battery,
-                battery_type=BatteryType.EV,
-                random_instance=self.ps_random,
-                SOC_start=soc_states[i],
-            )
-            for i in range(self.available_num_cars)
-        ]
+        self.fleet.set_SOC_states(soc_states)
 
     def update(
         self,
@@ -293,17 +286,28 @@ class EVPark(Component):
             self.draw_current_state(hour_of_day)
             self.acc_available_num_cars += self.available_num_cars
 
-        # Update car batteries based on system balance
+        # Update car batteries based on system balance,
+        # not vehicle to grid allows charge only
         p_start = p
         q_start = q
-        for car in self.available_cars:
-            if self.v2g_flag is True:
-                # Vehicle to grid: allow charge and discharge
-                p, q = car.update_bus_load_and_prod(p, q, dt)
-            else:
-                # Not vehicle to grid: allow charge only
-                if p < 0:
-                    p, q = car.update_bus_load_and_prod(p, q, dt)
+        (
+            p,
+            q,
+            car_pprod,
+            car_qprod,
+            car_pload,
+            num_dispatched,
+        ) = self.fleet.dispatch(p, q, dt, self.v2g_flag is True)
+        if num_dispatched > 0:
+            # Add production and load of the cars to the bus
+            self.bus.pprod += car_pprod  # MW
+            self.bus.qprod += car_qprod  # MVar
+            self.bus.pprod_pu += car_pprod / self.bus.s_ref  # PU
+            self.bus.qprod_pu += car_qprod / self.bus.s_ref  # PU
+            self.bus.add_load(
+                pload=car_pload,
+                qload=0,
+            )
         p_change = p_start - p
         q_change = q_start - q
 
@@ -339,13 +343,8 @@ class EVPark(Component):
             The current reactive power demand of the EV
 
         """
-        curr_p_demand = 0
+        curr_p_demand = self.fleet.get_demand(dt)
         curr_q_demand = 0
-        for car in self.available_cars:
-            curr_p_demand += min(
-                car.inj_p_max,
-                (car.E_max * car.SOC_max - car.E_battery) / dt.get_hours(),
-            )
         return curr_p_demand, curr_q_demand
 
     def get_SOC(self):
@@ -365,7 +364,7 @@ class EVPark(Component):
 
         if self.available_num_cars <= 0:
             return 0
-        mean_SOC = np.mean([car.SOC for car in self.available_cars])
+        mean_SOC = np.mean(self.fleet.get_SOC())
         return mean_SOC
 
     def get_ev_index(self):
@@ -583,7 +582,7 @@ class EVPark(Component):
         self.curr_q_demand = 0
         self.curr_p_charge = 0
         self.curr_q_charge = 0
-        self.available_cars.clear()
+        self.fleet.clear()
         self.available_num_cars = 0
         ## Reliability attributes
         self.num_consecutive_interruptions = 0
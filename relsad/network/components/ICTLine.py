@@ -3,7 +3,7 @@ import numpy as np
 
 from relsad.StatDist import StatDist, StatDistType, UniformParameters
 from relsad.Time import Time, TimeUnit
-from relsad.utils import convert_yearly_fail_rate, random_choice
+from relsad.utils import History, convert_yearly_fail_rate, random_choice
 
 from .Component import Component
 from .ICTNode import ICTNode
@@ -130,7 +130,7 @@ class ICTLine(Component):
         self.remaining_outage_time = Time(0)
 
         ## History
-        self.history = {}
+        self.history = History()
         self.initialize_history()
 
     def __str__(self):
@@ -295,7 +295,7 @@ class ICTLine(Component):
         self.fnode = self.tnode
         self.tnode = node
 
-    def update_fail_status(self, dt: Time):
+    def update_fail_status(self, dt: Time, p_fail: float = None):
         """
         Updates the fail status of the line
 
@@ -303,6 +303,9 @@ class ICTLine(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
@@ -311,11 +314,12 @@ class ICTLine(Component):
         """
         if self.failed:
             self.remaining_outage_time -= dt
-            if self.remaining_outage_time <= Time(0):
+            if self.remaining_outage_time.quantity <= 0:
                 self.not_fail()
                 self.remaining_outage_time = Time(0)
         else:
-            p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
+            if p_fail is None:
+                p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
             if random_choice(self.ps_random, p_fail):
                 self.fail(dt)
             else:
@@ -432,6 +436,8 @@ class ICTLine(Component):
 
         """
         self.ps_random = random_gen
+        # Values buffered from a previous random generator are discarded
+        self.repair_time_dist.clear_buffer()
 
     def reset_status(self, save_flag: bool):
         """
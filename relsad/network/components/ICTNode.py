@@ -2,7 +2,7 @@ import matplotlib.lines as mlines
 import numpy as np
 
 from relsad.StatDist import StatDist, StatDistType, UniformParameters
-from relsad.utils import convert_yearly_fail_rate, random_choice
+from relsad.utils import History, convert_yearly_fail_rate, random_choice
 from relsad.Time import Time
 
 from .Component import Component
@@ -140,7 +140,7 @@ class ICTNode(Component):
         self.remaining_outage_time = Time(0)
 
         ## History
-        self.history = {}
+        self.history = History()
         self.monte_carlo_history = {}
         self.initialize_history()
 
@@ -213,7 +213,7 @@ class ICTNode(Component):
         """
         self.failed = False
 
-    def update_fail_status(self, dt: Time):
+    def update_fail_status(self, dt: Time, p_fail: float = None):
         """
         Updates the fail status of the ICT node. Sets the fail status to failed if the ICT node is failed or the fail status to not failed if the ICT node is not failed
 
@@ -221,6 +221,9 @@ class ICTNode(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
@@ -229,11 +232,12 @@ class ICTNode(Component):
         """
         if self.failed:
             self.remaining_outage_time -= dt
-            if self.remaining_outage_time <= Time(0):
+            if self.remaining_outage_time.quantity <= 0:
                 self.not_fail()
                 self.remaining_outage_time = Time(0)
         else:
-            p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
+            if p_fail is None:
+                p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
             if random_choice(self.ps_random, p_fail):
                 self.fail(dt)
             else:
@@ -367,6 +371,8 @@ class ICTNode(Component):
 
         """
         self.ps_random = random_gen
+        # Values buffered from a previous random generator are discarded
+        self.repair_time_dist.clear_buffer()
 
     def get_avg_fail_rate(self, curr_time: Time):
         """
@@ -406,6 +412,8 @@ class ICTNode(Component):
         self.failed = False
         self.remaining_outage_time = Time(0)
         self.acc_outage_time = Time(0)
+        self.avg_outage_time = Time(0)
+        self.avg_fail_rate = 0
         self.num_consecutive_interruptions = 0
         self.acc_interruptions = 0
         if save_flag:
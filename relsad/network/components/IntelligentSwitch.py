@@ -4,7 +4,7 @@ import matplotlib.lines as mlines
 import numpy as np
 
 from relsad.Time import Time, TimeUnit
-from relsad.utils import convert_yearly_fail_rate, random_choice
+from relsad.utils import History, convert_yearly_fail_rate, random_choice
 
 from .Component import Component
 from .Disconnector import Disconnector
@@ -144,7 +144,7 @@ class IntelligentSwitch(Component):
         self.state = state
 
         ## History
-        self.history = {}
+        self.history = History()
         self.monte_carlo_history = {}
         self.initialize_history()
 
@@ -195,7 +195,7 @@ class IntelligentSwitch(Component):
         """
         self.state = IntelligentSwitchState.OK
 
-    def draw_fail_status(self, dt: Time):
+    def draw_fail_status(self, dt: Time, p_fail: float = None):
         """
         Draws the state of the intelligent switch for a given time step
 
@@ -203,13 +203,17 @@ class IntelligentSwitch(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
         None
 
         """
-        p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
+        if p_fail is None:
+            p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
         self.draw_status(p_fail)
 
     def draw_status(self, prob):
@@ -341,7 +345,7 @@ class IntelligentSwitch(Component):
             elif self.state == IntelligentSwitchState.FAILED:
                 self.repair_close(dt)
 
-    def update_fail_status(self, dt: Time):
+    def update_fail_status(self, dt: Time, p_fail: float = None):
         """
         Updates the fail status of the intelligent switch
         If the state of the intelligent switch is REPAIR, the remaining repair time is calculated
@@ -351,6 +355,9 @@ class IntelligentSwitch(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
@@ -359,10 +366,10 @@ class IntelligentSwitch(Component):
         """
         if self.state == IntelligentSwitchState.REPAIR:
             self.remaining_repair_time -= dt
-            if self.remaining_repair_time <= Time(0):
+            if self.remaining_repair_time.quantity <= 0:
                 self.not_fail()
         elif self.state == IntelligentSwitchState.OK:
-            self.draw_fail_status(dt)
+            self.draw_fail_status(dt, p_fail)
 
     def update_history(
         self, prev_time: Time, curr_time: Time, save_flag: bool
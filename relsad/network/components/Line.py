@@ -3,7 +3,7 @@ import numpy as np
 
 from relsad.StatDist import StatDist, StatDistType, UniformParameters
 from relsad.Time import Time, TimeUnit
-from relsad.utils import convert_yearly_fail_rate, random_choice
+from relsad.utils import History, convert_yearly_fail_rate, random_choice
 
 from .Bus import Bus
 from .Component import Component
@@ -229,7 +229,7 @@ class Line(Component):
         self.sensor = None
 
         ## History
-        self.history = {}
+        self.history = History()
         self.initialize_history()
 
     def __str__(self):
@@ -426,7 +426,7 @@ class Line(Component):
         self.fbus = self.tbus
         self.tbus = bus
 
-    def update_fail_status(self, dt: Time):
+    def update_fail_status(self, dt: Time, p_fail: float = None):
         """
         Updates the fail status of the line
 
@@ -434,6 +434,9 @@ class Line(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
@@ -446,12 +449,13 @@ class Line(Component):
                     discon.open()
         if self.failed:
             self.remaining_outage_time -= dt
-            if self.remaining_outage_time <= Time(0):
+            if self.remaining_outage_time.quantity <= 0:
                 self.not_fail()
                 self.parent_network.controller.check_components = True
                 self.remaining_outage_time = Time(0)
         else:
-            p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
+            if p_fail is None:
+                p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
             if random_choice(self.ps_random, p_fail):
                 self.fail(dt)
             else:
@@ -667,6 +671,8 @@ class Line(Component):
 
         """
         self.ps_random = random_gen
+        # Values buffered from a previous random generator are discarded
+        self.repair_time_dist.clear_buffer()
 
     def reset_status(self, save_flag: bool):
         """
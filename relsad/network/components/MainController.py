@@ -2,7 +2,7 @@ import matplotlib.lines as mlines
 import numpy as np
 
 from relsad.Time import Time, TimeUnit
-from relsad.utils import convert_yearly_fail_rate, random_choice
+from relsad.utils import History, convert_yearly_fail_rate, random_choice
 
 from .Component import Component
 from .Controller import Controller, ControllerState
@@ -74,6 +74,8 @@ class MainController(Component, Controller):
         Goes through the repair sequence of a software failure, draws the repair mechanism, returns the repair time and updates the state of the controller
     update_fail_status(dt)
         Updates the failure status of the controller based on the remaining outage time
+    handle_fail_state(dt)
+        Starts the repair of a hardware failure or runs the repair sequence of a software failure
     add_distribution_controller(controller)
         Adds distribution controllers from connected distribution systems to a list and
         sets the sectioning time for the controller. Assignes the
@@ -138,7 +140,7 @@ class MainController(Component, Controller):
         self.microgrid_controllers = list()
 
         ## History
-        self.history = {}
+        self.history = History()
         self.monte_carlo_history = {}
         self.initialize_history()
 
@@ -204,7 +206,12 @@ class MainController(Component, Controller):
         """
         self.state = ControllerState.OK
 
-    def draw_fail_status(self, dt: Time):
+    def draw_fail_status(
+        self,
+        dt: Time,
+        p_hardware_fail: float = None,
+        p_software_fail: float = None,
+    ):
         """
         Draws the failure status of the controller
 
@@ -212,20 +219,28 @@ class MainController(Component, Controller):
         ----------
         dt : Time
             The current time step
+        p_hardware_fail : float, optional
+            The hardware failure probability of the time step, found
+            from the yearly hardware failure rate if None
+        p_software_fail : float, optional
+            The software failure probability of the time step, found
+            from the yearly software failure rate if None
 
         Returns
         ----------
         None
 
         """
-        p_hardware_fail = convert_yearly_fail_rate(
-            self.hardware_fail_rate_per_year, dt
-        )
+        if p_hardware_fail is None:
+            p_hardware_fail = convert_yearly_fail_rate(
+                self.hardware_fail_rate_per_year, dt
+            )
         self.draw_hardware_status(p_hardware_fail)
         if self.state == ControllerState.OK:
-            p_software_fail = convert_yearly_fail_rate(
-                self.software_fail_rate_per_year, dt
-            )
+            if p_software_fail is None:
+                p_software_fail = convert_yearly_fail_rate(
+                    self.software_fail_rate_per_year, dt
+                )
             self.draw_software_status(p_software_fail)
 
     def draw_hardware_status(self, prob):
@@ -294,7 +309,12 @@ class MainController(Component, Controller):
                 self.state = ControllerState.REPAIR
             return repair_time
 
-    def update_fail_status(self, dt: Time):
+    def update_fail_status(
+        self,
+        dt: Time,
+        p_hardware_fail: float = None,
+        p_software_fail: float = None,
+    ):
         """
         Updates the failure status of the controller based on the remaining outage time
 
@@ -302,6 +322,12 @@ class MainController(Component, Controller):
         ----------
         dt : Time
             The current time step
+        p_hardware_fail : float, optional
+            The hardware failure probability of the time step, found
+            from the yearly hardware failure rate if None
+        p_software_fail : float, optional
+            The software failure probability of the time step, found
+            from the yearly software failure rate if None
 
         Returns
         ----------
@@ -310,16 +336,37 @@ class MainController(Component, Controller):
         """
         if self.state == ControllerState.REPAIR:
             self.remaining_repair_time -= dt
-            if self.remaining_repair_time <= Time(0):
+            if self.remaining_repair_time.quantity <= 0:
                 self.not_fail()
         elif self.state == ControllerState.OK:
-            self.draw_fail_status(dt)
-            if self.state == ControllerState.HARDWARE_FAIL:
-                self.remaining_repair_time = self.manual_hardware_repair_time
-                self.state = ControllerState.REPAIR
-            elif self.state == ControllerState.SOFTWARE_FAIL:
-                self.sectioning_time = self.repair_software_fail(dt)
-                self.spread_sectioning_time_to_sub_controllers()
+            self.draw_fail_status(
+                dt,
+                p_hardware_fail=p_hardware_fail,
+                p_software_fail=p_software_fail,
+            )
+            self.handle_fail_state(dt)
+
+    def handle_fail_state(self, dt: Time):
+        """
+        Starts the repair of a hardware failure or runs the repair
+        sequence of a software failure
+
+        Parameters
+        ----------
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        None
+
+        """
+        if self.state == ControllerState.HARDWARE_FAIL:
+            self.remaining_repair_time = self.manual_hardware_repair_time
+            self.state = ControllerState.REPAIR
+        elif self.state == ControllerState.SOFTWARE_FAIL:
+            self.sectioning_time = self.repair_software_fail(dt)
+            self.spread_sectioning_time_to_sub_controllers()
 
     def add_distribution_controller(self, controller):
         """
@@ -6,7 +6,12 @@ import numpy as np
 from relsad.network.containers import SectionState
 from relsad.Time import Time, TimeUnit
 from relsad.topology.ICT.dfs import is_connected
-from relsad.utils import convert_yearly_fail_rate, random_choice, unique
+from relsad.utils import (
+    History,
+    convert_yearly_fail_rate,
+    random_choice,
+    unique,
+)
 
 from .Component import Component
 from .Controller import Controller, ControllerState
@@ -163,7 +168,7 @@ class MicrogridController(Component, Controller):
         self.failed_sections = []
 
         ## History
-        self.history = {}
+        self.history = History()
         self.monte_carlo_history = {}
 
     def __str__(self):
@@ -209,7 +214,7 @@ class MicrogridController(Component, Controller):
                 and self.power_network.distribution_network.failed_line is True
             ):
                 return
-            elif self.sectioning_time <= Time(0):
+            elif self.sectioning_time.quantity <= 0:
                 self.disconnect_failed_sections()
                 if (
                     not self.power_network.connected_line.failed
@@ -251,7 +256,7 @@ class MicrogridController(Component, Controller):
                 and self.power_network.distribution_network.failed_line is True
             ):
                 return
-            elif self.sectioning_time <= Time(0):
+            elif self.sectioning_time.quantity <= 0:
                 self.disconnect_failed_sections()
                 if not self.power_network.connected_line.failed:
                     # Sectioning time finished
@@ -423,7 +428,7 @@ class MicrogridController(Component, Controller):
         """
         self.sectioning_time = (
             self.sectioning_time - dt
-            if self.sectioning_time > Time(0)
+            if self.sectioning_time.quantity > 0
             else Time(0)
         )
         self.sectioning_time = max(
@@ -432,7 +437,7 @@ class MicrogridController(Component, Controller):
         )
         if (
             self.power_network.connected_line.circuitbreaker.is_open
-            and self.sectioning_time <= Time(0)
+            and self.sectioning_time.quantity <= 0
         ):
             self.check_components = True
         if self.check_components:
@@ -509,7 +514,7 @@ class MicrogridController(Component, Controller):
         """
         self.sectioning_time = (
             self.sectioning_time - dt
-            if self.sectioning_time > Time(0)
+            if self.sectioning_time.quantity > 0
             else Time(0)
         )
         self.sectioning_time = max(
@@ -518,7 +523,7 @@ class MicrogridController(Component, Controller):
         )
         if (
             self.power_network.connected_line.circuitbreaker.is_open
-            and self.sectioning_time <= Time(0)
+            and self.sectioning_time.quantity <= 0
         ):
             self.check_components = True
         if self.check_components:
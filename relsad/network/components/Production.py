@@ -1,7 +1,8 @@
 import numpy as np
 
+from relsad.load.profiles import ProfileRegistry
 from relsad.Time import Time
-from relsad.utils import interpolate
+from relsad.utils import History
 
 from .Bus import Bus
 from .Component import Component
@@ -24,6 +25,15 @@ class Production(Component):
         Array of active production data
     qprod_data : np.ndarray
         Array of reactive production data
+    pprod_profile : np.ndarray
+        Active production profile as added to the production unit
+    qprod_profile : np.ndarray
+        Reactive production profile as added to the production unit
+    prod_scale : float
+        Scale factor of the production profiles
+    prod_profile_ids : tuple
+        The ids of the active and reactive production profiles in the
+        profile registry
     pprod : float
         The active power produced by the production unit [MW]
     qprod : float
@@ -38,9 +48,11 @@ class Production(Component):
 
     Methods
     ----------
-    add_prod_data(pprod_data, qprod_data)
+    add_prod_data(pprod_data, qprod_data, scale)
         Adds production data to the production component
-    prepare_prod_data(time_indices)
+    register_prod_profiles(profile_registry)
+        Adds the production profiles to a profile registry
+    prepare_prod_data(time_indices, profile_registry)
         Prepares the production data for the current time step configuration
     add_prod(pprod, qprod)
         Adds production to the bus
@@ -99,13 +111,17 @@ class Production(Component):
         bus.prod = self
         self.pprod_data = None
         self.qprod_data = None
+        self.pprod_profile = None
+        self.qprod_profile = None
+        self.prod_scale = 1.0
+        self.prod_profile_ids = None
         self.pprod = 0
         self.qprod = 0
         self.pmax = pmax
         self.qmax = qmax
 
         ## History
-        self.history = {}
+        self.history = History()
 
     def __str__(self):
         return self.name
@@ -126,6 +142,7 @@ class Production(Component):
         self,
         pprod_data: np.ndarray,
         qprod_data: np.ndarray = None,
+        scale: float = 1,
     ):
         """
         Adds production data to the production component
@@ -136,58 +153,97 @@ class Production(Component):
             Active power production array
         qprod_data : np.ndarray
             Reactive power production array
+        scale : float
+            Scale factor of the production arrays, letting production
+            units share the same production arrays with different
+            magnitudes
 
         Returns
         ----------
         None
 
         """
-        self.pprod_data = pprod_data
         if qprod_data is None:
-            self.qprod_data = np.zeros_like(pprod_data)
-        else:
-            self.qprod_data = qprod_data
+            qprod_data = np.zeros_like(pprod_data)
+        self.pprod_profile = pprod_data
+        self.qprod_profile = qprod_data
+        self.prod_scale = float(scale)
+        self.pprod_data = pprod_data
+        self.qprod_data = qprod_data
+        # The production data must be prepared again
+        self.prod_profile_ids = None
 
-    def prepare_prod_data(
-        self,
-        time_indices: np.ndarray,
-    ):
+    def register_prod_profiles(self, profile_registry: ProfileRegistry):
         """
-        Prepares the production data for the current time step configuration
+        Adds the production profiles to a profile registry, where
+        profiles that are already in the registry are referenced by the
+        id of the existing profile
 
         Parameters
         ----------
-        time_indices : np.ndarray
-            Time indices used to discretize the production data
+        profile_registry : ProfileRegistry
+            The profile registry
 
         Returns
         ----------
         None
 
         """
-        if self.pprod_data is None:
+        if self.pprod_profile is None:
             raise Exception(
                 "Active production data must be provided for {:s}".format(
                     self.name
                 )
             )
-
-        self.pprod_data = interpolate(
-            array=self.pprod_data,
-            time_indices=time_indices,
-        )
-
-        if self.qprod_data is None:
+        if self.qprod_profile is None:
             raise Exception(
                 "Reactive production data must be provided for {:s}".format(
                     self.name
                 )
             )
-
-        self.qprod_data = interpolate(
-            array=self.qprod_data,
-            time_indices=time_indices,
+        self.prod_profile_ids = (
+            profile_registry.add_profile(self.pprod_profile),
+            profile_registry.add_profile(self.qprod_profile),
+        )
+        # The production unit keeps the distinct profiles of the
+        # registry instead of its own copies
+        self.pprod_profile = profile_registry.get_profile(
+            self.prod_profile_ids[0]
         )
+        self.qprod_profile = profile_registry.get_profile(
+            self.prod_profile_ids[1]
+        )
+
+    def prepare_prod_data(
+        self,
+        time_indices: np.ndarray,
+        profile_registry: ProfileRegistry = None,
+    ):
+        """
+        Prepares the production data for the current time step
+        configuration, where the production data are the prepared
+        profiles of the profile registry
+
+        Parameters
+        ----------
+        time_indices : np.ndarray
+            Time indices used to discretize the production data
+        profile_registry : ProfileRegistry, optional
+            The profile registry of the power system, the production
+            unit uses a profile registry of its own if None
+
+        Returns
+        ----------
+        None
+
+        """
+        if profile_registry is None:
+            profile_registry = ProfileRegistry()
+        self.register_prod_profiles(profile_registry)
+        profile_registry.prepare(time_indices)
+        pprod_id, qprod_id = self.prod_profile_ids
+        self.pprod_data = profile_registry.get_prepared(pprod_id)
+        self.qprod_data = profile_registry.get_prepared(qprod_id)
 
     def add_prod(
         self,
@@ -228,8 +284,8 @@ class Production(Component):
 
         """
         self.reset_prod()
-        pprod = self.pprod_data[inc_idx]
-        qprod = self.qprod_data[inc_idx]
+        pprod = self.pprod_data[inc_idx] * self.prod_scale
+        qprod = self.qprod_data[inc_idx] * self.prod_scale
         if pprod > self.pmax:
             pprod = self.pmax
         if qprod > self.qmax:
@@ -364,7 +420,7 @@ class Production(Component):
         None
 
         """
-        self.history = {}
+        self.history = History()
 
 
 if __name__ == "__main__":
@@ -4,7 +4,7 @@ import matplotlib.lines as mlines
 import numpy as np
 
 from relsad.Time import Time, TimeUnit
-from relsad.utils import convert_yearly_fail_rate, random_choice
+from relsad.utils import History, convert_yearly_fail_rate, random_choice
 
 from .Component import Component
 from .ICTNode import ICTNode
@@ -171,7 +171,7 @@ class Sensor(Component):
         self.state = state
 
         ## History
-        self.history = {}
+        self.history = History()
         self.monte_carlo_history = {}
         self.initialize_history()
 
@@ -220,7 +220,7 @@ class Sensor(Component):
         """
         self.state = SensorState.OK
 
-    def draw_fail_status(self, dt: Time):
+    def draw_fail_status(self, dt: Time, p_fail: float = None):
         """
         Draws the state of the sensor for a given time step
 
@@ -228,14 +228,18 @@ class Sensor(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
         None
 
         """
-        p_not_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
-        self.draw_status(p_not_fail)
+        if p_fail is None:
+            p_fail = convert_yearly_fail_rate(self.fail_rate_per_year, dt)
+        self.draw_status(p_fail)
 
     def draw_status(self, prob):
         """
@@ -339,7 +343,7 @@ class Sensor(Component):
         line_section = self.line.section
         return line_section
 
-    def update_fail_status(self, dt: Time):
+    def update_fail_status(self, dt: Time, p_fail: float = None):
         """
         Updates the fail status of the sensor
         If the state of the sensor is REPAIR, the remaining repair time is set
@@ -349,6 +353,9 @@ class Sensor(Component):
         ----------
         dt : Time
             The current time step
+        p_fail : float, optional
+            The failure probability of the time step, found from the
+            yearly failure rate if None
 
         Returns
         ----------
@@ -357,10 +364,10 @@ class Sensor(Component):
         """
         if self.state == SensorState.REPAIR:
             self.remaining_repair_time -= dt
-            if self.remaining_repair_time <= Time(0):
+            if self.remaining_repair_time.quantity <= 0:
                 self.not_fail()
         elif self.state == SensorState.OK:
-            self.draw_fail_status(dt)
+            self.draw_fail_status(dt, p_fail)
 
     def update_history(self, prev_time, curr_time, save_flag: bool):
         """
@@ -15,6 +15,7 @@ from .Component import Component
 from .Controller import Controller, ControllerState
 from .Disconnector import Disconnector
 from .DistributionController import DistributionController
+from .EVFleet import EVFleet
 from .EVPark import EVPark
 from .ICTLine import ICTLine
 from .ICTNode import ICTNode
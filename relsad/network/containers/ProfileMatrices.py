@@ -0,0 +1,276 @@
+import numpy as np
+
+from .StateStore import StateStore
+
+
+class ProfileMatrices:
+    """
+    Load, cost and production of the buses and production units in a
+    power system for every time increment, built once from the prepared
+    load and production data
+
+    The total load of a bus in an increment is the sum of its scaled
+    load profiles, and the production of a production unit is its
+    scaled production profile limited by the capacity of the unit. The
+    matrices hold one row per bus or production unit and one column per
+    increment, so that the load and production of an increment are set
+    from one column instead of from the profiles of every component.
+    The interruption cost of a bus is the same in every increment, and
+    is held once per bus. The matrices are not pickled, and are rebuilt
+    from the components when first used after unpickling
+
+    ...
+
+    Attributes
+    ----------
+    buses : list
+        List of the buses
+    productions : list
+        List of the production units
+    n_steps : int
+        The number of time increments
+    pload : np.ndarray
+        The active load of each bus in each increment in MW
+    qload : np.ndarray
+        The reactive load of each bus in each increment in MVar
+    cost : np.ndarray
+        The interruption cost of each bus
+    s_ref : np.ndarray
+        The apparent power reference of each bus
+    prod_s_ref : np.ndarray
+        The apparent power reference of the bus of each production unit
+    pprod : np.ndarray
+        The active production of each production unit in each increment
+        in MW
+    qprod : np.ndarray
+        The reactive production of each production unit in each
+        increment in MVar
+    storage_buses : list
+        List of the buses with a battery or an EV park, where the
+        generation is reset after the production is set
+
+    Methods
+    ----------
+    build()
+        Builds the matrices from the prepared load and production data
+    set_load_and_cost(inc_idx, state_store)
+        Sets the load of the buses in an increment
+    set_prod(inc_idx, state_store)
+        Sets the production of the production units in an increment
+    """
+
+    def __init__(self, buses: list, productions: list, n_steps: int):
+        self.buses = list(buses)
+        self.productions = list(productions)
+        self.storage_buses = [
+            bus
+            for bus in self.buses
+            if bus.battery is not None or bus.ev_park is not None
+        ]
+        self.n_steps = n_steps
+        self.pload = None
+        self.qload = None
+        self.cost = None
+        self.s_ref = None
+        self.prod_s_ref = None
+        self.pprod = None
+        self.qprod = None
+        # Indices in the state store the matrices were last written to
+        self._store_indices = None
+        self.build()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for attribute in [
+            "pload",
+            "qload",
+            "cost",
+            "s_ref",
+            "prod_s_ref",
+            "pprod",
+            "qprod",
+            "_store_indices",
+        ]:
+            state[attribute] = None
+        return state
+
+    def build(self):
+        """
+        Builds the matrices from the prepared load and production data
+        of the buses and production units
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        n_steps = self.n_steps
+        self.pload = np.zeros((len(self.buses), n_steps), order="F")
+        self.qload = np.zeros((len(self.buses), n_steps), order="F")
+        self.cost = np.zeros(len(self.buses))
+        default_cost = 1e8
+        for bus_idx, bus in enumerate(self.buses):
+            type_cost = 0
+            for i, cost_function in enumerate(bus.cost_functions):
+                if bus.pload_data[i] is None or bus.qload_data[i] is None:
+                    continue
+                type_cost = max(
+                    type_cost,
+                    cost_function.A + cost_function.B * 1,
+                )
+                scale = bus.load_scales[i] * bus.n_customers
+                # Summed in the same order as in Bus.set_load_and_cost
+                self.pload[bus_idx] += bus.pload_data[i] * scale
+                self.qload[bus_idx] += bus.qload_data[i] * scale
+            self.cost[bus_idx] = type_cost if type_cost > 0 else default_cost
+        self.s_ref = np.array([bus.s_ref for bus in self.buses], dtype=float)
+        self.prod_s_ref = np.array(
+            [prod.bus.s_ref for prod in self.productions], dtype=float
+        )
+        self.pprod = np.zeros((len(self.productions), n_steps), order="F")
+        self.qprod = np.zeros((len(self.productions), n_steps), order="F")
+        for prod_idx, prod in enumerate(self.productions):
+            self.pprod[prod_idx] = np.minimum(
+                prod.pprod_data * prod.prod_scale, prod.pmax
+            )
+            self.qprod[prod_idx] = np.minimum(
+                prod.qprod_data * prod.prod_scale, prod.qmax
+            )
+
+    def set_load_and_cost(self, inc_idx: int, state_store: StateStore = None):
+        """
+        Sets the load and cost of the buses in an increment, where the
+        load is written to the state store if the buses are attached to
+        a state store
+
+        Parameters
+        ----------
+        inc_idx : int
+            Index of the increment
+        state_store : StateStore, optional
+            The state store of the power system
+
+        Returns
+        ----------
+        None
+
+        """
+        if self.pload is None:
+            self.build()
+        pload = self.pload[:, inc_idx]
+        qload = self.qload[:, inc_idx]
+        pload_pu = pload / self.s_ref
+        qload_pu = qload / self.s_ref
+        if state_store is not None and state_store.attached:
+            indices = self._get_store_indices(state_store)[0]
+            state_store.bus_arrays["pload"][indices] = pload
+            state_store.bus_arrays["qload"][indices] = qload
+            state_store.bus_arrays["pload_pu"][indices] = pload_pu
+            state_store.bus_arrays["qload_pu"][indices] = qload_pu
+            for bus, cost in zip(self.buses, self.cost.tolist()):
+                bus.cost = cost
+            return
+        for bus, p, q, p_pu, q_pu, cost in zip(
+            self.buses,
+            pload.tolist(),
+            qload.tolist(),
+            pload_pu.tolist(),
+            qload_pu.tolist(),
+            self.cost.tolist(),
+        ):
+            bus.pload = p
+            bus.qload = q
+            bus.pload_pu = p_pu
+            bus.qload_pu = q_pu
+            bus.cost = cost
+
+    def set_prod(self, inc_idx: int, state_store: StateStore = None):
+        """
+        Sets the production of the production units in an increment,
+        and resets the generation at the buses with a battery or an EV
+        park. The generation at the buses is written to the state store
+        if the buses are attached to a state store
+
+        Parameters
+        ----------
+        inc_idx : int
+            Index of the increment
+        state_store : StateStore, optional
+            The state store of the power system
+
+        Returns
+        ----------
+        None
+
+        """
+        if self.pprod is None:
+            self.build()
+        pprod = self.pprod[:, inc_idx]
+        qprod = self.qprod[:, inc_idx]
+        if state_store is not None and state_store.attached:
+            for prod, p, q in zip(
+                self.productions, pprod.tolist(), qprod.tolist()
+            ):
+                prod.pprod = p
+                prod.qprod = q
+            _, prod_indices, storage_indices = self._get_store_indices(
+                state_store
+            )
+            arrays = state_store.bus_arrays
+            arrays["pprod"][prod_indices] = pprod
+            arrays["qprod"][prod_indices] = qprod
+            arrays["pprod_pu"][prod_indices] = pprod / self.prod_s_ref
+            arrays["qprod_pu"][prod_indices] = qprod / self.prod_s_ref
+            for attribute in ["pprod", "qprod", "pprod_pu", "qprod_pu"]:
+                arrays[attribute][storage_indices] = 0
+            return
+        for prod, p, q in zip(
+            self.productions, pprod.tolist(), qprod.tolist()
+        ):
+            prod.pprod = p
+            prod.qprod = q
+            prod.update_bus_prod()
+        for bus in self.storage_buses:
+            bus.reset_prod()
+
+    def _get_store_indices(self, state_store: StateStore):
+        """
+        Returns the indices in a state store of the buses, the buses of
+        the production units and the buses with a battery or an EV park
+
+        Parameters
+        ----------
+        state_store : StateStore
+            The state store of the power system
+
+        Returns
+        ----------
+        bus_indices : np.ndarray | slice
+            The indices of the buses, a slice if the buses are in the
+            order of the state store
+        prod_indices : np.ndarray
+            The indices of the buses of the production units
+        storage_indices : np.ndarray
+            The indices of the buses with a battery or an EV park
+
+        """
+        if (
+            self._store_indices is None
+            or self._store_indices[0] is not state_store
+        ):
+            bus_indices = state_store.get_bus_indices(self.buses)
+            if np.array_equal(bus_indices, np.arange(len(state_store.buses))):
+                bus_indices = slice(None)
+            self._store_indices = (
+                state_store,
+                bus_indices,
+                state_store.get_bus_indices(
+                    [prod.bus for prod in self.productions]
+                ),
+                state_store.get_bus_indices(self.storage_buses),
+            )
+        return self._store_indices[1:]
@@ -0,0 +1,388 @@
+import numpy as np
+
+from relsad.network.components.Bus import Bus
+from relsad.network.components.Line import Line
+
+
+class StoredAttribute:
+    """
+    Descriptor for a component attribute that is held in a state store.
+    The value is read from and written to the array of the attribute in
+    the state store, at the index of the component
+
+    ...
+
+    Attributes
+    ----------
+    name : str
+        The name of the attribute
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        arrays, idx = instance._state
+        return arrays[self.name][idx].item()
+
+    def __set__(self, instance, value):
+        arrays, idx = instance._state
+        arrays[self.name][idx] = value
+
+
+class StoredBus(Bus):
+    """
+    Bus attached to a state store, where the load flow, load,
+    generation and fail status attributes are held in the store
+    """
+
+    p_load_downstream = StoredAttribute()
+    q_load_downstream = StoredAttribute()
+    p_loss_downstream = StoredAttribute()
+    q_loss_downstream = StoredAttribute()
+    voang = StoredAttribute()
+    vomag = StoredAttribute()
+    pload = StoredAttribute()
+    qload = StoredAttribute()
+    pload_pu = StoredAttribute()
+    qload_pu = StoredAttribute()
+    pprod = StoredAttribute()
+    qprod = StoredAttribute()
+    pprod_pu = StoredAttribute()
+    qprod_pu = StoredAttribute()
+    trafo_failed = StoredAttribute()
+
+
+class StoredLine(Line):
+    """
+    Line attached to a state store, where the load flow, connection
+    and fail status attributes are held in the store
+    """
+
+    ploss = StoredAttribute()
+    qloss = StoredAttribute()
+    connected = StoredAttribute()
+    failed = StoredAttribute()
+
+
+def get_stored_attributes(component_type):
+    """
+    Returns the names of the attributes of a stored component type
+    that are held in a state store
+
+    Parameters
+    ----------
+    component_type : type
+        The stored component type
+
+    Returns
+    ----------
+    attributes : list
+        List of attribute names
+
+    """
+    attributes = [
+        name
+        for name, attribute in vars(component_type).items()
+        if isinstance(attribute, StoredAttribute)
+    ]
+    return attributes
+
+
+def get_stored_indices(components: list, cached: tuple = None):
+    """
+    Returns the arrays of the state store that a list of components is
+    attached to, and the indices of the components in the arrays
+
+    Parameters
+    ----------
+    components : list
+        List of buses or lines
+    cached : tuple, optional
+        Arrays and indices returned before for the same components,
+        reused if the components are still attached to the arrays
+
+    Returns
+    ----------
+    stored_indices : tuple
+        The arrays of the state store and the indices of the
+        components, None if the components are not attached to the
+        same state store
+
+    """
+    if len(components) == 0:
+        return None
+    state = components[0].__dict__.get("_state")
+    if state is None:
+        return None
+    arrays = state[0]
+    if cached is not None and cached[0] is arrays:
+        return cached
+    indices = list()
+    for comp in components:
+        comp_state = comp.__dict__.get("_state")
+        if comp_state is None or comp_state[0] is not arrays:
+            return None
+        indices.append(comp_state[1])
+    return arrays, np.array(indices, dtype=int)
+
+
+class StateStore:
+    """
+    Store holding the state of the buses and lines in a power system in
+    contiguous arrays, one array per attribute indexed by the position
+    of the bus or line in the power system
+
+    While the buses and lines are attached to the store, they are
+    StoredBus and StoredLine instances, whose stored attributes are read
+    from and written to the arrays. This makes it possible to operate on
+    the whole system at once, while the components keep their public
+    attributes. Components that are not attached are unaffected
+
+    ...
+
+    Attributes
+    ----------
+    buses : list
+        List of buses in the store
+    lines : list
+        List of lines in the store
+    bus_arrays : dict
+        Dictionary with an array per stored bus attribute
+    line_arrays : dict
+        Dictionary with an array per stored line attribute
+    bus_index : dict
+        Dictionary with the index of each bus, the key is the bus name
+    line_index : dict
+        Dictionary with the index of each line, the key is the line name
+    attached : bool
+        Indicates if the buses and lines are attached to the store
+
+    Methods
+    ----------
+    attach()
+        Moves the state of the buses and lines into the store
+    detach()
+        Moves the state of the buses and lines back to the components
+    get_bus_array(attribute)
+        Returns the array of a bus attribute
+    get_line_array(attribute)
+        Returns the array of a line attribute
+    get_bus_indices(buses)
+        Returns the indices of a list of buses
+    get_line_indices(lines)
+        Returns the indices of a list of lines
+    reset_load_flow_data()
+        Resets the variables used in the load flow analysis
+    failed_comp()
+        Returns True if a bus or a line in the store has failed
+    """
+
+    def __init__(self, buses: list, lines: list):
+        self.buses = list(buses)
+        self.lines = list(lines)
+        self.bus_index = {bus.name: idx for idx, bus in enumerate(self.buses)}
+        self.line_index = {
+            line.name: idx for idx, line in enumerate(self.lines)
+        }
+        self.bus_arrays = self._create_arrays(self.buses, StoredBus)
+        self.line_arrays = self._create_arrays(self.lines, StoredLine)
+        self.attached = False
+
+    @staticmethod
+    def _create_arrays(components: list, component_type):
+        """
+        Creates one array per stored attribute of a component type,
+        filled with the current attribute values of the components
+
+        Parameters
+        ----------
+        components : list
+            List of components
+        component_type : type
+            The stored component type
+
+        Returns
+        ----------
+        arrays : dict
+            Dictionary with an array per stored attribute
+
+        """
+        arrays = {}
+        for attribute in get_stored_attributes(component_type):
+            values = [getattr(comp, attribute) for comp in components]
+            dtype = (
+                bool
+                if all(isinstance(value, bool) for value in values)
+                and len(values) > 0
+                else float
+            )
+            arrays[attribute] = np.array(values, dtype=dtype)
+        return arrays
+
+    def attach(self):
+        """
+        Moves the state of the buses and lines into the store
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        if self.attached:
+            return
+        for arrays, components, stored_type in [
+            (self.bus_arrays, self.buses, StoredBus),
+            (self.line_arrays, self.lines, StoredLine),
+        ]:
+            for idx, comp in enumerate(components):
+                for attribute, array in arrays.items():
+                    array[idx] = comp.__dict__.pop(attribute)
+                comp._state = (arrays, idx)
+                comp.__class__ = stored_type
+        self.attached = True
+
+    def detach(self):
+        """
+        Moves the state of the buses and lines back to the components
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        if not self.attached:
+            return
+        for arrays, components, component_type in [
+            (self.bus_arrays, self.buses, Bus),
+            (self.line_arrays, self.lines, Line),
+        ]:
+            for idx, comp in enumerate(components):
+                comp.__class__ = component_type
+                del comp._state
+                for attribute, array in arrays.items():
+                    setattr(comp, attribute, array[idx].item())
+        self.attached = False
+
+    def get_bus_array(self, attribute: str):
+        """
+        Returns the array of a bus attribute
+
+        Parameters
+        ----------
+        attribute : str
+            The bus attribute
+
+        Returns
+        ----------
+        array : np.ndarray
+            The array of the attribute, indexed by bus index
+
+        """
+        return self.bus_arrays[attribute]
+
+    def get_line_array(self, attribute: str):
+        """
+        Returns the array of a line attribute
+
+        Parameters
+        ----------
+        attribute : str
+            The line attribute
+
+        Returns
+        ----------
+        array : np.ndarray
+            The array of the attribute, indexed by line index
+
+        """
+        return self.line_arrays[attribute]
+
+    def get_bus_indices(self, buses: list):
+        """
+        Returns the indices of a list of buses
+
+        Parameters
+        ----------
+        buses : list
+            List of buses
+
+        Returns
+        ----------
+        indices : np.ndarray
+            The indices of the buses
+
+        """
+        return np.array([self.bus_index[bus.name] for bus in buses], dtype=int)
+
+    def get_line_indices(self, lines: list):
+        """
+        Returns the indices of a list of lines
+
+        Parameters
+        ----------
+        lines : list
+            List of lines
+
+        Returns
+        ----------
+        indices : np.ndarray
+            The indices of the lines
+
+        """
+        return np.array(
+            [self.line_index[line.name] for line in lines], dtype=int
+        )
+
+    def reset_load_flow_data(self):
+        """
+        Resets the variables used in the load flow analysis
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        for attribute in [
+            "p_load_downstream",
+            "q_load_downstream",
+            "p_loss_downstream",
+            "q_loss_downstream",
+            "voang",
+        ]:
+            self.bus_arrays[attribute][:] = 0.0
+        self.bus_arrays["vomag"][:] = 1.0
+        self.line_arrays["ploss"][:] = 0.0
+        self.line_arrays["qloss"][:] = 0.0
+
+    def failed_comp(self):
+        """
+        Returns True if a bus or a line in the store has failed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        True/False
+
+        """
+        return bool(
+            self.bus_arrays["trafo_failed"].any()
+            or self.line_arrays["failed"].any()
+        )
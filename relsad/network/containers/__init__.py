@@ -8,7 +8,16 @@ Container types
 
 """
 
+from .ProfileMatrices import ProfileMatrices
 from .Section import Section, SectionState
+from .StateStore import (
+    StateStore,
+    StoredAttribute,
+    StoredBus,
+    StoredLine,
+    get_stored_attributes,
+    get_stored_indices,
+)
 
 __all__ = []
 for v in dir():
@@ -1,5 +1,5 @@
 from relsad.network.components import Bus, DistributionController, Line
-from relsad.utils import unique
+from relsad.utils import History, unique
 
 from .PowerNetwork import PowerNetwork
 from .PowerSystem import PowerSystem
@@ -152,7 +152,7 @@ class Distribution(PowerNetwork):
         # Sectioning
         self.sections = None
         ## History
-        self.history: dict = {}
+        self.history: History = History()
         self.monte_carlo_history: dict = {}
 
     def __str__(self):
@@ -1,5 +1,5 @@
 from relsad.network.components import ICTLine, ICTNode
-from relsad.utils import unique
+from relsad.utils import History, unique
 
 from .PowerSystem import PowerSystem
 
@@ -74,7 +74,7 @@ class ICTNetwork:
         self.failed_line = False
 
         ## History
-        self.history: dict = {}
+        self.history: History = History()
         self.monte_carlo_history: dict = {}
 
     def __str__(self):
@@ -4,7 +4,7 @@ from relsad.network.components import (
     MicrogridController,
     MicrogridMode,
 )
-from relsad.utils import unique
+from relsad.utils import History, unique
 
 from .Distribution import Distribution
 from .PowerNetwork import PowerNetwork
@@ -162,7 +162,7 @@ class Microgrid(PowerNetwork):
         # Sectioning
         self.sections = None
         ## History
-        self.history: dict = {}
+        self.history: History = History()
         self.monte_carlo_history: dict = {}
 
     def __str__(self):
@@ -451,8 +451,9 @@ class Microgrid(PowerNetwork):
             p_load, q_load = 0, 0
             for bus in self.buses:
                 for i in range(len(bus.pload_data)):
-                    p_load += bus.pload_data[i][increment] * bus.n_customers
-                    q_load += bus.qload_data[i][increment] * bus.n_customers
+                    scale = bus.load_scales[i] * bus.n_customers
+                    p_load += bus.pload_data[i][increment] * scale
+                    q_load += bus.qload_data[i][increment] * scale
             p_load_max = max(p_load_max, p_load)
             q_load_max = max(q_load_max, q_load)
         return p_load_max, q_load_max
@@ -1,6 +1,14 @@
 import numpy as np
 
-from relsad.network.components import Bus, ICTLine, ICTNode, Line
+from relsad.network.components import (
+    Bus,
+    ICTLine,
+    ICTNode,
+    Line,
+    MainController,
+)
+from relsad.load.profiles import ProfileRegistry
+from relsad.network.containers import ProfileMatrices, StateStore
 from relsad.reliability.indices import (
     ASAI,
     ASUI,
@@ -11,10 +19,11 @@ from relsad.reliability.indices import (
     EV_Duration,
     EV_Index,
     EV_Interruption,
+    ReliabilityIndexAccumulator,
 )
 from relsad.Time import Time, TimeStamp
 from relsad.topology.sectioning import create_sections, get_section_list
-from relsad.utils import INF, eq, unique
+from relsad.utils import INF, History, eq, unique
 
 from .PowerNetwork import PowerNetwork
 from .Transmission import Transmission
@@ -76,6 +85,16 @@ class PowerSystem(PowerNetwork):
         Dictionary containing the history variables of the power system
     monte_carlo_history : dict
         Dictionary containing the history variables from the monte carlo simulation
+    index_accumulators : dict
+        Dictionary containing the reliability index accumulators of the
+        power system and the child networks by network name
+    profile_registry : ProfileRegistry
+        The registry of the distinct load and production profiles in
+        the power system, a registry with a memmap directory holds the
+        prepared profiles in a memory-mapped file
+    profile_matrices : ProfileMatrices
+        The load, cost and production of the buses and production units
+        for every time increment, None if not prepared
 
 
 
@@ -125,6 +144,9 @@ class PowerSystem(PowerNetwork):
     prepare_prod_data(time_indices)
         Prepares the production data for the production components
         in the power system
+    prepare_profile_matrices()
+        Builds the load, cost and production of the buses and
+        production components for every time increment
     set_load_and_cost(inc_idx)
         Sets the bus load and cost in MW based on load and cost profiles
         in the current increment for the power system
@@ -144,6 +166,12 @@ class PowerSystem(PowerNetwork):
         from the Monte Carlo simulation
     initialize_sequence_history()
         Initializes the dictionaries used for sequence history variables
+    initialize_index_accumulators()
+        Initializes the reliability index accumulators of the power
+        system and the child networks
+    get_network_state(network, curr_time)
+        Returns the sequence history variables of the power system or a
+        child network
     update_sequence_history()
         Updates the sequence history variables of the power system
     initialize_monte_carlo_history()
@@ -159,10 +187,17 @@ class PowerSystem(PowerNetwork):
         from the Monte Carlo simulation
     get_history(attribute)
         Returns the specified history variable
+    reserve_history(capacity)
+        Makes room for a number of time increments in the history of the
+        power system, its child networks, components and controllers
     reset_energy_shed_variables()
         Resets the energy.shed variables
     verify_component_setup()
         Verifies the component setup in the power system
+    enable_state_store()
+        Moves the state of the buses and lines into a state store
+    disable_state_store()
+        Moves the state of the buses and lines back to the components
 
     """
 
@@ -212,10 +247,16 @@ class PowerSystem(PowerNetwork):
         ## Child networks
         self.child_network_list: list = []
         ## History
-        self.history: dict = {}
+        self.history: History = History()
+        self.index_accumulators = None
         self.monte_carlo_history: dict = {}
         ## Random instance
         self.random_instance: np.random.Generator = None
+        ## State store
+        self.state_store: StateStore = None
+        ## Load and production profiles
+        self.profile_registry: ProfileRegistry = ProfileRegistry()
+        self.profile_matrices: ProfileMatrices = None
 
     def __str__(self):
         return self.name
@@ -249,6 +290,11 @@ class PowerSystem(PowerNetwork):
         None
 
         """
+        if self.state_store is not None:
+            raise Exception(
+                "A bus cannot be added while the state store is enabled"
+            )
+        self.profile_matrices = None
         self.comp_dict[bus.name] = bus
         self.comp_list.append(bus)
         self.buses.append(bus)
@@ -322,6 +368,10 @@ class PowerSystem(PowerNetwork):
         None
 
         """
+        if self.state_store is not None:
+            raise Exception(
+                "A line cannot be added while the state store is enabled"
+            )
         self.comp_dict[line.name] = line
         self.comp_list.append(line)
         self.lines.append(line)
@@ -656,7 +706,8 @@ class PowerSystem(PowerNetwork):
 
     def prepare_load_data(self, time_indices: np.ndarray):
         """
-        Prepares the load data for the buses in the power system
+        Prepares the load data for the buses in the power system, where
+        each distinct load profile is interpolated once
 
         Parameters
         ----------
@@ -668,13 +719,18 @@ class PowerSystem(PowerNetwork):
         None
 
         """
+        self.profile_matrices = None
+        for bus in self.buses:
+            bus.register_load_profiles(self.profile_registry)
+        self.profile_registry.prepare(time_indices)
         for bus in self.buses:
-            bus.prepare_load_data(time_indices)
+            bus.prepare_load_data(time_indices, self.profile_registry)
 
     def prepare_prod_data(self, time_indices: np.ndarray):
         """
         Prepares the production data for the production components
-        in the power system
+        in the power system, where each distinct production profile is
+        interpolated once
 
         Parameters
         ----------
@@ -686,13 +742,40 @@ class PowerSystem(PowerNetwork):
         None
 
         """
+        self.profile_matrices = None
         for prod in self.productions:
-            prod.prepare_prod_data(time_indices)
+            prod.register_prod_profiles(self.profile_registry)
+        self.profile_registry.prepare(time_indices)
+        for prod in self.productions:
+            prod.prepare_prod_data(time_indices, self.profile_registry)
+
+    def prepare_profile_matrices(self):
+        """
+        Builds the load, cost and production of the buses and
+        production components for every time increment from the
+        prepared load and production data. The matrices are used to set
+        the load and production until the data are prepared again
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.profile_matrices = ProfileMatrices(
+            buses=self.buses,
+            productions=self.productions,
+            n_steps=self.profile_registry.time_size,
+        )
 
     def set_load_and_cost(self, inc_idx: int):
         """
         Sets the bus load and cost in MW based on load and cost profiles
-        in the current increment for the power system
+        in the current increment for the power system, read from the
+        profile matrices if they are prepared
 
         Parameters
         ----------
@@ -704,13 +787,17 @@ class PowerSystem(PowerNetwork):
         None
 
         """
+        if self.profile_matrices is not None:
+            self.profile_matrices.set_load_and_cost(inc_idx, self.state_store)
+            return
         for bus in self.buses:
             bus.set_load_and_cost(inc_idx)
 
     def set_prod(self, inc_idx: int):
         """
         Sets the generation (generation units, batteries, EV parks)
-        at the buses in the power system
+        at the buses in the power system, read from the profile
+        matrices if they are prepared
 
         Parameters
         ----------
@@ -722,6 +809,9 @@ class PowerSystem(PowerNetwork):
         None
 
         """
+        if self.profile_matrices is not None:
+            self.profile_matrices.set_prod(inc_idx, self.state_store)
+            return
         for prod in self.productions:
             prod.set_prod(inc_idx)
         for bus in self.buses:
@@ -744,6 +834,8 @@ class PowerSystem(PowerNetwork):
         True/False
 
         """
+        if self.state_store is not None:
+            return self.state_store.failed_comp()
         return any(
             bus.trafo_failed for bus in self.buses
         ) or any(line.failed for line in self.lines)
@@ -780,6 +872,9 @@ class PowerSystem(PowerNetwork):
         None
 
         """
+        if self.state_store is not None:
+            self.state_store.reset_load_flow_data()
+            return
         for bus in self.buses:
             bus.reset_load_flow_data()
         for line in self.lines:
@@ -838,6 +933,77 @@ class PowerSystem(PowerNetwork):
             for state_var in network_state_list:
                 network.history[state_var] = {}
         self.controller.initialize_history()
+        self.initialize_index_accumulators()
+
+    def initialize_index_accumulators(self):
+        """
+        Initializes the reliability index accumulators of the power
+        system and the child networks from the current bus counters,
+        and registers the accumulators at the buses of the networks
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        networks = [self] + self.child_network_list
+        self.index_accumulators = {
+            network.name: ReliabilityIndexAccumulator(network)
+            for network in networks
+        }
+        for network in networks:
+            for bus in network.buses:
+                bus.index_accumulators = []
+        for network in networks:
+            for bus in network.buses:
+                bus.index_accumulators.append(
+                    self.index_accumulators[network.name]
+                )
+
+    def get_network_state(self, network: PowerNetwork, curr_time: Time):
+        """
+        Returns the sequence history variables of the power system or a
+        child network at the current time
+
+        The reliability indices are found from the index accumulator of
+        the network, without summing over the buses
+
+        Parameters
+        ----------
+        network : PowerNetwork
+            The power system or a child network
+        curr_time : Time
+            The current time
+
+        Returns
+        ----------
+        state_dict : dict
+            Dictionary with the sequence history variables
+
+        """
+        index_accumulator = self.index_accumulators[network.name]
+        p_load, q_load = network.get_system_load()
+        return {
+            "p_energy_shed": network.p_energy_shed,
+            "q_energy_shed": network.q_energy_shed,
+            "acc_p_energy_shed": network.acc_p_energy_shed,
+            "acc_q_energy_shed": network.acc_q_energy_shed,
+            "p_load": p_load,
+            "q_load": q_load,
+            "SAIFI": index_accumulator.get_SAIFI(),
+            "SAIDI": index_accumulator.get_SAIDI(),
+            "CAIDI": index_accumulator.get_CAIDI(),
+            "ASAI": index_accumulator.get_ASAI(curr_time),
+            "ASUI": index_accumulator.get_ASUI(curr_time),
+            "ENS": index_accumulator.get_ENS(),
+            "EV_Index": EV_Index(network),
+            "EV_Interruption": EV_Interruption(network),
+            "EV_Duration": EV_Duration(network),
+        }
 
     def update_sequence_history(
         self,
@@ -877,43 +1043,10 @@ class PowerSystem(PowerNetwork):
         self.acc_p_energy_shed += self.p_energy_shed
         self.acc_q_energy_shed += self.q_energy_shed
         if save_flag:
-            self_state_dict = {
-                "p_energy_shed": self.p_energy_shed,
-                "q_energy_shed": self.p_energy_shed,
-                "acc_p_energy_shed": self.acc_p_energy_shed,
-                "acc_q_energy_shed": self.acc_q_energy_shed,
-                "p_load": self.get_system_load()[0],
-                "q_load": self.get_system_load()[1],
-                "SAIFI": SAIFI(self),
-                "SAIDI": SAIDI(self),
-                "CAIDI": CAIDI(self),
-                "ASAI": ASAI(self, curr_time),
-                "ASUI": ASUI(self, curr_time),
-                "ENS": ENS(self),
-                "EV_Index": EV_Index(self),
-                "EV_Interruption": EV_Interruption(self),
-                "EV_Duration": EV_Duration(self),
-            }
-            for state_var, value in self_state_dict.items():
-                self.history[state_var][time] = value
-            for network in self.child_network_list:
-                network_state_dict = {
-                    "p_energy_shed": network.p_energy_shed,
-                    "q_energy_shed": network.q_energy_shed,
-                    "acc_p_energy_shed": network.acc_p_energy_shed,
-                    "acc_q_energy_shed": network.acc_q_energy_shed,
-                    "p_load": network.get_system_load()[0],
-                    "q_load": network.get_system_load()[1],
-                    "SAIFI": SAIFI(network),
-                    "SAIDI": SAIDI(network),
-                    "CAIDI": CAIDI(network),
-                    "ASAI": ASAI(network, curr_time),
-                    "ASUI": ASUI(network, curr_time),
-                    "ENS": ENS(network),
-                    "EV_Index": EV_Index(network),
-                    "EV_Interruption": EV_Interruption(network),
-                    "EV_Duration": EV_Duration(network),
-                }
+            if self.index_accumulators is None:
+                self.initialize_index_accumulators()
+            for network in [self] + self.child_network_list:
+                network_state_dict = self.get_network_state(network, curr_time)
                 for state_var, value in network_state_dict.items():
                     network.history[state_var][time] = value
         self.p_energy_shed = 0
@@ -1135,6 +1268,33 @@ class PowerSystem(PowerNetwork):
         """
         return self.history[attribute]
 
+    def reserve_history(self, capacity: int):
+        """
+        Makes room for a number of time increments in the history of the
+        power system, its child networks, components and controllers
+
+        Parameters
+        ----------
+        capacity : int
+            The number of time increments
+
+        Returns
+        ----------
+        None
+
+        """
+        obj_list = (
+            [self]
+            + self.child_network_list
+            + self.comp_list
+            + self.controller.distribution_controllers
+            + self.controller.microgrid_controllers
+        )
+        if isinstance(self.controller, MainController):
+            obj_list.append(self.controller)
+        for obj in obj_list:
+            obj.history.reserve(capacity)
+
     def reset_energy_shed_variables(self):
         """
         Resets the energy.shed variables
@@ -1175,3 +1335,46 @@ class PowerSystem(PowerNetwork):
                                 line.name
                             )
                         )
+
+    def enable_state_store(self):
+        """
+        Moves the state of the buses and lines into a state store, where
+        the state is held in contiguous arrays indexed by bus and line.
+        The buses and lines must be added to the power system before
+        the state store is enabled
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        state_store : StateStore
+            The state store of the power system
+
+        """
+        if self.state_store is None:
+            self.state_store = StateStore(
+                buses=self.buses,
+                lines=self.lines,
+            )
+            self.state_store.attach()
+        return self.state_store
+
+    def disable_state_store(self):
+        """
+        Moves the state of the buses and lines back to the components
+        and removes the state store
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        if self.state_store is not None:
+            self.state_store.detach()
+            self.state_store = None
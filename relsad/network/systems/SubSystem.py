@@ -37,12 +37,16 @@ class SubSystem:
         List containing the components in the sub system
     comp_dict : dict
         Dictionary containing the components in the sub system
+    comp_set : set
+        Set containing the components in the sub system
     child_network_list : list
         List containing the child networks to the sub system
 
 
     Methods
     ----------
+    add_comp(comp, comp_type_list)
+        Adding a component to the sub system and to the list of its component type
     add_bus(bus)
         Adding a bus including elements on the bus (battery, generation unit, EV park) to the sub system
     add_buses(buses)
@@ -88,6 +92,7 @@ class SubSystem:
         self.disconnectors = list()
         self.comp_list = list()
         self.comp_dict = dict()
+        self.comp_set = set()
         ## Child networks
         self.child_network_list: list = list()
 
@@ -108,6 +113,28 @@ class SubSystem:
     def __hash__(self):
         return hash(self.name)
 
+    def add_comp(self, comp, comp_type_list: list):
+        """
+        Adding a component to the sub system and to the list of its component type
+
+        Parameters
+        ----------
+        comp : Component
+            A component element
+        comp_type_list : list
+            The list of the component type in the sub system
+
+        Returns
+        ----------
+        None
+
+        """
+        self.comp_dict[comp.name] = comp
+        if comp not in self.comp_set:
+            self.comp_set.add(comp)
+            self.comp_list.append(comp)
+            comp_type_list.append(comp)
+
     def add_bus(self, bus: Bus):
         """
         Adding a bus including elements on the bus (battery, generation unit, EV park) to the sub system
@@ -122,26 +149,15 @@ class SubSystem:
         None
 
         """
-        self.comp_dict[bus.name] = bus
-        self.comp_list.append(bus)
-        self.buses.append(bus)
-        self.buses = unique(self.buses)
+        if bus in self.comp_set:
+            return
+        self.add_comp(bus, self.buses)
         if bus.ev_park is not None:
-            self.comp_dict[bus.ev_park.name] = bus.ev_park
-            self.comp_list.append(bus.ev_park)
-            self.ev_parks.append(bus.ev_park)
-            self.ev_parks = unique(self.ev_parks)
+            self.add_comp(bus.ev_park, self.ev_parks)
         if bus.battery is not None:
-            self.comp_dict[bus.battery.name] = bus.battery
-            self.comp_list.append(bus.battery)
-            self.batteries.append(bus.battery)
-            self.batteries = unique(self.batteries)
+            self.add_comp(bus.battery, self.batteries)
         if bus.prod is not None:
-            self.comp_dict[bus.prod.name] = bus.prod
-            self.comp_list.append(bus.prod)
-            self.productions.append(bus.prod)
-            self.productions = unique(self.productions)
-        self.comp_list = unique(self.comp_list)
+            self.add_comp(bus.prod, self.productions)
 
     def add_buses(self, buses: list):
         """Adding buses to the sub system
@@ -173,22 +189,13 @@ class SubSystem:
         None
 
         """
-        self.comp_dict[line.name] = line
-        self.comp_list.append(line)
-        self.lines.append(line)
-        self.lines = unique(self.lines)
+        if line in self.comp_set:
+            return
+        self.add_comp(line, self.lines)
         for discon in line.disconnectors:
-            self.comp_dict[discon.name] = discon
-            self.comp_list.append(discon)
-            self.disconnectors.append(discon)
-            self.disconnectors = unique(self.disconnectors)
+            self.add_comp(discon, self.disconnectors)
         if line.circuitbreaker is not None:
-            c_b = line.circuitbreaker
-            self.comp_dict[c_b.name] = c_b
-            self.comp_list.append(c_b)
-            self.circuitbreakers.append(c_b)
-            self.circuitbreakers = unique(self.circuitbreakers)
-        self.comp_list = unique(self.comp_list)
+            self.add_comp(line.circuitbreaker, self.circuitbreakers)
 
     def add_lines(self, lines: list):
         """
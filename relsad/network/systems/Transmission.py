@@ -1,4 +1,5 @@
 from relsad.network.components import Bus, Line
+from relsad.utils import History
 
 from .PowerNetwork import PowerNetwork
 
@@ -93,7 +94,7 @@ class Transmission(PowerNetwork):
         self.acc_q_energy_shed = 0
 
         ## History
-        self.history: dict = {}
+        self.history: History = History()
         self.monte_carlo_history: dict = {}
 
     def __str__(self):
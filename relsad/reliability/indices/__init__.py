@@ -13,6 +13,8 @@ from .ev import (
     EV_Duration,
 )
 
+from .accumulator import ReliabilityIndexAccumulator
+
 __all__ = []
 for v in dir():
     if not v.startswith("__") and v != "relsad":
@@ -0,0 +1,225 @@
+from relsad.network.systems import PowerNetwork
+from relsad.Time import Time
+from relsad.utils import eq
+
+
+class ReliabilityIndexAccumulator:
+    """
+    Running customer weighted sums of the bus counters of a network,
+    giving the current SAIFI, SAIDI, CAIDI, ASUI, ASAI and ENS of the
+    network without summing over the buses
+
+    The sums are found from the buses when the accumulator is reset,
+    and are then updated by the buses whose interruption, outage time
+    or energy shed counters change
+
+    ...
+
+    Attributes
+    ----------
+    network : PowerNetwork
+        The network of the accumulator
+    total_customers : int
+        The number of customers in the network
+    interruptions_x_customers : float
+        The sum of the accumulated interruptions times the number of
+        customers of the buses
+    outage_hours_x_customers : float
+        The sum of the accumulated outage time in hours times the
+        number of customers of the buses
+    energy_shed : float
+        The sum of the accumulated active energy shed of the buses
+
+    Methods
+    ----------
+    reset()
+        Finds the sums from the buses of the network
+    add(n_customers, interruptions, outage_hours, energy_shed)
+        Adds the change of the counters of a bus to the sums
+    get_SAIFI()
+        Returns the current SAIFI of the network
+    get_SAIDI()
+        Returns the current SAIDI of the network
+    get_CAIDI()
+        Returns the current CAIDI of the network
+    get_ASUI(current_time)
+        Returns the current ASUI of the network
+    get_ASAI(current_time)
+        Returns the current ASAI of the network
+    get_ENS()
+        Returns the current ENS of the network
+    """
+
+    def __init__(self, network: PowerNetwork):
+        self.network = network
+        self.reset()
+
+    def __str__(self):
+        return f"ReliabilityIndexAccumulator({self.network.name})"
+
+    def __repr__(self):
+        return f"ReliabilityIndexAccumulator({self.network.name})"
+
+    def reset(self):
+        """
+        Finds the sums from the buses of the network
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        buses = self.network.buses
+        self.total_customers = sum(bus.n_customers for bus in buses)
+        self.interruptions_x_customers = sum(
+            bus.acc_interruptions * bus.n_customers for bus in buses
+        )
+        self.outage_hours_x_customers = sum(
+            bus.acc_outage_time.get_hours() * bus.n_customers for bus in buses
+        )
+        self.energy_shed = sum(bus.acc_p_energy_shed for bus in buses)
+
+    def add(
+        self,
+        n_customers: int,
+        interruptions: float,
+        outage_hours: float,
+        energy_shed: float,
+    ):
+        """
+        Adds the change of the counters of a bus to the sums
+
+        Parameters
+        ----------
+        n_customers : int
+            The number of customers of the bus
+        interruptions : float
+            The change of the accumulated interruptions of the bus
+        outage_hours : float
+            The change of the accumulated outage time of the bus in
+            hours
+        energy_shed : float
+            The change of the accumulated active energy shed of the bus
+
+        Returns
+        ----------
+        None
+
+        """
+        self.interruptions_x_customers += interruptions * n_customers
+        self.outage_hours_x_customers += outage_hours * n_customers
+        self.energy_shed += energy_shed
+
+    def get_SAIFI(self):
+        """
+        Returns the current SAIFI (System average interruption failure
+        index) of the network
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        saifi : float
+            The SAIFI value
+
+        """
+        if self.total_customers == 0:
+            return 0
+        return self.interruptions_x_customers / self.total_customers
+
+    def get_SAIDI(self):
+        """
+        Returns the current SAIDI (System average interruption duration
+        index) of the network
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        saidi : float
+            The SAIDI value
+
+        """
+        if self.total_customers == 0:
+            return 0
+        return self.outage_hours_x_customers / self.total_customers
+
+    def get_CAIDI(self):
+        """
+        Returns the current CAIDI (Customer average interruption
+        duration index) of the network
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        caidi : float
+            The CAIDI value
+
+        """
+        saifi = self.get_SAIFI()
+        if eq(saifi, 0):
+            return 0
+        return self.get_SAIDI() / saifi
+
+    def get_ASUI(self, current_time: Time):
+        """
+        Returns the current ASUI (average service unavailability index)
+        of the network
+
+        Parameters
+        ----------
+        current_time : Time
+            Current time
+
+        Returns
+        ----------
+        asui : float
+            The ASUI value
+
+        """
+        return self.get_SAIDI() / current_time.get_hours()
+
+    def get_ASAI(self, current_time: Time):
+        """
+        Returns the current ASAI (average service availability index)
+        of the network
+
+        Parameters
+        ----------
+        current_time : Time
+            Current time
+
+        Returns
+        ----------
+        asai : float
+            The ASAI value
+
+        """
+        return 1 - self.get_ASUI(current_time)
+
+    def get_ENS(self):
+        """
+        Returns the current ENS (Energy not Supplied) of the network
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        ens : float
+            The ENS value
+
+        """
+        return self.energy_shed
@@ -1,3 +1,12 @@
+from .columnar import (
+    ResultsFormat,
+    ResultsWriter,
+    get_default_results_format,
+    get_results_file,
+    read_results,
+    save_results,
+)
+
 from .monte_carlo import save_monte_carlo_history_from_dict
 
 from .sequence import save_history
@@ -0,0 +1,634 @@
+from enum import Enum
+import importlib.util
+import io
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+
+from relsad.utils import HistoryColumn
+
+# Fixed time stamp of the members of NPZ files, so that the same
+# results give the same file
+_NPZ_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_FILE_NAMES = {
+    "PARQUET": "results.parquet",
+    "NPZ": "results.npz",
+}
+
+
+class ResultsFormat(Enum):
+    """
+    File format of the saved simulation results
+
+    ...
+
+    Attributes
+    ----------
+    PARQUET : int
+        The results of a run are saved to one Parquet file in long
+        form, needs pyarrow
+    NPZ : int
+        The results of a run are saved to one compressed NumPy NPZ file
+        in long form
+    CSV : int
+        The results are saved to one CSV file per attribute and object
+        group
+    """
+
+    PARQUET = 1
+    NPZ = 2
+    CSV = 3
+
+
+def get_default_results_format():
+    """
+    Returns the default format of the saved simulation results, Parquet
+    if pyarrow is installed and NPZ otherwise
+
+    Parameters
+    ----------
+    None
+
+    Returns
+    ----------
+    results_format : ResultsFormat
+        The default results format
+
+    """
+    if importlib.util.find_spec("pyarrow") is not None:
+        return ResultsFormat.PARQUET
+    return ResultsFormat.NPZ
+
+
+def _to_float(values):
+    """
+    Returns history values as a float array, with booleans as 1.0 and
+    0.0 and missing values as NaN
+
+    Parameters
+    ----------
+    values : iterable
+        The history values
+
+    Returns
+    ----------
+    values : np.ndarray
+        The float array
+
+    """
+    values = np.asarray(
+        values.get_values()
+        if isinstance(values, HistoryColumn)
+        else list(values.values())
+    )
+    if values.dtype == object:
+        return np.array(
+            [np.nan if value is None else value for value in values],
+            dtype=float,
+        )
+    return values.astype(float)
+
+
+def _get_index(data):
+    """
+    Returns the times or iterations of a history as an array
+
+    Parameters
+    ----------
+    data : dict or HistoryColumn
+        The history
+
+    Returns
+    ----------
+    index : np.ndarray
+        The times or iterations of the history
+
+    """
+    if isinstance(data, HistoryColumn):
+        return data.get_times()
+    return np.array(list(data.keys()))
+
+
+def save_results(
+    entries: list,
+    index_name: str,
+    save_dir: str,
+    results_format: ResultsFormat,
+):
+    """
+    Saves results to one file in long form, with the columns component,
+    attribute, index and value
+
+    The values are saved as floats, where booleans are saved as 1.0 and
+    0.0, and missing values as NaN
+
+    Parameters
+    ----------
+    entries : list
+        List of tuples with a component name, an attribute and the
+        history of the attribute, a dictionary or history column
+    index_name : str
+        The name of the index column, like "it" or the time unit name
+    save_dir : str
+        The saving directory
+    results_format : ResultsFormat
+        The file format, Parquet or NPZ
+
+    Returns
+    ----------
+    file_path : str
+        The path of the results file
+
+    """
+    if results_format not in (ResultsFormat.PARQUET, ResultsFormat.NPZ):
+        raise Exception("The results format must be Parquet or NPZ")
+    if (
+        results_format == ResultsFormat.PARQUET
+        and importlib.util.find_spec("pyarrow") is None
+    ):
+        raise Exception("Saving results to Parquet needs pyarrow")
+    if not os.path.isdir(save_dir):
+        os.makedirs(save_dir)
+    component_names = list(dict.fromkeys(entry[0] for entry in entries))
+    attribute_names = list(dict.fromkeys(entry[1] for entry in entries))
+    component_codes = {name: code for code, name in enumerate(component_names)}
+    attribute_codes = {name: code for code, name in enumerate(attribute_names)}
+    lengths = [len(data) for _, _, data in entries]
+    components = np.repeat(
+        [component_codes[entry[0]] for entry in entries], lengths
+    ).astype(np.int32)
+    attributes = np.repeat(
+        [attribute_codes[entry[1]] for entry in entries], lengths
+    ).astype(np.int32)
+    index = (
+        np.concatenate([_get_index(data) for _, _, data in entries])
+        if len(entries) > 0
+        else np.empty(0)
+    )
+    values = (
+        np.concatenate([_to_float(data) for _, _, data in entries])
+        if len(entries) > 0
+        else np.empty(0)
+    )
+    file_path = os.path.join(save_dir, _FILE_NAMES[results_format.name])
+    if results_format == ResultsFormat.PARQUET:
+        df = pd.DataFrame(
+            {
+                "component": pd.Categorical.from_codes(
+                    components, component_names
+                ),
+                "attribute": pd.Categorical.from_codes(
+                    attributes, attribute_names
+                ),
+                index_name: index,
+                "value": values,
+            }
+        )
+        df.to_parquet(file_path, engine="pyarrow", index=False)
+    else:
+        _save_npz(
+            file_path,
+            {
+                "component_names": np.array(component_names, dtype=str),
+                "components": components,
+                "attribute_names": np.array(attribute_names, dtype=str),
+                "attributes": attributes,
+                "index_name": np.array(index_name),
+                "index": index,
+                "value": values,
+            },
+        )
+    return file_path
+
+
+def _save_npz(file_path: str, arrays: dict):
+    """
+    Saves arrays to a compressed NPZ file, with a fixed time stamp on
+    the members so that the same arrays give the same file
+
+    Parameters
+    ----------
+    file_path : str
+        The path of the NPZ file
+    arrays : dict
+        Dictionary with the arrays by name
+
+    Returns
+    ----------
+    None
+
+    """
+    with zipfile.ZipFile(file_path, mode="w") as zip_file:
+        for name, array in arrays.items():
+            buffer = io.BytesIO()
+            np.lib.format.write_array(buffer, array, allow_pickle=False)
+            zip_info = zipfile.ZipInfo(name + ".npy", _NPZ_DATE_TIME)
+            zip_info.compress_type = zipfile.ZIP_DEFLATED
+            zip_file.writestr(zip_info, buffer.getvalue())
+
+
+def _write_npy(zip_file: zipfile.ZipFile, name: str, dtype, shape, chunks):
+    """
+    Writes an array to a member of an NPZ file one chunk at a time, with
+    a fixed time stamp on the member
+
+    Parameters
+    ----------
+    zip_file : zipfile.ZipFile
+        The NPZ file, opened for writing
+    name : str
+        The name of the array
+    dtype : np.dtype
+        The data type of the array
+    shape : tuple
+        The shape of the array
+    chunks : iterable
+        The consecutive parts of the flattened array
+
+    Returns
+    ----------
+    None
+
+    """
+    dtype = np.dtype(dtype)
+    zip_info = zipfile.ZipInfo(name + ".npy", _NPZ_DATE_TIME)
+    zip_info.compress_type = zipfile.ZIP_DEFLATED
+    with zip_file.open(zip_info, mode="w", force_zip64=True) as f:
+        np.lib.format.write_array_header_1_0(
+            f,
+            {
+                "descr": np.lib.format.dtype_to_descr(dtype),
+                "fortran_order": False,
+                "shape": shape,
+            },
+        )
+        for chunk in chunks:
+            f.write(np.ascontiguousarray(chunk, dtype=dtype).tobytes())
+
+
+class ResultsWriter:
+    """
+    Writes results to one file in long form one index at a time, with
+    the same columns as save_results
+
+    Each write adds the values of all the keys at one index, like an
+    iteration. The rows are kept in memory until a given number of
+    indices have been written, and are then written to file, so the
+    memory use does not depend on the number of indices. In the Parquet
+    format, each write to file adds a row group. In the NPZ format, the
+    values are written to a temporary file, and the NPZ file is written
+    from it when the writer is closed. The indices are saved in the
+    order they are written
+
+    ...
+
+    Attributes
+    ----------
+    file_path : str
+        The path of the results file
+    keys : list
+        List of tuples with the component name and the attribute
+    index_name : str
+        The name of the index column, like "it"
+    results_format : ResultsFormat
+        The file format, Parquet or NPZ
+    flush_interval : int
+        The number of indices between each write to file
+    n_rows : int
+        The number of written indices
+
+    Methods
+    ----------
+    write(index, values)
+        Writes the values of the keys at an index
+    close()
+        Writes the remaining values and closes the file
+    """
+
+    def __init__(
+        self,
+        keys: list,
+        index_name: str,
+        save_dir: str,
+        results_format: ResultsFormat,
+        flush_interval: int = 100,
+    ):
+        if results_format not in (ResultsFormat.PARQUET, ResultsFormat.NPZ):
+            raise Exception("The results format must be Parquet or NPZ")
+        if (
+            results_format == ResultsFormat.PARQUET
+            and importlib.util.find_spec("pyarrow") is None
+        ):
+            raise Exception("Saving results to Parquet needs pyarrow")
+        if flush_interval < 1:
+            raise Exception("The flush interval must be at least one row")
+        if not os.path.isdir(save_dir):
+            os.makedirs(save_dir)
+        self.file_path = os.path.join(
+            save_dir, _FILE_NAMES[results_format.name]
+        )
+        self.keys = keys
+        self.index_name = index_name
+        self.results_format = results_format
+        self.flush_interval = flush_interval
+        self.n_rows = 0
+        self.component_names = list(dict.fromkeys(key[0] for key in keys))
+        self.attribute_names = list(dict.fromkeys(key[1] for key in keys))
+        component_codes = {
+            name: code for code, name in enumerate(self.component_names)
+        }
+        attribute_codes = {
+            name: code for code, name in enumerate(self.attribute_names)
+        }
+        self._components = np.array(
+            [component_codes[key[0]] for key in keys], dtype=np.int32
+        )
+        self._attributes = np.array(
+            [attribute_codes[key[1]] for key in keys], dtype=np.int32
+        )
+        self._index = list()
+        self._values = list()
+        self._closed = False
+        if results_format == ResultsFormat.PARQUET:
+            # pyarrow is only needed, and imported, for Parquet files
+            self._pyarrow = importlib.import_module("pyarrow")
+            self._parquet = importlib.import_module("pyarrow.parquet")
+            self._parquet_writer = None
+        else:
+            # Indices of all the rows, and the values of the rows that
+            # have been written to the temporary file
+            self._all_index = list()
+            self._value_file = open(self.file_path + ".tmp", "wb")
+
+    def __str__(self):
+        return f"ResultsWriter(file_path={self.file_path})"
+
+    def __repr__(self):
+        return (
+            f"ResultsWriter(file_path={self.file_path}, "
+            f"n_rows={self.n_rows})"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, index, values: list):
+        """
+        Writes the values of the keys at an index, where booleans are
+        saved as 1.0 and 0.0, and missing values as NaN
+
+        Parameters
+        ----------
+        index : int | float
+            The index, like the iteration number
+        values : list
+            List of the values, in the order of the keys
+
+        Returns
+        ----------
+        None
+
+        """
+        if len(values) != len(self.keys):
+            raise Exception("The values do not match the results keys")
+        self._index.append(index)
+        self._values.append(
+            [np.nan if value is None else value for value in values]
+        )
+        self.n_rows += 1
+        if len(self._index) >= self.flush_interval:
+            self._flush()
+
+    def _flush(self):
+        """
+        Writes the rows kept in memory to file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        n_rows = len(self._index)
+        if n_rows == 0 and (
+            self.results_format == ResultsFormat.NPZ
+            or self._parquet_writer is not None
+        ):
+            return
+        values = np.array(self._values, dtype=float).reshape(
+            n_rows, len(self.keys)
+        )
+        if self.results_format == ResultsFormat.NPZ:
+            values.tofile(self._value_file)
+            self._all_index.extend(self._index)
+        else:
+            df = pd.DataFrame(
+                {
+                    "component": pd.Categorical.from_codes(
+                        np.tile(self._components, n_rows),
+                        self.component_names,
+                    ),
+                    "attribute": pd.Categorical.from_codes(
+                        np.tile(self._attributes, n_rows),
+                        self.attribute_names,
+                    ),
+                    self.index_name: np.repeat(
+                        np.array(self._index), len(self.keys)
+                    ),
+                    "value": values.ravel(),
+                }
+            )
+            table = self._pyarrow.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = self._parquet.ParquetWriter(
+                    self.file_path, table.schema
+                )
+            self._parquet_writer.write_table(table)
+        self._index = list()
+        self._values = list()
+
+    def close(self):
+        """
+        Writes the remaining values and closes the file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        if self._closed:
+            return
+        self._flush()
+        self._closed = True
+        if self.results_format == ResultsFormat.PARQUET:
+            self._parquet_writer.close()
+            return
+        self._value_file.close()
+        tmp_file_path = self._value_file.name
+        index = np.array(self._all_index)
+        n_keys = len(self.keys)
+        n_rows = len(index)
+        # Rows read from the temporary file at a time
+        step = self.flush_interval
+        starts = range(0, n_rows, step)
+        values = (
+            np.memmap(tmp_file_path, dtype=float, mode="r")
+            if n_rows * n_keys > 0
+            else np.empty(0)
+        )
+        component_names = np.array(self.component_names, dtype=str)
+        attribute_names = np.array(self.attribute_names, dtype=str)
+        index_name = np.array(self.index_name)
+        shape = (n_rows * n_keys,)
+        with zipfile.ZipFile(self.file_path, mode="w") as zip_file:
+            _write_npy(
+                zip_file,
+                "component_names",
+                component_names.dtype,
+                component_names.shape,
+                [component_names],
+            )
+            _write_npy(
+                zip_file,
+                "components",
+                np.int32,
+                shape,
+                (
+                    np.tile(self._components, len(index[i : i + step]))
+                    for i in starts
+                ),
+            )
+            _write_npy(
+                zip_file,
+                "attribute_names",
+                attribute_names.dtype,
+                attribute_names.shape,
+                [attribute_names],
+            )
+            _write_npy(
+                zip_file,
+                "attributes",
+                np.int32,
+                shape,
+                (
+                    np.tile(self._attributes, len(index[i : i + step]))
+                    for i in starts
+                ),
+            )
+            _write_npy(
+                zip_file, "index_name", index_name.dtype, (), [index_name]
+            )
+            _write_npy(
+                zip_file,
+                "index",
+                index.dtype,
+                shape,
+                (np.repeat(index[i : i + step], n_keys) for i in starts),
+            )
+            _write_npy(
+                zip_file,
+                "value",
+                float,
+                shape,
+                (values[i * n_keys : (i + step) * n_keys] for i in starts),
+            )
+        del values
+        os.remove(tmp_file_path)
+
+
+def get_results_file(save_dir: str):
+    """
+    Returns the path of the results file in a directory
+
+    Parameters
+    ----------
+    save_dir : str
+        The directory of the results
+
+    Returns
+    ----------
+    file_path : str
+        The path of the results file, None if there is no results file
+
+    """
+    for file_name in _FILE_NAMES.values():
+        file_path = os.path.join(save_dir, file_name)
+        if os.path.isfile(file_path):
+            return file_path
+    return None
+
+
+def read_results(
+    path: str,
+    components: list = None,
+    attributes: list = None,
+    wide: bool = False,
+):
+    """
+    Reads results saved in long form
+
+    Parameters
+    ----------
+    path : str
+        The path of the results file, or of the directory it was saved
+        to, like "results/monte_carlo" or "results/sequence"
+    components : list, optional
+        List of the names of the components to read, all components are
+        read if None
+    attributes : list, optional
+        List of the attributes to read, all attributes are read if None
+    wide : bool
+        Indicates if the results are returned in wide form, with one
+        row per index and one column per component and attribute
+
+    Returns
+    ----------
+    df : pd.DataFrame
+        The results, in long form with the columns component,
+        attribute, index and value, or in wide form
+
+    """
+    file_path = get_results_file(path) if os.path.isdir(path) else path
+    if file_path is None or not os.path.isfile(file_path):
+        raise Exception(f"No results file found at {path}")
+    if file_path.endswith(".parquet"):
+        df = pd.read_parquet(file_path, engine="pyarrow")
+    else:
+        with np.load(file_path, allow_pickle=False) as data:
+            df = pd.DataFrame(
+                {
+                    "component": pd.Categorical.from_codes(
+                        data["components"], data["component_names"]
+                    ),
+                    "attribute": pd.Categorical.from_codes(
+                        data["attributes"], data["attribute_names"]
+                    ),
+                    str(data["index_name"]): data["index"],
+                    "value": data["value"],
+                }
+            )
+    if components is not None:
+        df = df[df["component"].isin(components)]
+    if attributes is not None:
+        df = df[df["attribute"].isin(attributes)]
+    df = df.reset_index(drop=True)
+    if wide:
+        df = df.astype({"component": str, "attribute": str}).pivot(
+            index=df.columns[2],
+            columns=["component", "attribute"],
+            values="value",
+        )
+    return df
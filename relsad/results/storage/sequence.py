@@ -1,8 +1,10 @@
 import os
 
+import numpy as np
 import pandas as pd
 
 from relsad.Time import TimeUnit
+from relsad.utils import HistoryColumn
 
 
 def save_history(
@@ -32,10 +34,47 @@ def save_history(
     """
     if not os.path.isdir(save_dir):
         os.makedirs(save_dir)
-    df = pd.DataFrame()
-    for obj in obj_list:
-        data = obj.get_history(attribute)
-        df[obj] = data.values()
-    df.index = data.keys()
+    data_list = [obj.get_history(attribute) for obj in obj_list]
+    data = data_list[0]
+    if _is_aligned(data_list):
+        # The history arrays share times and data type, so the frame is
+        # built from one stacked array
+        df = pd.DataFrame(
+            np.column_stack([data.get_values() for data in data_list]),
+            index=data.get_times(),
+            columns=obj_list,
+        )
+    else:
+        df = pd.DataFrame()
+        for obj, data in zip(obj_list, data_list):
+            df[obj] = data.values()
+        df.index = data.keys()
     df.index.name = time_unit.name
     df.to_csv(os.path.join(save_dir, attribute + ".csv"))
+
+
+def _is_aligned(data_list: list):
+    """
+    Checks if a list of histories are history columns with the same
+    times and data type
+
+    Parameters
+    ----------
+    data_list : list
+        A list of histories
+
+    Returns
+    ----------
+    aligned : bool
+        Indicates if the histories are aligned
+
+    """
+    if not all(isinstance(data, HistoryColumn) for data in data_list):
+        return False
+    times = data_list[0].get_times()
+    dtype = data_list[0].get_values().dtype
+    return all(
+        data.get_values().dtype == dtype
+        and np.array_equal(data.get_times(), times)
+        for data in data_list
+    )
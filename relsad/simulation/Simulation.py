@@ -1,17 +1,46 @@
-import copy
 from enum import Enum
+from itertools import islice
 import os
 from multiprocessing import Pool
+import time
 
 import numpy as np
 from numpy.random import SeedSequence
 
+from relsad.energy.cache import SheddingCache
 from relsad.energy.shedding import shed_energy
 from relsad.loadflow.ac.bfs import run_bfs_load_flow
+from relsad.loadflow.ac.bfs_vectorized import run_vectorized_bfs_load_flow
 from relsad.network.systems import PowerNetwork, PowerSystem
+from relsad.results.storage import (
+    ResultsFormat,
+    ResultsWriter,
+    get_default_results_format,
+)
+from relsad.topology.load_flow.cache import TopologyCache
+from .failure.batch import BatchFailureSampler
+from .failure.components import FallibleComponents
+from .failure.event import EventSchedule, is_quiet
+from .failure.importance import ImportanceFailureSampler
+from .failure.table import FailProbabilityTable
+from .monte_carlo.checkpoint import MonteCarloCheckpoint
 from .monte_carlo.history import (
+    get_monte_carlo_history_values,
     merge_monte_carlo_history,
     save_network_monte_carlo_history,
+    set_monte_carlo_history_values,
+    weight_monte_carlo_history,
+)
+from .monte_carlo.sampling import (
+    IterationSeed,
+    SamplingStrategy,
+    get_iteration_random_instance,
+    get_iteration_seeds,
+)
+from .monte_carlo.stream import (
+    MonteCarloHistoryWriter,
+    MonteCarloStatistics,
+    get_monte_carlo_history_keys,
 )
 from .sequence.history import save_sequence_history
 from .system_config import (
@@ -19,10 +48,75 @@ from .system_config import (
     prepare_system,
     reset_system,
     update_sub_system_slack,
+    connect_backup_lines,
+    get_sub_system_signature,
+    restore_sub_system_slack,
 )
 from relsad.Time import Time, TimeStamp, TimeUnit
 
 
+class SimulationEngine(Enum):
+    """
+    Engine used to draw component failures during a simulation
+
+    ...
+
+    Attributes
+    ----------
+    INCREMENT : int
+        The fail status of every component is drawn in every increment
+    EVENT : int
+        The failure times of the components are drawn from exponential
+        distributions, and increments where the system is quiet and
+        no failure occurs are skipped
+    BATCH : int
+        The fail status of every component is drawn in every increment
+        using one call to the random generator
+    IMPORTANCE : int
+        The fail status of every component is drawn in every increment
+        using one call to the random generator, with the failure
+        probabilities inflated by importance factors. The Monte Carlo
+        history of each iteration is weighted by the likelihood ratio
+        of the drawn failures
+
+    Notes
+    ----------
+    All engines are reproducible seed for seed, a simulation with a
+    fixed random seed gives the same results every time it is run.
+    The random seed is expanded with numpy.random.SeedSequence, which
+    spawns an independent random generator for each Monte Carlo
+    iteration, making the results independent of the number of
+    processes. The engines consume the random numbers in different
+    orders, so different engines give different, but statistically
+    equivalent, results for the same random seed.
+    """
+
+    INCREMENT = 1
+    EVENT = 2
+    BATCH = 3
+    IMPORTANCE = 4
+
+
+class LoadFlowBackend(Enum):
+    """
+    Backend used to solve the load flow of the networks during a simulation
+
+    ...
+
+    Attributes
+    ----------
+    BFS : int
+        Backward forward sweep load flow running on the buses and lines
+    VECTORIZED_BFS : int
+        Backward forward sweep load flow running on arrays compiled
+        from the radial tree of the network, gives the same results
+        as BFS
+    """
+
+    BFS = 1
+    VECTORIZED_BFS = 2
+
+
 class Simulation:
     """
     Common class for simulation
@@ -37,6 +131,48 @@ class Simulation:
         Random seed number
     fail_duration : Time
         The duration of a failure
+    engine : SimulationEngine
+        The engine used to draw component failures
+    event_schedule : EventSchedule
+        The failure schedule used by the event engine
+    batch_sampler : BatchFailureSampler
+        The failure sampler used by the batch and importance engines
+    fail_prob_table : FailProbabilityTable
+        The failure probabilities of the time steps used by the
+        increment engine
+    importance_factors : dict
+        Dictionary with the factor the failure probabilities of each
+        component type are inflated by in the importance engine
+    sampling_strategy : SamplingStrategy
+        The strategy used to draw the random numbers of the Monte Carlo
+        iterations
+    initial_uniforms : np.ndarray
+        Uniform numbers the first failure times of the current
+        iteration are drawn from by the event engine, None if the
+        iteration is not stratified
+    load_flow_backend : LoadFlowBackend
+        The backend used to solve the load flow
+    topology_cache : TopologyCache
+        Cache of the load flow topologies of the networks, None if
+        the topologies are not cached
+    shedding_cache : SheddingCache
+        Cache of the energy shedding problem structures of the
+        networks, None if the structures are not cached
+    sub_system_signature : tuple
+        Signature of the state the current sub systems were found for,
+        None if the sub systems must be found again
+    backup_lines : list
+        List of the backup lines connected when the current sub
+        systems were found
+    skipped_shedding_problems : int
+        The number of energy shedding problems solved without linear
+        programming in the last run, either skipped because the supply
+        covered the demand or solved directly on a radial network
+    monte_carlo_statistics : MonteCarloStatistics
+        Running statistics of the last Monte Carlo simulation in stream
+        mode, None if no simulation has been run in stream mode
+    results_format : ResultsFormat
+        The file format of the saved sequence and Monte Carlo results
 
     Methods
     ----------
@@ -44,23 +180,84 @@ class Simulation:
         Adds a global numpy random instance
     run_load_flow(network)
         Runs load flow of a network
+    update_fail_status(inc_idx, dt, curr_time)
+        Updates the fail status of the power system components
     run_increment(inc_idx, start_time, prev_time, curr_time, save_flag)
         Runs power system at current state for on time increment
     run_sequence(start_time, time_array, time_unit, save_flag)
         Runs power system for a sequence of increments
+    run_event_sequence(start_time, time_array, time_unit, save_flag)
+        Runs power system for a sequence of increments, skipping quiet increments
     run_sequential(start_time, stop_time, time_step, time_unit, save_dir, save_flag)
         Runs a sequential simulation with the power system
+    initialize_monte_carlo_history()
+        Initializes the Monte Carlo history of the power system
     run_iteration(it, start_time, time_array, time_unit, save_dir, save_iterations, random_seed)
         Runs a sequential iteration with the power system
-    run_monte_carlo(iterations, start_time, stop_time, time_step, time_unit, save_iterations, save_dir, n_procs, debug)
+    run_monte_carlo(iterations, start_time, stop_time, time_step, time_unit, save_iterations, save_dir, n_procs, debug, stream, chunksize, rse_targets, batch_size, max_time, checkpoint_interval, resume)
         Runs Monte Carlo simulation of the power system
+    run_monte_carlo_checkpoint(checkpoint, tasks, run_settings, n_procs, debug, chunksize)
+        Runs Monte Carlo iterations and adds the results to a checkpoint
+    run_monte_carlo_stream(tasks, run_settings, n_procs, debug, save_flag, chunksize, rse_targets, batch_size, max_time)
+        Runs Monte Carlo iterations and streams the results into running statistics
     """
 
-    def __init__(self, power_system: PowerSystem, random_seed: int = None):
+    def __init__(
+        self,
+        power_system: PowerSystem,
+        random_seed: int = None,
+        engine: SimulationEngine = SimulationEngine.INCREMENT,
+        load_flow_backend: LoadFlowBackend = LoadFlowBackend.BFS,
+        topology_cache_size: int = 128,
+        importance_factors: dict = None,
+        sampling_strategy: SamplingStrategy = SamplingStrategy.INDEPENDENT,
+        results_format: ResultsFormat = None,
+    ):
+        if engine == SimulationEngine.IMPORTANCE and not importance_factors:
+            raise Exception(
+                "The importance engine needs importance factors of the "
+                "component types"
+            )
+        if (
+            sampling_strategy
+            in (SamplingStrategy.LATIN_HYPERCUBE, SamplingStrategy.SOBOL)
+            and engine != SimulationEngine.EVENT
+        ):
+            raise Exception(
+                "Stratified sampling of the failure times needs the "
+                "event engine"
+            )
         self.power_system = power_system
         self.power_system.verify_component_setup()
         self.random_seed = random_seed
         self.fail_duration = Time(0)
+        self.engine = engine
+        self.event_schedule = None
+        self.batch_sampler = None
+        self.fail_prob_table = None
+        self.importance_factors = importance_factors
+        self.sampling_strategy = sampling_strategy
+        self.initial_uniforms = None
+        self.load_flow_backend = load_flow_backend
+        self.sub_system_signature = None
+        self.backup_lines = []
+        self.skipped_shedding_problems = 0
+        self.monte_carlo_statistics = None
+        self.results_format = (
+            results_format
+            if results_format is not None
+            else get_default_results_format()
+        )
+        self.topology_cache = (
+            TopologyCache(maxsize=topology_cache_size)
+            if topology_cache_size > 0
+            else None
+        )
+        self.shedding_cache = (
+            SheddingCache(maxsize=topology_cache_size)
+            if topology_cache_size > 0
+            else None
+        )
 
     def distribute_random_instance(self, random_instance):
         """
@@ -95,7 +292,48 @@ class Simulation:
         None
 
         """
-        run_bfs_load_flow(network)
+        if self.load_flow_backend == LoadFlowBackend.VECTORIZED_BFS:
+            run_vectorized_bfs_load_flow(
+                network, topology_cache=self.topology_cache
+            )
+        else:
+            run_bfs_load_flow(network, topology_cache=self.topology_cache)
+
+    def update_fail_status(self, inc_idx: int, dt: Time, curr_time: Time):
+        """
+        Updates the fail status of the power system components
+        using the simulation engine
+
+        Parameters
+        ----------
+        inc_idx : int
+            Index of the increment
+        dt : Time
+            The current time step
+        curr_time : Time
+            Current time
+
+        Returns
+        ----------
+        None
+
+        """
+        if self.engine == SimulationEngine.EVENT:
+            self.event_schedule.update_fail_status(
+                dt=dt,
+                curr_time=curr_time.get_unit_quantity(
+                    self.event_schedule.time_unit
+                ),
+            )
+        elif self.engine in (
+            SimulationEngine.BATCH,
+            SimulationEngine.IMPORTANCE,
+        ):
+            self.batch_sampler.update_fail_status(dt=dt)
+        elif self.fail_prob_table is not None:
+            self.fail_prob_table.update_fail_status(inc_idx=inc_idx, dt=dt)
+        else:
+            self.power_system.update_fail_status(dt=dt)
 
     def run_increment(
         self,
@@ -133,7 +371,7 @@ class Simulation:
         ## Set productions
         self.power_system.set_prod(inc_idx=inc_idx)
         ## Set fail status
-        self.power_system.update_fail_status(dt=dt)
+        self.update_fail_status(inc_idx=inc_idx, dt=dt, curr_time=curr_time)
         ## Run control loop
         self.power_system.controller.run_control_loop(
             curr_time=curr_time,
@@ -144,12 +382,19 @@ class Simulation:
             or not self.power_system.full_batteries()
         ):
             self.fail_duration += dt
-            ## Find sub systems
-            find_sub_systems(
-                p_s=self.power_system,
-                curr_time=curr_time,
-            )
-            update_sub_system_slack(p_s=self.power_system)
+            ## Find sub systems, reusing the previous sub systems
+            ## if the connection state is unchanged
+            signature = get_sub_system_signature(self.power_system)
+            if signature != self.sub_system_signature:
+                self.backup_lines = find_sub_systems(
+                    p_s=self.power_system,
+                    curr_time=curr_time,
+                )
+                update_sub_system_slack(p_s=self.power_system)
+                self.sub_system_signature = signature
+            else:
+                connect_backup_lines(self.backup_lines)
+                restore_sub_system_slack(p_s=self.power_system)
             ## Load flow
             for sub_system in self.power_system.sub_systems:
                 ## Update batteries and history
@@ -169,9 +414,11 @@ class Simulation:
                 if sub_system.slack is not None:
                     self.run_load_flow(network=sub_system)
                 ## Shed load
-                shed_energy(
+                self.skipped_shedding_problems += shed_energy(
                     power_system=sub_system,
                     dt=dt,
+                    shedding_cache=self.shedding_cache,
+                    state_store=self.power_system.state_store,
                 )
             ## Log results
             self.power_system.update_sequence_history(
@@ -181,7 +428,7 @@ class Simulation:
             )
             self.power_system.reset_load_flow_data()
         else:
-            if self.fail_duration > Time(0):
+            if self.fail_duration.quantity > 0:
                 ## Log results
                 self.power_system.update_sequence_history(
                     prev_time=prev_time,
@@ -223,9 +470,34 @@ class Simulation:
         None
 
         """
+        # Find the sub systems in the first increment with failures
+        self.sub_system_signature = None
+        self.skipped_shedding_problems = 0
+        if self.engine == SimulationEngine.EVENT:
+            self.run_event_sequence(
+                start_time=start_time,
+                time_array=time_array,
+                time_unit=time_unit,
+                callback=callback,
+                save_flag=save_flag,
+            )
+            return
+        if self.engine == SimulationEngine.BATCH:
+            self.batch_sampler = BatchFailureSampler(self.power_system)
+        elif self.engine == SimulationEngine.IMPORTANCE:
+            self.batch_sampler = ImportanceFailureSampler(
+                power_system=self.power_system,
+                importance_factors=self.importance_factors,
+            )
+        else:
+            self.fail_prob_table = FailProbabilityTable(
+                power_system=self.power_system,
+                time_array=time_array,
+                time_unit=time_unit,
+            )
         prev_time = Time(0, unit=time_unit)
         curr_time = Time(0, unit=time_unit)
-        for inc_idx, time_quantity in enumerate(time_array):
+        for inc_idx, time_quantity in enumerate(time_array.tolist()):
             curr_time = Time(time_quantity, unit=time_unit)
             if callback is not None:
                 callback(
@@ -240,7 +512,83 @@ class Simulation:
                 curr_time,
                 save_flag,
             )
-            prev_time = copy.deepcopy(curr_time)
+            prev_time = curr_time
+
+    def run_event_sequence(
+        self,
+        start_time: TimeStamp,
+        time_array: np.ndarray,
+        time_unit: TimeUnit,
+        callback: callable = None,
+        save_flag: bool = True,
+    ):
+        """
+        Runs power system for a sequence of increments, where the
+        failures are drawn by an event schedule. Increments where the
+        power system is quiet and no failure occurs are skipped
+
+        Parameters
+        ----------
+        start_time : TimeStamp
+            The start time of the simulation/iteration
+        time_array : np.ndarray
+            Time array
+        time_unit : TimeUnit
+            Time unit
+        callback : callable, optional
+            A callback function that allows for user-defined
+            behavior. The callback function is called at the start
+            of every increment, including the skipped increments.
+            The callback function must contain
+            the following arguments: ps, prev_time, curr_time
+        save_flag : bool
+            Indicates if saving is on or off
+
+        Returns
+        ----------
+        None
+
+        """
+        self.event_schedule = EventSchedule(
+            power_system=self.power_system,
+            time_unit=time_unit,
+            initial_uniforms=self.initial_uniforms,
+        )
+        self.event_schedule.schedule(curr_time=0)
+        inc_idx = 0
+        while inc_idx < len(time_array):
+            curr_time = Time(time_array[inc_idx], unit=time_unit)
+            prev_time = Time(
+                time_array[inc_idx - 1] if inc_idx > 0 else 0,
+                unit=time_unit,
+            )
+            if callback is not None:
+                callback(
+                    ps=self.power_system,
+                    prev_time=prev_time,
+                    curr_time=curr_time,
+                )
+            next_fail_time = self.event_schedule.get_next_fail_time()
+            if next_fail_time > time_array[inc_idx] and is_quiet(
+                self.power_system, self.fail_duration
+            ):
+                if callback is None:
+                    ## Jump to the increment of the next failure
+                    inc_idx = max(
+                        inc_idx + 1,
+                        np.searchsorted(time_array, next_fail_time),
+                    )
+                else:
+                    inc_idx += 1
+                continue
+            self.run_increment(
+                inc_idx,
+                start_time,
+                prev_time,
+                curr_time,
+                save_flag,
+            )
+            inc_idx += 1
 
     def run_sequential(
         self,
@@ -289,6 +637,7 @@ class Simulation:
 
         # Initiate random instance
         random_instance = np.random.default_rng(random_seed)
+        self.initial_uniforms = None
 
         # Distribute random instance to power system components
         self.distribute_random_instance(random_instance)
@@ -323,8 +672,30 @@ class Simulation:
                     save_dir,
                     "sequence",
                 ),
+                results_format=self.results_format,
             )
 
+    def initialize_monte_carlo_history(self):
+        """
+        Initializes the Monte Carlo history of the power system, with
+        the likelihood ratio of each iteration when the importance
+        engine is used
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        save_dict : dict
+            Dictionary with simulation results
+
+        """
+        save_dict = self.power_system.initialize_monte_carlo_history()
+        if self.engine == SimulationEngine.IMPORTANCE:
+            save_dict[self.power_system.name]["likelihood_ratio"] = {}
+        return save_dict
+
     def run_iteration(
         self,
         it: int,
@@ -355,8 +726,8 @@ class Simulation:
             The saving directory
         save_flag : bool
             Flag for saving the iteration results
-        random_seed : int
-            Random seed number
+        random_seed : int, SeedSequence or IterationSeed
+            Random seed of the iteration
         callback : callable, optional
             A callback function that allows for user-defined
             behavior. The callback function is called at the start
@@ -370,16 +741,18 @@ class Simulation:
 
         """
         # Initiate random instance
-        if random_seed is None:
-            random_instance = np.random.default_rng()
-        else:
-            random_instance = np.random.default_rng(random_seed)
+        random_instance = get_iteration_random_instance(random_seed)
+        self.initial_uniforms = (
+            random_seed.uniforms
+            if isinstance(random_seed, IterationSeed)
+            else None
+        )
 
         # Distribute random instance to power system components
         self.distribute_random_instance(random_instance)
 
         # Initialize monte carlo history variables
-        save_dict = self.power_system.initialize_monte_carlo_history()
+        save_dict = self.initialize_monte_carlo_history()
 
         # Print current iteration
         print(f"it: {it}", flush=True)
@@ -409,6 +782,7 @@ class Simulation:
                     "sequence",
                     str(it),
                 ),
+                results_format=self.results_format,
             )
 
         # Update monte carlo history variables
@@ -418,6 +792,16 @@ class Simulation:
             current_time=sim_duration,
             save_dict=save_dict,
         )
+        if self.engine == SimulationEngine.IMPORTANCE:
+            likelihood_ratio = self.batch_sampler.get_likelihood_ratio()
+            save_dict = weight_monte_carlo_history(
+                save_dict=save_dict,
+                it=it,
+                weight=likelihood_ratio,
+            )
+            save_dict[self.power_system.name]["likelihood_ratio"][
+                it
+            ] = likelihood_ratio
         return save_dict
 
     def run_monte_carlo(
@@ -433,10 +817,46 @@ class Simulation:
         n_procs: int = 1,
         debug: bool = False,
         save_flag: bool = True,
+        stream: bool = False,
+        chunksize: int = 1,
+        rse_targets: dict = None,
+        batch_size: int = 100,
+        max_time: float = None,
+        checkpoint_interval: int = None,
+        resume: bool = False,
     ):
         """
         Runs Monte Carlo simulation of the power system
 
+        In stream mode, the iteration results are consumed as they
+        arrive from the workers and folded into running statistics,
+        stored in monte_carlo_statistics, while the iteration values
+        are written to file a few rows at a time. The memory use then
+        does not grow with the number of iterations. In the CSV results
+        format, the iteration values are written to the file
+        monte_carlo/iterations.csv and the statistics to the file
+        monte_carlo/statistics.csv. In the Parquet and NPZ formats, the
+        iteration values are written to the results file in
+        monte_carlo, in the order the iterations complete, and the
+        statistics to the results file in monte_carlo/statistics, both
+        read with read_results
+
+        With relative standard error targets or a wall-clock budget, the
+        simulation is run adaptively in stream mode. The iterations are
+        dispatched in batches, and the simulation stops after the first
+        batch where all the targets are met or the time budget is used,
+        or after the given number of iterations. The achieved confidence
+        intervals are found in monte_carlo_statistics
+
+        With checkpoints, the values of the completed iterations and the
+        entropy of the random seeds are written to the file
+        monte_carlo/checkpoint.pkl. A resumed simulation skips the
+        completed iterations of the checkpoint and gives the same
+        results as an uninterrupted simulation. The checkpoint holds the
+        number of iterations, the sampling strategy, the random seed,
+        the time grid, the saved iterations and the engine, and a
+        simulation is only resumed with the same settings
+
         Parameters
         ----------
         iterations : int
@@ -464,6 +884,29 @@ class Simulation:
             Indicates if debug mode is on or off
         save_flag : bool
             Flag for saving the simulation results
+        stream : bool
+            Indicates if the results are streamed into running
+            statistics instead of being merged at the end
+        chunksize : int
+            The number of iterations sent to a worker at a time in
+            stream mode
+        rse_targets : dict, optional
+            Dictionary with the target relative standard error of the
+            mean of Monte Carlo history variables. The keys are state
+            variables of the power system, like "SAIFI" and "ENS", or
+            tuples with a component name and a state variable
+        batch_size : int
+            The number of iterations between each check of the targets
+            and the time budget
+        max_time : float, optional
+            The wall-clock budget of the simulation in seconds
+        checkpoint_interval : int, optional
+            The number of completed iterations between each write of the
+            checkpoint, no checkpoint is written if None
+        resume : bool
+            Indicates if the simulation is resumed from the checkpoint
+            in the saving directory. The simulation starts from the
+            beginning, with checkpoints, if there is no checkpoint
 
         Returns
         ----------
@@ -472,10 +915,69 @@ class Simulation:
         """
         if callback is not None and not callable(callback):
             raise Exception("The callback argument must be callable")
+        adaptive = rse_targets is not None or max_time is not None
+        if adaptive and batch_size < 1:
+            raise Exception("The batch size must be at least one iteration")
+        checkpointed = checkpoint_interval is not None or resume
+        if checkpointed and (stream or adaptive):
+            raise Exception(
+                "Checkpoints are not supported in stream mode or in "
+                "adaptive mode"
+            )
 
         # Initialize random seeds
         ss = SeedSequence(self.random_seed)
-        child_seeds = ss.spawn(iterations)
+        checkpoint = None
+        if checkpointed:
+            checkpoint_path = os.path.join(
+                save_dir, "monte_carlo", "checkpoint.pkl"
+            )
+            if checkpoint_interval is None:
+                checkpoint_interval = 100
+            # Settings that change the results of the iterations
+            settings = {
+                "start_time": repr(start_time),
+                "stop_time": repr(stop_time),
+                "time_step": time_step.get_seconds(),
+                "time_unit": time_unit.name,
+                "save_iterations": sorted(set(save_iterations)),
+                "engine": self.engine.name,
+            }
+            if resume:
+                checkpoint = MonteCarloCheckpoint.load(
+                    file_path=checkpoint_path,
+                    interval=checkpoint_interval,
+                )
+            if checkpoint is None:
+                checkpoint = MonteCarloCheckpoint(
+                    file_path=checkpoint_path,
+                    entropy=ss.entropy,
+                    iterations=iterations,
+                    sampling_strategy=self.sampling_strategy.name,
+                    settings=settings,
+                    interval=checkpoint_interval,
+                )
+            elif (
+                checkpoint.iterations != iterations
+                or checkpoint.sampling_strategy != self.sampling_strategy.name
+                or checkpoint.settings != settings
+                or (
+                    self.random_seed is not None
+                    and checkpoint.entropy != ss.entropy
+                )
+            ):
+                raise Exception(
+                    "The checkpoint does not match the simulation settings"
+                )
+            # The iteration seeds are spawned from the checkpoint entropy
+            ss = SeedSequence(checkpoint.entropy)
+        fallible_comps = FallibleComponents(self.power_system)
+        child_seeds = get_iteration_seeds(
+            sampling_strategy=self.sampling_strategy,
+            seed_sequence=ss,
+            iterations=iterations,
+            n_dims=len(fallible_comps.fail_rates_per_year),
+        )
 
         # Prepare power system for simulation
         time_array = prepare_system(
@@ -486,8 +988,63 @@ class Simulation:
             time_unit=time_unit,
         )
 
+        run_settings = {
+            "start_time": start_time,
+            "time_array": time_array,
+            "time_unit": time_unit,
+            "save_dir": save_dir,
+            "callback": callback,
+        }
+        if stream or adaptive:
+            self.run_monte_carlo_stream(
+                tasks=(
+                    (
+                        it,
+                        (it in save_iterations and save_flag is True),
+                        child_seeds[it - 1],
+                    )
+                    for it in range(1, iterations + 1)
+                ),
+                run_settings=run_settings,
+                n_procs=n_procs,
+                debug=debug,
+                save_flag=save_flag,
+                chunksize=chunksize,
+                rse_targets=(
+                    {
+                        (
+                            (self.power_system.name, key)
+                            if isinstance(key, str)
+                            else tuple(key)
+                        ): target
+                        for key, target in rse_targets.items()
+                    }
+                    if rse_targets is not None
+                    else None
+                ),
+                batch_size=batch_size if adaptive else None,
+                max_time=max_time,
+            )
+            return
+
         # Run iterations
-        if debug:
+        if checkpoint is not None:
+            save_dict = self.run_monte_carlo_checkpoint(
+                checkpoint=checkpoint,
+                tasks=[
+                    (
+                        it,
+                        (it in save_iterations and save_flag is True),
+                        child_seeds[it - 1],
+                    )
+                    for it in checkpoint.get_remaining_iterations()
+                ],
+                run_settings=run_settings,
+                n_procs=n_procs,
+                debug=debug,
+                chunksize=chunksize,
+            )
+        elif debug:
             it_dicts = []
             for it in range(1, iterations + 1):
                 it_dicts.append(
@@ -504,34 +1061,329 @@ class Simulation:
                         callback=callback,
                     )
                 )
+            if save_flag is True:
+                # Merge monte carlo history variables from iterations
+                save_dict = merge_monte_carlo_history(
+                    power_system=self.power_system,
+                    iteration_dicts=it_dicts,
+                )
         else:
-            with Pool(processes=n_procs) as pool:
-                it_dicts = pool.starmap(
-                    self.run_iteration,
+            # The simulation is sent to each worker once, and only the
+            # iteration number, save flag and seed are sent per iteration
+            with Pool(
+                processes=n_procs,
+                initializer=_initialize_worker,
+                initargs=(self, run_settings),
+            ) as pool:
+                it_values = pool.starmap(
+                    _run_worker_iteration,
                     [
                         [
                             it,
-                            start_time,
-                            time_array,
-                            time_unit,
-                            save_dir,
                             (it in save_iterations and save_flag is True),
                             child_seeds[it - 1],
-                            callback,
                         ]
                         for it in range(1, iterations + 1)
                     ],
                 )
+            # Collect monte carlo history variables from iterations
+            save_dict = self.initialize_monte_carlo_history()
+            for it, values in it_values:
+                set_monte_carlo_history_values(
+                    save_dict=save_dict,
+                    it=it,
+                    values=values,
+                )
 
         if save_flag is True:
-            # Merge monte carlo history variables from iterations
-            save_dict = merge_monte_carlo_history(
-                power_system=self.power_system,
-                iteration_dicts=it_dicts,
-            )
             # Save monte carlo history variables
             save_network_monte_carlo_history(
                 power_system=self.power_system,
                 save_dir=os.path.join(save_dir, "monte_carlo"),
                 save_dict=save_dict,
+                results_format=self.results_format,
+            )
+
+    def run_monte_carlo_checkpoint(
+        self,
+        checkpoint: MonteCarloCheckpoint,
+        tasks: list,
+        run_settings: dict,
+        n_procs: int = 1,
+        debug: bool = False,
+        chunksize: int = 1,
+    ):
+        """
+        Runs Monte Carlo iterations and adds the results to a checkpoint
+        as the iterations complete
+
+        Parameters
+        ----------
+        checkpoint : MonteCarloCheckpoint
+            The checkpoint of the simulation
+        tasks : list
+            The iteration number, save flag and random seed of each
+            iteration that is not completed
+        run_settings : dict
+            Dictionary with the start time, time array, time unit,
+            saving directory and callback of the iterations
+        n_procs : int
+            Number of processors
+        debug : bool
+            Indicates if the iterations are run in this process
+        chunksize : int
+            The number of iterations sent to a worker at a time
+
+        Returns
+        ----------
+        save_dict : dict
+            Dictionary with simulation results of all the iterations in
+            the checkpoint
+
+        """
+        if debug:
+            _initialize_worker(self, run_settings)
+            try:
+                for task in tasks:
+                    checkpoint.add(*_run_worker_task(task))
+            finally:
+                _worker_state.clear()
+        else:
+            with Pool(
+                processes=n_procs,
+                initializer=_initialize_worker,
+                initargs=(self, run_settings),
+            ) as pool:
+                for it, values in pool.imap_unordered(
+                    _run_worker_task,
+                    tasks,
+                    chunksize=chunksize,
+                ):
+                    checkpoint.add(it, values)
+        checkpoint.save()
+        # Collect monte carlo history variables in iteration order
+        save_dict = self.initialize_monte_carlo_history()
+        for it in sorted(checkpoint.values):
+            set_monte_carlo_history_values(
+                save_dict=save_dict,
+                it=it,
+                values=checkpoint.values[it],
+            )
+        return save_dict
+
+    def run_monte_carlo_stream(
+        self,
+        tasks,
+        run_settings: dict,
+        n_procs: int = 1,
+        debug: bool = False,
+        save_flag: bool = True,
+        chunksize: int = 1,
+        rse_targets: dict = None,
+        batch_size: int = None,
+        max_time: float = None,
+    ):
+        """
+        Runs Monte Carlo iterations and streams the results into running
+        statistics and an iteration file
+
+        When a batch size is given, the iterations are run in batches,
+        and no more batches are run when the relative standard error
+        targets are met or the wall-clock budget is used
+
+        Parameters
+        ----------
+        tasks : iterable
+            The iteration number, save flag and random seed of each
+            iteration
+        run_settings : dict
+            The arguments to run_iteration that are shared by all
+            iterations
+        n_procs : int
+            Number of processors
+        debug : bool
+            Indicates if debug mode is on or off
+        save_flag : bool
+            Flag for saving the simulation results
+        chunksize : int
+            The number of iterations sent to a worker at a time
+        rse_targets : dict, optional
+            Dictionary with the target relative standard error of each
+            key, given as a tuple with the component name and the state
+            variable
+        batch_size : int, optional
+            The number of iterations in each batch, all iterations are
+            run in one batch if None
+        max_time : float, optional
+            The wall-clock budget in seconds
+
+        Returns
+        ----------
+        None
+
+        """
+        start = time.perf_counter()
+        keys = get_monte_carlo_history_keys(
+            self.initialize_monte_carlo_history()
+        )
+        self.monte_carlo_statistics = MonteCarloStatistics(keys)
+        save_dir = os.path.join(run_settings["save_dir"], "monte_carlo")
+        writer = None
+        if save_flag is True and self.results_format == ResultsFormat.CSV:
+            writer = MonteCarloHistoryWriter(
+                file_path=os.path.join(save_dir, "iterations.csv"),
+                keys=keys,
+            )
+        elif save_flag is True:
+            writer = ResultsWriter(
+                keys=keys,
+                index_name="it",
+                save_dir=save_dir,
+                results_format=self.results_format,
+            )
+        if rse_targets is not None:
+            # Check that the targets are in the history
+            self.monte_carlo_statistics.targets_met(rse_targets)
+        if batch_size is not None:
+            tasks = iter(tasks)
+            # Lists of batch_size tasks until the tasks are used up
+            batches = iter(lambda: list(islice(tasks, batch_size)), [])
+        else:
+            batches = [tasks]
+        if debug:
+            _initialize_worker(self, run_settings)
+        else:
+            pool = Pool(
+                processes=n_procs,
+                initializer=_initialize_worker,
+                initargs=(self, run_settings),
+            )
+        try:
+            for batch in batches:
+                if debug:
+                    it_values = (_run_worker_task(task) for task in batch)
+                else:
+                    it_values = pool.imap_unordered(
+                        _run_worker_task,
+                        batch,
+                        chunksize=chunksize,
+                    )
+                self._collect_monte_carlo_stream(it_values, writer)
+                if (
+                    rse_targets is not None
+                    and self.monte_carlo_statistics.targets_met(rse_targets)
+                ) or (
+                    max_time is not None
+                    and time.perf_counter() - start >= max_time
+                ):
+                    break
+        finally:
+            if debug:
+                _worker_state.clear()
+            else:
+                pool.terminate()
+            if writer is not None:
+                writer.close()
+        if save_flag is True:
+            self.monte_carlo_statistics.save(
+                save_dir=save_dir,
+                results_format=self.results_format,
             )
+
+    def _collect_monte_carlo_stream(self, it_values, writer):
+        """
+        Folds the iteration results into the running statistics and
+        writes them to the iteration file as they arrive
+
+        Parameters
+        ----------
+        it_values : iterable
+            The iteration number and values of each iteration
+        writer : MonteCarloHistoryWriter | ResultsWriter
+            The writer of the iteration file, None if the results are
+            not saved
+
+        Returns
+        ----------
+        None
+
+        """
+        for it, values in it_values:
+            self.monte_carlo_statistics.add(values)
+            if writer is not None:
+                writer.write(it, values)
+
+
+# Simulation and run settings of a Monte Carlo worker process
+_worker_state = {}
+
+
+def _initialize_worker(simulation: Simulation, run_settings: dict):
+    """
+    Stores the simulation and the run settings in a Monte Carlo worker
+    process, so that they are only sent once per worker
+
+    Parameters
+    ----------
+    simulation : Simulation
+        The simulation
+    run_settings : dict
+        The arguments to run_iteration that are shared by all iterations
+
+    Returns
+    ----------
+    None
+
+    """
+    _worker_state["simulation"] = simulation
+    _worker_state["run_settings"] = run_settings
+
+
+def _run_worker_iteration(it: int, save_flag: bool, random_seed: int):
+    """
+    Runs a Monte Carlo iteration in a worker process
+
+    Parameters
+    ----------
+    it : int
+        Iteration number
+    save_flag : bool
+        Flag for saving the iteration results
+    random_seed : int
+        Random seed number
+
+    Returns
+    ----------
+    it : int
+        Iteration number
+    values : list
+        List of the iteration values in the Monte Carlo history
+
+    """
+    save_dict = _worker_state["simulation"].run_iteration(
+        it=it,
+        save_flag=save_flag,
+        random_seed=random_seed,
+        **_worker_state["run_settings"],
+    )
+    return it, get_monte_carlo_history_values(save_dict, it)
+
+
+def _run_worker_task(task: tuple):
+    """
+    Runs a Monte Carlo iteration in a worker process from a task tuple
+
+    Parameters
+    ----------
+    task : tuple
+        The iteration number, save flag and random seed
+
+    Returns
+    ----------
+    it : int
+        Iteration number
+    values : list
+        List of the iteration values in the Monte Carlo history
+
+    """
+    return _run_worker_iteration(*task)
@@ -1,7 +1,26 @@
+from .monte_carlo.checkpoint import MonteCarloCheckpoint
+
 from .monte_carlo.history import (
     merge_monte_carlo_history,
     merge_monte_carlo_child_network_history,
     merge_monte_carlo_comp_history,
+    get_monte_carlo_history_values,
+    set_monte_carlo_history_values,
+    weight_monte_carlo_history,
+)
+
+from .monte_carlo.sampling import (
+    InversionGenerator,
+    IterationSeed,
+    SamplingStrategy,
+    get_iteration_random_instance,
+    get_iteration_seeds,
+)
+
+from .monte_carlo.stream import (
+    MonteCarloHistoryWriter,
+    MonteCarloStatistics,
+    get_monte_carlo_history_keys,
 )
 
 from .sequence.history import (
@@ -10,7 +29,7 @@ from .sequence.history import (
     save_sequence_history,
 )
 
-from .Simulation import Simulation
+from .Simulation import LoadFlowBackend, Simulation, SimulationEngine
 
 from .system_config import (
     find_sub_systems,
@@ -18,6 +37,9 @@ from .system_config import (
     add_bus,
     update_backup_lines_between_sub_systems,
     update_sub_system_slack,
+    connect_backup_lines,
+    get_sub_system_signature,
+    restore_sub_system_slack,
     set_slack,
     prepare_system,
     reset_system,
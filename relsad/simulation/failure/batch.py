@@ -0,0 +1,79 @@
+import numpy as np
+
+from relsad.network.systems import PowerSystem
+from relsad.Time import Time
+
+from .components import FallibleComponents
+
+
+class BatchFailureSampler(FallibleComponents):
+    """
+    Draws the fail status of every component in a power system that
+    fails according to a constant yearly failure rate in one batch
+
+    The failure probabilities are the same as in the per-component
+    draws, but all uniform numbers of an increment are drawn in one
+    call to the random generator. A simulation with a fixed random
+    seed is therefore reproducible, but the drawn failures differ from
+    the failures drawn by the per-component engine with the same seed
+
+    ...
+
+    Attributes
+    ----------
+    fail_probs : dict
+        The failure probabilities of the entries, cached per time step
+
+    Methods
+    ----------
+    get_fail_probs(dt)
+        Returns the failure probability of each entry for a time step
+    update_fail_status(dt)
+        Updates the fail status of the power system components
+    """
+
+    def __init__(self, power_system: PowerSystem):
+        super().__init__(power_system)
+        self.fail_probs = {}
+
+    def get_fail_probs(self, dt: Time):
+        """
+        Returns the failure probability of each entry for a time step
+
+        Parameters
+        ----------
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        fail_probs : np.ndarray
+            The failure probability of each entry
+
+        """
+        years = dt.get_years()
+        if years not in self.fail_probs:
+            self.fail_probs[years] = np.minimum(
+                self.fail_rates_per_year * years, 1
+            )
+        return self.fail_probs[years]
+
+    def update_fail_status(self, dt: Time):
+        """
+        Updates the fail status of the power system components
+
+        Parameters
+        ----------
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        None
+
+        """
+        draws = self.power_system.random_instance.random(
+            len(self.fail_rates_per_year)
+        )
+        due = draws < self.get_fail_probs(dt)
+        self.dispatch(due=due, healthy=self.get_healthy(), dt=dt)
@@ -0,0 +1,200 @@
+import numpy as np
+
+from relsad.network.components import (
+    ControllerState,
+    IntelligentSwitchState,
+    MainController,
+    SensorState,
+)
+from relsad.network.systems import PowerSystem
+from relsad.Time import Time
+
+
+class FallibleComponents:
+    """
+    Common class for the components in a power system that fail
+    according to a constant yearly failure rate
+
+    The components are stored in a fixed order with one failure rate
+    per entry, making it possible to treat the failure draws of the
+    whole power system as array operations. The main controller is
+    stored twice, once for hardware failures and once for software
+    failures
+
+    ...
+
+    Attributes
+    ----------
+    power_system : PowerSystem
+        The power system the components belong to
+    buses : list
+        List of buses with a transformer that can fail
+    lines : list
+        List of lines that can fail
+    backup_lines : list
+        List of backup lines
+    sensors : list
+        List of sensors that can fail
+    intelligent_switches : list
+        List of intelligent switches that can fail
+    ict_components : list
+        List of ICT lines and ICT nodes that can fail
+    fail_rates_per_year : np.ndarray
+        The yearly failure rate of each entry
+
+    Methods
+    ----------
+    get_healthy()
+        Returns the health of the component of every entry
+    dispatch(due, healthy, dt)
+        Fails the due components and updates the fail status of the
+        components that are not healthy
+    """
+
+    def __init__(self, power_system: PowerSystem):
+        self.power_system = power_system
+        self.buses = power_system.buses
+        self.lines = power_system.lines
+        self.backup_lines = [line for line in self.lines if line.is_backup]
+        self.sensors = power_system.sensors
+        self.intelligent_switches = power_system.intelligent_switches
+        self.ict_components = power_system.ict_lines + power_system.ict_nodes
+        fail_rates = [
+            comp.fail_rate_per_year
+            for comp in (
+                self.buses
+                + self.lines
+                + self.sensors
+                + self.intelligent_switches
+                + self.ict_components
+            )
+        ]
+        if isinstance(power_system.controller, MainController):
+            fail_rates.append(
+                power_system.controller.hardware_fail_rate_per_year
+            )
+            fail_rates.append(
+                power_system.controller.software_fail_rate_per_year
+            )
+        self.fail_rates_per_year = np.array(fail_rates, dtype=float)
+        # Start index of each component group
+        self._line_start = len(self.buses)
+        self._sensor_start = self._line_start + len(self.lines)
+        self._switch_start = self._sensor_start + len(self.sensors)
+        self._ict_start = self._switch_start + len(self.intelligent_switches)
+        self._controller_start = self._ict_start + len(self.ict_components)
+
+    def get_healthy(self):
+        """
+        Returns the health of the component of every entry, a healthy
+        component is able to fail
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        healthy : np.ndarray
+            Boolean array that is True for the entries with a healthy
+            component
+
+        """
+        healthy = (
+            [not bus.trafo_failed for bus in self.buses]
+            + [not line.failed for line in self.lines]
+            + [sensor.state == SensorState.OK for sensor in self.sensors]
+            + [
+                switch.state == IntelligentSwitchState.OK
+                for switch in self.intelligent_switches
+            ]
+            + [not comp.failed for comp in self.ict_components]
+        )
+        if isinstance(self.power_system.controller, MainController):
+            healthy += [
+                self.power_system.controller.state == ControllerState.OK
+            ] * 2
+        return np.array(healthy, dtype=bool)
+
+    def dispatch(self, due: np.ndarray, healthy: np.ndarray, dt: Time):
+        """
+        Fails the due components and updates the fail status of the
+        components that are not healthy, while the remaining components
+        are left untouched. The components are visited in the same
+        order as in PowerSystem.update_fail_status
+
+        Parameters
+        ----------
+        due : np.ndarray
+            Boolean array that is True for the entries that fail
+        healthy : np.ndarray
+            Boolean array that is True for the entries with a healthy
+            component
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        None
+
+        """
+        ps = self.power_system
+        due = due & healthy
+        active = due | ~healthy
+        for idx in np.flatnonzero(active[: self._line_start]):
+            if due[idx]:
+                self.buses[idx].trafo_fail(dt)
+            else:
+                self.buses[idx].update_fail_status(dt)
+        for battery in ps.batteries:
+            battery.update_fail_status(dt)
+        for line in self.backup_lines:
+            for discon in line.disconnectors:
+                if not discon.is_open:
+                    discon.open()
+        for idx in np.flatnonzero(
+            active[self._line_start : self._sensor_start]
+        ):
+            if due[self._line_start + idx]:
+                self.lines[idx].fail(dt)
+            else:
+                self.lines[idx].update_fail_status(dt)
+        for circuitbreaker in ps.circuitbreakers:
+            circuitbreaker.update_fail_status(dt)
+        for idx in np.flatnonzero(
+            active[self._sensor_start : self._switch_start]
+        ):
+            sensor = self.sensors[idx]
+            if due[self._sensor_start + idx]:
+                sensor.fail()
+            elif sensor.state == SensorState.REPAIR:
+                sensor.update_fail_status(dt)
+        for idx in np.flatnonzero(
+            active[self._switch_start : self._ict_start]
+        ):
+            switch = self.intelligent_switches[idx]
+            if due[self._switch_start + idx]:
+                switch.fail()
+            elif switch.state == IntelligentSwitchState.REPAIR:
+                switch.update_fail_status(dt)
+        for idx in np.flatnonzero(
+            active[self._ict_start : self._controller_start]
+        ):
+            if due[self._ict_start + idx]:
+                self.ict_components[idx].fail(dt)
+            else:
+                self.ict_components[idx].update_fail_status(dt)
+        controller = ps.controller
+        if isinstance(controller, MainController):
+            hardware_due, software_due = due[self._controller_start :]
+            if hardware_due or software_due:
+                # A hardware failure overrides a software failure
+                if hardware_due:
+                    controller.fail_hardware()
+                else:
+                    controller.fail_software()
+                controller.handle_fail_state(dt)
+            elif controller.state != ControllerState.OK:
+                controller.update_fail_status(dt)
+        else:
+            controller.update_fail_status(dt)
@@ -0,0 +1,203 @@
+import numpy as np
+
+from relsad.network.components import (
+    ControllerState,
+    IntelligentSwitchState,
+    MainController,
+    SensorState,
+)
+from relsad.network.systems import PowerSystem
+from relsad.Time import Time, TimeUnit
+
+from .components import FallibleComponents
+
+
+class EventSchedule(FallibleComponents):
+    """
+    Schedule of the next failure time of every component in a power
+    system that fails according to a constant yearly failure rate
+
+    The failure times are drawn from exponential distributions, which
+    makes it possible to jump directly to the next failure instead of
+    drawing the fail status of every component in every increment
+
+    ...
+
+    Attributes
+    ----------
+    time_unit : TimeUnit
+        The time unit of the failure times
+    rates : np.ndarray
+        Failure rate of each entry in the schedule, given per time unit
+    next_fail_time : np.ndarray
+        Next failure time of each entry in the schedule, NaN if the
+        component of the entry is not healthy
+    initial_uniforms : np.ndarray
+        Uniform numbers the first failure time of each entry is drawn
+        from, None if the failure times are drawn from the random
+        generator of the power system
+
+    Methods
+    ----------
+    schedule(curr_time)
+        Draws new failure times for the healthy components without one
+    get_next_fail_time()
+        Returns the time of the next failure in the schedule
+    update_fail_status(dt, curr_time)
+        Updates the fail status of the power system components
+    """
+
+    def __init__(
+        self,
+        power_system: PowerSystem,
+        time_unit: TimeUnit,
+        initial_uniforms: np.ndarray = None,
+    ):
+        super().__init__(power_system)
+        self.time_unit = time_unit
+        # Failures per year converted to failures per time unit
+        self.rates = self.fail_rates_per_year * Time(1, time_unit).get_years()
+        self.next_fail_time = np.full(len(self.rates), np.nan)
+        if initial_uniforms is not None and len(initial_uniforms) != len(
+            self.rates
+        ):
+            raise Exception(
+                "The initial uniform numbers do not match the components"
+            )
+        self.initial_uniforms = initial_uniforms
+
+    def schedule(self, curr_time: float):
+        """
+        Draws new failure times for the healthy components without a
+        scheduled failure and removes the scheduled failure of the
+        components that are not healthy. The first failure times are
+        drawn from the initial uniform numbers if they are given
+
+        Parameters
+        ----------
+        curr_time : float
+            The current time given in the time unit of the schedule
+
+        Returns
+        ----------
+        None
+
+        """
+        healthy = self.get_healthy()
+        self.next_fail_time[~healthy] = np.nan
+        idx = np.flatnonzero(
+            healthy & np.isnan(self.next_fail_time) & (self.rates > 0)
+        )
+        if len(idx) > 0:
+            if self.initial_uniforms is not None:
+                # Exponential draws by inversion
+                draws = -np.log1p(-self.initial_uniforms[idx])
+            else:
+                draws = self.power_system.random_instance.exponential(
+                    size=len(idx)
+                )
+            self.next_fail_time[idx] = curr_time + draws / self.rates[idx]
+        self.next_fail_time[healthy & (self.rates == 0)] = np.inf
+        # The initial uniform numbers are only used for the first
+        # failure times
+        self.initial_uniforms = None
+
+    def get_next_fail_time(self):
+        """
+        Returns the time of the next failure in the schedule
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        next_fail_time : float
+            The time of the next failure given in the time unit of the
+            schedule, inf if no failure is scheduled
+
+        """
+        if np.all(np.isnan(self.next_fail_time)):
+            return np.inf
+        return np.nanmin(self.next_fail_time)
+
+    def update_fail_status(self, dt: Time, curr_time: float):
+        """
+        Updates the fail status of the power system components
+
+        Components with a failure time within the current increment
+        fail, components that are not healthy continue their repair,
+        while the remaining components are left untouched
+
+        Parameters
+        ----------
+        dt : Time
+            The current time step
+        curr_time : float
+            The current time given in the time unit of the schedule
+
+        Returns
+        ----------
+        None
+
+        """
+        due = self.next_fail_time <= curr_time
+        self.next_fail_time[due] = np.nan
+        self.dispatch(due=due, healthy=self.get_healthy(), dt=dt)
+        self.schedule(curr_time)
+
+
+def is_quiet(power_system: PowerSystem, fail_duration: Time):
+    """
+    Returns True if the power system is in a quiet state, where nothing
+    but a new failure can change the state of the system
+
+    Parameters
+    ----------
+    power_system : PowerSystem
+        A PowerSystem element
+    fail_duration : Time
+        The duration of the current failure
+
+    Returns
+    ----------
+    True/False
+
+    """
+    if fail_duration.quantity != 0:
+        return False
+    if power_system.failed_comp() or not power_system.full_batteries():
+        return False
+    if any(comp.failed for comp in power_system.ict_lines):
+        return False
+    if any(comp.failed for comp in power_system.ict_nodes):
+        return False
+    if any(
+        sensor.state == SensorState.REPAIR for sensor in power_system.sensors
+    ):
+        return False
+    if any(
+        switch.state == IntelligentSwitchState.REPAIR
+        for switch in power_system.intelligent_switches
+    ):
+        return False
+    controller = power_system.controller
+    if isinstance(controller, MainController):
+        if controller.state != ControllerState.OK:
+            return False
+        if controller.sectioning_time.quantity > 0:
+            return False
+    for sub_controller in (
+        controller.distribution_controllers + controller.microgrid_controllers
+    ):
+        if sub_controller.sectioning_time.quantity > 0:
+            return False
+        if sub_controller.check_components:
+            return False
+    if any(cb.is_open for cb in power_system.circuitbreakers):
+        return False
+    for line in power_system.lines:
+        if line.is_backup:
+            if any(not discon.is_open for discon in line.disconnectors):
+                return False
+    return True
@@ -0,0 +1,180 @@
+import numpy as np
+
+from relsad.network.systems import PowerSystem
+from relsad.Time import Time
+
+from .batch import BatchFailureSampler
+
+
+class ImportanceFailureSampler(BatchFailureSampler):
+    """
+    Draws the fail status of every component in a power system in one
+    batch, with the failure probabilities inflated by importance factors
+
+    Rare failures are drawn more often than in the real system, and
+    each draw multiplies the likelihood ratio of the iteration by the
+    ratio between the real and the sampled probability of the drawn
+    outcome. Weighting the results of an iteration by the likelihood
+    ratio gives unbiased estimates of the real system
+
+    ...
+
+    Attributes
+    ----------
+    importance_factors : np.ndarray
+        The factor the failure probability of each entry is inflated by
+    sampled_probs : dict
+        The sampled failure probabilities and the logarithms of the
+        likelihood ratios of failing and not failing for each entry,
+        cached per time step
+    log_likelihood_ratio : float
+        The logarithm of the likelihood ratio of the draws so far
+
+    Methods
+    ----------
+    get_sampled_probs(dt)
+        Returns the sampled failure probability and the logarithms of
+        the likelihood ratios of each entry for a time step
+    update_fail_status(dt)
+        Updates the fail status of the power system components
+    get_likelihood_ratio()
+        Returns the likelihood ratio of the draws so far
+    """
+
+    def __init__(self, power_system: PowerSystem, importance_factors: dict):
+        super().__init__(power_system)
+        for comp_type, factor in importance_factors.items():
+            if not factor > 0:
+                raise Exception(
+                    f"The importance factor of {comp_type.__name__} "
+                    "must be positive"
+                )
+        comps = (
+            self.buses
+            + self.lines
+            + self.sensors
+            + self.intelligent_switches
+            + self.ict_components
+        )
+        if len(self.fail_rates_per_year) > len(comps):
+            # Hardware and software failures of the main controller
+            comps += [power_system.controller] * 2
+        self.importance_factors = np.array(
+            [
+                _get_importance_factor(comp, importance_factors)
+                for comp in comps
+            ],
+            dtype=float,
+        )
+        self.sampled_probs = {}
+        self.log_likelihood_ratio = 0.0
+
+    def get_sampled_probs(self, dt: Time):
+        """
+        Returns the sampled failure probability and the logarithms of
+        the likelihood ratios of each entry for a time step
+
+        Parameters
+        ----------
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        sampled_probs : np.ndarray
+            The sampled failure probability of each entry
+        log_fail_ratios : np.ndarray
+            The logarithm of the likelihood ratio of each entry failing
+        log_ok_ratios : np.ndarray
+            The logarithm of the likelihood ratio of each entry not
+            failing
+
+        """
+        years = dt.get_years()
+        if years not in self.sampled_probs:
+            fail_probs = self.get_fail_probs(dt)
+            sampled_probs = np.minimum(fail_probs * self.importance_factors, 1)
+            log_fail_ratios = np.zeros(len(fail_probs))
+            log_ok_ratios = np.zeros(len(fail_probs))
+            # Outcomes that are never drawn have no likelihood ratio
+            can_fail = sampled_probs > 0
+            can_be_ok = sampled_probs < 1
+            log_fail_ratios[can_fail] = np.log(
+                fail_probs[can_fail] / sampled_probs[can_fail]
+            )
+            log_ok_ratios[can_be_ok] = np.log1p(
+                -fail_probs[can_be_ok]
+            ) - np.log1p(-sampled_probs[can_be_ok])
+            self.sampled_probs[years] = (
+                sampled_probs,
+                log_fail_ratios,
+                log_ok_ratios,
+            )
+        return self.sampled_probs[years]
+
+    def update_fail_status(self, dt: Time):
+        """
+        Updates the fail status of the power system components and the
+        likelihood ratio of the draws
+
+        Parameters
+        ----------
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        None
+
+        """
+        sampled_probs, log_fail, log_ok = self.get_sampled_probs(dt)
+        draws = self.power_system.random_instance.random(len(sampled_probs))
+        due = draws < sampled_probs
+        healthy = self.get_healthy()
+        # Only the healthy components are able to fail
+        log_ratios = np.where(due, log_fail, log_ok)
+        self.log_likelihood_ratio += log_ratios[healthy].sum()
+        self.dispatch(due=due, healthy=healthy, dt=dt)
+
+    def get_likelihood_ratio(self):
+        """
+        Returns the likelihood ratio of the draws so far, the ratio
+        between the probability of the drawn failures in the real
+        system and in the sampled system
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        likelihood_ratio : float
+            The likelihood ratio of the draws
+
+        """
+        return np.exp(self.log_likelihood_ratio)
+
+
+def _get_importance_factor(comp, importance_factors: dict):
+    """
+    Returns the importance factor of a component, given by the first
+    component type in the dictionary the component is an instance of
+
+    Parameters
+    ----------
+    comp : Component
+        The component
+    importance_factors : dict
+        Dictionary with the importance factor of each component type
+
+    Returns
+    ----------
+    factor : float
+        The importance factor of the component, 1 if the component type
+        is not in the dictionary
+
+    """
+    for comp_type, factor in importance_factors.items():
+        if isinstance(comp, comp_type):
+            return factor
+    return 1.0
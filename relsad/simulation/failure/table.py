@@ -0,0 +1,148 @@
+import numpy as np
+
+from relsad.network.components import MainController
+from relsad.network.systems import PowerSystem
+from relsad.Time import Time, TimeUnit
+
+from .components import FallibleComponents
+
+
+class FailProbabilityTable(FallibleComponents):
+    """
+    Failure probabilities of the components in a power system for the
+    distinct time steps of a time grid
+
+    The yearly failure rates are converted to failure probabilities
+    once per distinct time step before the sequence is run, and the
+    components are given their probability of the increment instead of
+    converting their failure rate in every increment. The components
+    draw their fail status in the same order and from the same
+    probabilities as in PowerSystem.update_fail_status
+
+    ...
+
+    Attributes
+    ----------
+    time_unit : TimeUnit
+        The time unit of the time grid
+    step_sizes : list
+        The distinct time steps of the time grid in the time unit
+    step_indices : list
+        The index of the time step of each increment in the step sizes
+    fail_probs : list
+        List with the failure probability of each entry for each
+        distinct time step
+
+    Methods
+    ----------
+    get_fail_probs(inc_idx, dt)
+        Returns the failure probability of each entry in an increment
+    update_fail_status(inc_idx, dt)
+        Updates the fail status of the power system components
+    """
+
+    def __init__(
+        self,
+        power_system: PowerSystem,
+        time_array: np.ndarray,
+        time_unit: TimeUnit,
+    ):
+        super().__init__(power_system)
+        self.time_unit = time_unit
+        # The first time step is taken from zero
+        steps = np.diff(time_array, prepend=0)
+        step_sizes, step_indices = np.unique(steps, return_inverse=True)
+        self.step_sizes = step_sizes.tolist()
+        self.step_indices = step_indices.tolist()
+        self.fail_probs = [
+            np.minimum(
+                self.fail_rates_per_year
+                * Time(step_size, time_unit).get_years(),
+                1,
+            ).tolist()
+            for step_size in self.step_sizes
+        ]
+
+    def get_fail_probs(self, inc_idx: int, dt: Time):
+        """
+        Returns the failure probability of each entry in an increment
+
+        Parameters
+        ----------
+        inc_idx : int
+            Index of the increment
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        fail_probs : list
+            The failure probability of each entry, None if the time
+            step does not match the time step of the increment in the
+            time grid
+
+        """
+        if not 0 <= inc_idx < len(self.step_indices):
+            return None
+        step_idx = self.step_indices[inc_idx]
+        if dt.get_unit_quantity(self.time_unit) != self.step_sizes[step_idx]:
+            return None
+        return self.fail_probs[step_idx]
+
+    def update_fail_status(self, inc_idx: int, dt: Time):
+        """
+        Updates the fail status of the power system components using
+        the failure probabilities of the increment
+
+        Parameters
+        ----------
+        inc_idx : int
+            Index of the increment
+        dt : Time
+            The current time step
+
+        Returns
+        ----------
+        None
+
+        """
+        ps = self.power_system
+        fail_probs = self.get_fail_probs(inc_idx, dt)
+        if fail_probs is None:
+            ps.update_fail_status(dt)
+            return
+        for bus, p_fail in zip(self.buses, fail_probs):
+            bus.update_fail_status(dt, p_fail)
+        for battery in ps.batteries:
+            battery.update_fail_status(dt)
+        for line, p_fail in zip(
+            self.lines, fail_probs[self._line_start : self._sensor_start]
+        ):
+            line.update_fail_status(dt, p_fail)
+        for circuitbreaker in ps.circuitbreakers:
+            circuitbreaker.update_fail_status(dt)
+        for sensor, p_fail in zip(
+            self.sensors, fail_probs[self._sensor_start : self._switch_start]
+        ):
+            sensor.update_fail_status(dt, p_fail)
+        for switch, p_fail in zip(
+            self.intelligent_switches,
+            fail_probs[self._switch_start : self._ict_start],
+        ):
+            switch.update_fail_status(dt, p_fail)
+        for ict_component, p_fail in zip(
+            self.ict_components,
+            fail_probs[self._ict_start : self._controller_start],
+        ):
+            ict_component.update_fail_status(dt, p_fail)
+        if isinstance(ps.controller, MainController):
+            p_hardware_fail, p_software_fail = fail_probs[
+                self._controller_start :
+            ]
+            ps.controller.update_fail_status(
+                dt,
+                p_hardware_fail=p_hardware_fail,
+                p_software_fail=p_software_fail,
+            )
+        else:
+            ps.controller.update_fail_status(dt)
@@ -0,0 +1,184 @@
+import os
+import pickle
+
+
+class MonteCarloCheckpoint:
+    """
+    Checkpoint of a Monte Carlo simulation, holding the values of the
+    completed iterations and the entropy of the seed sequence the
+    iteration seeds are spawned from
+
+    The checkpoint is written to file every time a given number of
+    iterations have completed since the last write. The file is replaced
+    in one operation, so a simulation that is stopped while writing
+    leaves the previous checkpoint intact
+
+    ...
+
+    Attributes
+    ----------
+    file_path : str
+        The path of the checkpoint file
+    entropy : int
+        The entropy of the seed sequence of the simulation
+    iterations : int
+        The number of iterations in the simulation
+    sampling_strategy : str
+        The name of the sampling strategy of the simulation
+    settings : dict
+        Dictionary with the time grid, the saved iterations and the
+        engine of the simulation, compared with the settings of a
+        resumed simulation
+    interval : int
+        The number of completed iterations between each write
+    values : dict
+        Dictionary with the values of each completed iteration
+    n_unsaved : int
+        The number of iterations completed since the last write
+
+    Methods
+    ----------
+    add(it, values)
+        Adds the values of a completed iteration to the checkpoint
+    get_remaining_iterations()
+        Returns the iterations that are not completed
+    save()
+        Writes the checkpoint to file
+    load(file_path, interval)
+        Reads a checkpoint from file
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        entropy: int,
+        iterations: int,
+        sampling_strategy: str,
+        settings: dict = None,
+        interval: int = 100,
+    ):
+        if interval < 1:
+            raise Exception(
+                "The checkpoint interval must be at least one iteration"
+            )
+        self.file_path = file_path
+        self.entropy = entropy
+        self.iterations = iterations
+        self.sampling_strategy = sampling_strategy
+        self.settings = settings if settings is not None else {}
+        self.interval = interval
+        self.values = {}
+        self.n_unsaved = 0
+
+    def __str__(self):
+        return f"MonteCarloCheckpoint(file_path={self.file_path})"
+
+    def __repr__(self):
+        return (
+            f"MonteCarloCheckpoint(file_path={self.file_path}, "
+            f"completed={len(self.values)}, iterations={self.iterations})"
+        )
+
+    def add(self, it: int, values: list):
+        """
+        Adds the values of a completed iteration to the checkpoint, and
+        writes the checkpoint to file if the interval is reached
+
+        Parameters
+        ----------
+        it : int
+            The iteration number
+        values : list
+            List of the iteration values
+
+        Returns
+        ----------
+        None
+
+        """
+        self.values[it] = values
+        self.n_unsaved += 1
+        if self.n_unsaved >= self.interval:
+            self.save()
+
+    def get_remaining_iterations(self):
+        """
+        Returns the iterations that are not completed
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        remaining : list
+            List of the iteration numbers that are not completed
+
+        """
+        return [
+            it for it in range(1, self.iterations + 1) if it not in self.values
+        ]
+
+    def save(self):
+        """
+        Writes the checkpoint to file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        save_dir = os.path.dirname(self.file_path)
+        if save_dir != "" and not os.path.isdir(save_dir):
+            os.makedirs(save_dir)
+        tmp_file_path = self.file_path + ".tmp"
+        with open(tmp_file_path, "wb") as f:
+            pickle.dump(
+                {
+                    "entropy": self.entropy,
+                    "iterations": self.iterations,
+                    "sampling_strategy": self.sampling_strategy,
+                    "settings": self.settings,
+                    "values": self.values,
+                },
+                f,
+            )
+        os.replace(tmp_file_path, self.file_path)
+        self.n_unsaved = 0
+
+    @staticmethod
+    def load(file_path: str, interval: int = 100):
+        """
+        Reads a checkpoint from file
+
+        Parameters
+        ----------
+        file_path : str
+            The path of the checkpoint file
+        interval : int
+            The number of completed iterations between each write
+
+        Returns
+        ----------
+        checkpoint : MonteCarloCheckpoint
+            The checkpoint, None if the file does not exist
+
+        """
+        if not os.path.isfile(file_path):
+            return None
+        with open(file_path, "rb") as f:
+            data = pickle.load(f)
+        checkpoint = MonteCarloCheckpoint(
+            file_path=file_path,
+            entropy=data["entropy"],
+            iterations=data["iterations"],
+            sampling_strategy=data["sampling_strategy"],
+            settings=data.get("settings"),
+            interval=interval,
+        )
+        checkpoint.values = data["values"]
+        return checkpoint
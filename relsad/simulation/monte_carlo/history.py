@@ -2,17 +2,28 @@ import copy
 import os
 
 from relsad.network.systems import PowerSystem
-from relsad.results.storage import save_monte_carlo_history_from_dict
+from relsad.results.storage import (
+    ResultsFormat,
+    get_default_results_format,
+    save_monte_carlo_history_from_dict,
+    save_results,
+)
 
 
 def save_network_monte_carlo_history(
     power_system: PowerSystem,
     save_dir: str,
     save_dict: dict,
+    results_format: ResultsFormat = None,
 ):
     """
     Saves the history of the energy.shedding in the power system
 
+    In the Parquet and NPZ formats, the history of the power system, the
+    child networks, the buses and the EV parks is saved to one results
+    file in long form. In the CSV format, the history is saved to one
+    file per attribute and object
+
     Parameters
     ----------
     power_system : PowerSystem
@@ -21,6 +32,9 @@ def save_network_monte_carlo_history(
         The saving path
     save_dict : dict
         Dictionary with simulation results
+    results_format : ResultsFormat, optional
+        The file format of the results, the default format is used if
+        None
 
     Returns
     ----------
@@ -29,6 +43,25 @@ def save_network_monte_carlo_history(
     """
     if not os.path.isdir(save_dir):
         os.makedirs(save_dir)
+    if results_format is None:
+        results_format = get_default_results_format()
+    if results_format != ResultsFormat.CSV:
+        obj_list = [power_system] + power_system.child_network_list
+        for bus in power_system.buses:
+            obj_list.append(bus)
+            if bus.ev_park is not None:
+                obj_list.append(bus.ev_park)
+        save_results(
+            entries=[
+                (obj.name, state_var, state_dict)
+                for obj in obj_list
+                for state_var, state_dict in save_dict[obj.name].items()
+            ],
+            index_name="it",
+            save_dir=save_dir,
+            results_format=results_format,
+        )
+        return
     network_state_list = list(save_dict[power_system.name].keys())
     power_system_save_dir = os.path.join(save_dir, power_system.name)
     for state_var in network_state_list:
@@ -37,7 +70,7 @@ def save_network_monte_carlo_history(
         )
     for network in power_system.child_network_list:
         network_save_dir = os.path.join(save_dir, network.name)
-        for state_var in network_state_list:
+        for state_var in save_dict[network.name].keys():
             save_monte_carlo_history_from_dict(
                 save_dict, [network], state_var, network_save_dir
             )
@@ -173,3 +206,108 @@ def merge_monte_carlo_comp_history(
                     curr_ev_park_it_dict[state_var][it]
                 )
     return save_dict
+
+
+def get_monte_carlo_history_values(
+    save_dict: dict,
+    it: int,
+):
+    """
+    Returns the values of an iteration in the Monte Carlo history as a
+    flat list, in the order of the history dictionary
+
+    The list is a compact summary of the iteration, which is sent from
+    the worker processes instead of the nested dictionary
+
+    Parameters
+    ----------
+    save_dict : dict
+        Dictionary with iteration results
+    it : int
+        The iteration number
+
+    Returns
+    ----------
+    values : list
+        List of the iteration values
+
+    """
+    return [
+        state_dict[it]
+        for comp_dict in save_dict.values()
+        for state_dict in comp_dict.values()
+    ]
+
+
+def set_monte_carlo_history_values(
+    save_dict: dict,
+    it: int,
+    values: list,
+):
+    """
+    Adds the values of an iteration, given as a flat list, to the
+    Monte Carlo history
+
+    Parameters
+    ----------
+    save_dict : dict
+        Dictionary with simulation results, with the same components
+        and state variables as the dictionary the values were taken from
+    it : int
+        The iteration number
+    values : list
+        List of the iteration values
+
+    Returns
+    ----------
+    save_dict : dict
+        Dictionary with simulation results
+
+    """
+    state_dicts = [
+        state_dict
+        for comp_dict in save_dict.values()
+        for state_dict in comp_dict.values()
+    ]
+    if len(state_dicts) != len(values):
+        raise Exception(
+            "The iteration values do not match the Monte Carlo history"
+        )
+    for state_dict, value in zip(state_dicts, values):
+        state_dict[it] = value
+    return save_dict
+
+
+def weight_monte_carlo_history(
+    save_dict: dict,
+    it: int,
+    weight: float,
+):
+    """
+    Multiplies the values of an iteration in the Monte Carlo history
+    by a weight
+
+    With importance sampling, the weight is the likelihood ratio of the
+    iteration, and the mean of the weighted values over the iterations
+    is an unbiased estimate of the mean in the real system
+
+    Parameters
+    ----------
+    save_dict : dict
+        Dictionary with iteration results
+    it : int
+        The iteration number
+    weight : float
+        The weight of the iteration
+
+    Returns
+    ----------
+    save_dict : dict
+        Dictionary with iteration results
+
+    """
+    for comp_dict in save_dict.values():
+        for state_dict in comp_dict.values():
+            if it in state_dict:
+                state_dict[it] *= weight
+    return save_dict
@@ -0,0 +1,236 @@
+from collections import namedtuple
+from enum import Enum
+import warnings
+
+import numpy as np
+from numpy.random import SeedSequence
+from scipy import stats
+from scipy.stats import qmc
+
+
+class SamplingStrategy(Enum):
+    """
+    Strategy used to draw the random numbers of the Monte Carlo
+    iterations
+
+    ...
+
+    Attributes
+    ----------
+    INDEPENDENT : int
+        Every iteration has an independent random generator
+    ANTITHETIC : int
+        The iterations are run in pairs, where the second iteration of
+        a pair draws the mirrored uniform numbers of the first
+        iteration, 1 - u instead of u. The statistics of the iterations
+        treat the iterations as independent
+    LATIN_HYPERCUBE : int
+        The first failure time of each component is stratified over the
+        iterations with a Latin hypercube design, only used by the
+        event engine
+    SOBOL : int
+        The first failure time of each component is stratified over the
+        iterations with a scrambled Sobol sequence, only used by the
+        event engine
+    """
+
+    INDEPENDENT = 1
+    ANTITHETIC = 2
+    LATIN_HYPERCUBE = 3
+    SOBOL = 4
+
+
+IterationSeed = namedtuple(
+    "IterationSeed",
+    ["seed", "mirrored", "uniforms"],
+)
+
+# Largest uniform number drawn by numpy, mirroring u to
+# _MIRROR - u keeps the mirrored numbers in [0, 1)
+_MIRROR = 1 - 2**-53
+
+
+class InversionGenerator(np.random.Generator):
+    """
+    Random generator where every distribution used in relsad is drawn
+    by inverting its distribution function at uniform numbers
+
+    Drawing by inversion makes the drawn values monotone in the uniform
+    numbers, so mirrored uniform numbers give negatively correlated
+    draws. Other distributions are drawn as in numpy.random.Generator
+
+    ...
+
+    Attributes
+    ----------
+    mirrored : bool
+        Indicates if the uniform numbers are mirrored
+
+    Methods
+    ----------
+    random(size, dtype, out)
+        Returns uniform numbers in [0, 1)
+    uniform(low, high, size)
+        Returns uniform numbers in [low, high)
+    integers(low, high, size, dtype, endpoint)
+        Returns uniform integers in [low, high)
+    exponential(scale, size)
+        Returns exponentially distributed numbers
+    gamma(shape, scale, size)
+        Returns gamma distributed numbers
+    """
+
+    def __init__(self, bit_generator, mirrored: bool = False):
+        super().__init__(bit_generator)
+        self.mirrored = mirrored
+
+    def _get_uniforms(self, size=None):
+        """
+        Returns uniform numbers in [0, 1), mirrored if the generator is
+        mirrored
+
+        Parameters
+        ----------
+        size : int or tuple, optional
+            The shape of the uniform numbers
+
+        Returns
+        ----------
+        uniforms : float or np.ndarray
+            The uniform numbers
+
+        """
+        uniforms = super().random(size)
+        if self.mirrored:
+            uniforms = _MIRROR - uniforms
+        return uniforms
+
+    def random(self, size=None, dtype=np.float64, out=None):
+        uniforms = np.asarray(self._get_uniforms(size), dtype=dtype)
+        if out is not None:
+            out[...] = uniforms
+            return out
+        return uniforms[()]
+
+    def uniform(self, low=0.0, high=1.0, size=None):
+        if size is None:
+            size = np.broadcast(low, high).shape or None
+        return low + (high - low) * self._get_uniforms(size)
+
+    def integers(
+        self,
+        low,
+        high=None,
+        size=None,
+        dtype=np.int64,
+        endpoint=False,
+    ):
+        if high is None:
+            low, high = 0, low
+        if endpoint:
+            high = high + 1
+        values = np.floor(self.uniform(low, high, size))
+        return np.asarray(values, dtype=dtype)[()]
+
+    def exponential(self, scale=1.0, size=None):
+        if size is None:
+            size = np.shape(scale) or None
+        return -scale * np.log1p(-self._get_uniforms(size))
+
+    def gamma(self, shape, scale=1.0, size=None):
+        if size is None:
+            size = np.broadcast(shape, scale).shape or None
+        return stats.gamma.ppf(
+            self._get_uniforms(size),
+            shape,
+            scale=scale,
+        )[()]
+
+
+def get_iteration_seeds(
+    sampling_strategy: SamplingStrategy,
+    seed_sequence: SeedSequence,
+    iterations: int,
+    n_dims: int,
+):
+    """
+    Returns the random seed of each Monte Carlo iteration
+
+    Parameters
+    ----------
+    sampling_strategy : SamplingStrategy
+        The sampling strategy
+    seed_sequence : SeedSequence
+        The seed sequence of the simulation
+    iterations : int
+        The number of iterations
+    n_dims : int
+        The number of stratified dimensions, one per fallible
+        component entry
+
+    Returns
+    ----------
+    iteration_seeds : list
+        List with the random seed of each iteration, given as a
+        SeedSequence with independent sampling and as an IterationSeed
+        with the other strategies
+
+    """
+    if sampling_strategy == SamplingStrategy.INDEPENDENT:
+        return seed_sequence.spawn(iterations)
+    if sampling_strategy == SamplingStrategy.ANTITHETIC:
+        pair_seeds = seed_sequence.spawn((iterations + 1) // 2)
+        return [
+            IterationSeed(
+                seed=pair_seeds[idx // 2],
+                mirrored=idx % 2 == 1,
+                uniforms=None,
+            )
+            for idx in range(iterations)
+        ]
+    child_seeds = seed_sequence.spawn(iterations)
+    qmc_seed = np.random.default_rng(seed_sequence.spawn(1)[0])
+    n_dims = max(n_dims, 1)
+    if sampling_strategy == SamplingStrategy.LATIN_HYPERCUBE:
+        uniforms = qmc.LatinHypercube(d=n_dims, seed=qmc_seed).random(
+            iterations
+        )
+    elif sampling_strategy == SamplingStrategy.SOBOL:
+        with warnings.catch_warnings():
+            # The balance of the points is best for a power of two
+            # iterations, but the points are valid for any number
+            warnings.simplefilter("ignore", UserWarning)
+            uniforms = qmc.Sobol(d=n_dims, seed=qmc_seed).random(iterations)
+    else:
+        raise Exception("Unknown sampling strategy")
+    return [
+        IterationSeed(
+            seed=child_seeds[idx],
+            mirrored=False,
+            uniforms=uniforms[idx],
+        )
+        for idx in range(iterations)
+    ]
+
+
+def get_iteration_random_instance(random_seed):
+    """
+    Returns the random generator of a Monte Carlo iteration
+
+    Parameters
+    ----------
+    random_seed : int, SeedSequence or IterationSeed
+        The random seed of the iteration, a new seed is drawn if None
+
+    Returns
+    ----------
+    random_instance : np.random.Generator
+        The random generator of the iteration
+
+    """
+    if isinstance(random_seed, IterationSeed):
+        return InversionGenerator(
+            np.random.PCG64(random_seed.seed),
+            mirrored=random_seed.mirrored,
+        )
+    return np.random.default_rng(random_seed)
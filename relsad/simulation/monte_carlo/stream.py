@@ -0,0 +1,439 @@
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from relsad.results.storage import ResultsFormat, save_results
+
+
+def get_monte_carlo_history_keys(save_dict: dict):
+    """
+    Returns the components and state variables of the Monte Carlo
+    history, in the order of the history dictionary
+
+    Parameters
+    ----------
+    save_dict : dict
+        Dictionary with simulation results
+
+    Returns
+    ----------
+    keys : list
+        List of tuples with the component name and the state variable
+
+    """
+    return [
+        (comp_name, state_var)
+        for comp_name, comp_dict in save_dict.items()
+        for state_var in comp_dict.keys()
+    ]
+
+
+class MonteCarloStatistics:
+    """
+    Running statistics of the Monte Carlo history, updated one iteration
+    at a time
+
+    The mean and the variance are found with Welford's algorithm, so the
+    memory use does not depend on the number of iterations. Undefined
+    (NaN) values are not counted
+
+    ...
+
+    Attributes
+    ----------
+    keys : list
+        List of tuples with the component name and the state variable
+    count : np.ndarray
+        The number of counted values of each key
+    mean : np.ndarray
+        The mean value of each key
+    M2 : np.ndarray
+        The sum of squared differences from the mean of each key
+    min : np.ndarray
+        The minimum value of each key
+    max : np.ndarray
+        The maximum value of each key
+
+    Methods
+    ----------
+    add(values)
+        Adds the values of an iteration to the statistics
+    get_variance()
+        Returns the sample variance of each key
+    get_std()
+        Returns the sample standard deviation of each key
+    get_rse()
+        Returns the relative standard error of the mean of each key
+    get_confidence_interval(confidence)
+        Returns the confidence interval of the mean of each key
+    targets_met(rse_targets)
+        Checks if the relative standard errors meet the targets
+    get_statistics(comp_name, state_var)
+        Returns the statistics of a component and state variable
+    save(save_dir)
+        Saves the statistics to a file
+    """
+
+    def __init__(self, keys: list):
+        self.keys = keys
+        self.count = np.zeros(len(keys), dtype=int)
+        self.mean = np.zeros(len(keys))
+        self.M2 = np.zeros(len(keys))
+        self.min = np.full(len(keys), np.inf)
+        self.max = np.full(len(keys), -np.inf)
+
+    def __str__(self):
+        return f"MonteCarloStatistics(keys={len(self.keys)})"
+
+    def __repr__(self):
+        return (
+            f"MonteCarloStatistics(keys={len(self.keys)}, "
+            f"iterations={self.count.max(initial=0)})"
+        )
+
+    def add(self, values: list):
+        """
+        Adds the values of an iteration to the statistics
+
+        Parameters
+        ----------
+        values : list
+            List of the iteration values, in the order of the keys
+
+        Returns
+        ----------
+        None
+
+        """
+        values = np.asarray(values, dtype=float)
+        if len(values) != len(self.keys):
+            raise Exception(
+                "The iteration values do not match the Monte Carlo history"
+            )
+        valid = ~np.isnan(values)
+        self.count += valid
+        delta = np.where(valid, values - self.mean, 0.0)
+        self.mean += delta / np.maximum(self.count, 1)
+        self.M2 += np.where(valid, delta * (values - self.mean), 0.0)
+        self.min = np.fmin(self.min, values)
+        self.max = np.fmax(self.max, values)
+
+    def get_variance(self):
+        """
+        Returns the sample variance of each key, NaN for keys with less
+        than two values
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        variance : np.ndarray
+            The sample variance of each key
+
+        """
+        variance = np.full(len(self.keys), np.nan)
+        counted = self.count > 1
+        variance[counted] = self.M2[counted] / (self.count[counted] - 1)
+        return variance
+
+    def get_std(self):
+        """
+        Returns the sample standard deviation of each key, NaN for keys
+        with less than two values
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        std : np.ndarray
+            The sample standard deviation of each key
+
+        """
+        return np.sqrt(self.get_variance())
+
+    def get_rse(self):
+        """
+        Returns the relative standard error of the mean of each key,
+        NaN for keys with less than two values or a zero mean
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        rse : np.ndarray
+            The relative standard error of each key
+
+        """
+        rse = np.full(len(self.keys), np.nan)
+        std = self.get_std()
+        defined = (self.count > 1) & (self.mean != 0)
+        rse[defined] = std[defined] / (
+            np.sqrt(self.count[defined]) * np.abs(self.mean[defined])
+        )
+        return rse
+
+    def get_confidence_interval(self, confidence: float = 0.95):
+        """
+        Returns the confidence interval of the mean of each key, based
+        on the normal approximation
+
+        Parameters
+        ----------
+        confidence : float
+            The confidence level
+
+        Returns
+        ----------
+        lower : np.ndarray
+            The lower limit of the confidence interval of each key
+        upper : np.ndarray
+            The upper limit of the confidence interval of each key
+
+        """
+        z = norm.ppf(0.5 + confidence / 2)
+        half_width = np.full(len(self.keys), np.nan)
+        counted = self.count > 1
+        half_width[counted] = (
+            z * self.get_std()[counted] / np.sqrt(self.count[counted])
+        )
+        return self.mean - half_width, self.mean + half_width
+
+    def targets_met(self, rse_targets: dict):
+        """
+        Checks if the relative standard errors meet the targets
+
+        A target is not met while the relative standard error is
+        undefined, that is, with less than two values or a zero mean
+
+        Parameters
+        ----------
+        rse_targets : dict
+            Dictionary with the target relative standard error of each
+            key, given as a tuple with the component name and the state
+            variable
+
+        Returns
+        ----------
+        met : bool
+            Indicates if all the targets are met
+
+        """
+        rse = self.get_rse()
+        for key, target in rse_targets.items():
+            if key not in self.keys:
+                raise Exception(f"{key} is not in the Monte Carlo history")
+            if not rse[self.keys.index(key)] <= target:
+                return False
+        return True
+
+    def get_statistics(self, comp_name: str, state_var: str):
+        """
+        Returns the statistics of a component and state variable
+
+        Parameters
+        ----------
+        comp_name : str
+            The component name
+        state_var : str
+            The state variable
+
+        Returns
+        ----------
+        statistics : dict
+            Dictionary with the count, mean, standard deviation,
+            minimum and maximum value, together with the relative
+            standard error and the 95 % confidence interval of the mean
+
+        """
+        idx = self.keys.index((comp_name, state_var))
+        lower, upper = self.get_confidence_interval()
+        return {
+            "count": self.count[idx],
+            "mean": self.mean[idx] if self.count[idx] > 0 else np.nan,
+            "std": self.get_std()[idx],
+            "min": self.min[idx] if self.count[idx] > 0 else np.nan,
+            "max": self.max[idx] if self.count[idx] > 0 else np.nan,
+            "rse": self.get_rse()[idx],
+            "ci_lower": lower[idx],
+            "ci_upper": upper[idx],
+        }
+
+    def save(
+        self,
+        save_dir: str,
+        results_format: ResultsFormat = ResultsFormat.CSV,
+    ):
+        """
+        Saves the statistics to a file, including the relative standard
+        error and the 95 % confidence interval of the mean
+
+        In the CSV format, the statistics are saved to the file
+        statistics.csv with one row per key. In the Parquet and NPZ
+        formats, they are saved in long form with save_results to the
+        directory statistics, with the statistic as the index
+
+        Parameters
+        ----------
+        save_dir : str
+            The saving directory
+        results_format : ResultsFormat
+            The file format of the statistics
+
+        Returns
+        ----------
+        None
+
+        """
+        if not os.path.isdir(save_dir):
+            os.makedirs(save_dir)
+        counted = self.count > 0
+        lower, upper = self.get_confidence_interval()
+        columns = {
+            "count": self.count,
+            "mean": np.where(counted, self.mean, np.nan),
+            "std": self.get_std(),
+            "min": np.where(counted, self.min, np.nan),
+            "max": np.where(counted, self.max, np.nan),
+            "rse": self.get_rse(),
+            "ci_lower": lower,
+            "ci_upper": upper,
+        }
+        if results_format != ResultsFormat.CSV:
+            save_results(
+                entries=[
+                    (
+                        comp_name,
+                        state_var,
+                        {
+                            statistic: values[idx]
+                            for statistic, values in columns.items()
+                        },
+                    )
+                    for idx, (comp_name, state_var) in enumerate(self.keys)
+                ],
+                index_name="statistic",
+                save_dir=os.path.join(save_dir, "statistics"),
+                results_format=results_format,
+            )
+            return
+        df = pd.DataFrame(
+            {
+                "comp": [comp_name for comp_name, _ in self.keys],
+                "state_var": [state_var for _, state_var in self.keys],
+                **columns,
+            }
+        )
+        df.to_csv(os.path.join(save_dir, "statistics.csv"), index=False)
+
+
+class MonteCarloHistoryWriter:
+    """
+    Writes the Monte Carlo history to a file one iteration at a time
+
+    Each row holds the iteration number and the iteration values, with
+    one column per component and state variable named
+    "<component>/<state variable>". The rows are written in the order
+    the iterations are added
+
+    ...
+
+    Attributes
+    ----------
+    file_path : str
+        The path of the history file
+    keys : list
+        List of tuples with the component name and the state variable
+    flush_interval : int
+        The number of rows written between each flush to disk
+    n_rows : int
+        The number of written rows
+
+    Methods
+    ----------
+    write(it, values)
+        Writes the values of an iteration to the file
+    close()
+        Flushes and closes the file
+    """
+
+    def __init__(self, file_path: str, keys: list, flush_interval: int = 100):
+        if flush_interval < 1:
+            raise Exception("The flush interval must be at least one row")
+        save_dir = os.path.dirname(file_path)
+        if save_dir != "" and not os.path.isdir(save_dir):
+            os.makedirs(save_dir)
+        self.file_path = file_path
+        self.keys = keys
+        self.flush_interval = flush_interval
+        self.n_rows = 0
+        self._file = open(file_path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(
+            ["it"]
+            + [f"{comp_name}/{state_var}" for comp_name, state_var in keys]
+        )
+
+    def __str__(self):
+        return f"MonteCarloHistoryWriter(file_path={self.file_path})"
+
+    def __repr__(self):
+        return (
+            f"MonteCarloHistoryWriter(file_path={self.file_path}, "
+            f"n_rows={self.n_rows})"
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write(self, it: int, values: list):
+        """
+        Writes the values of an iteration to the file
+
+        Parameters
+        ----------
+        it : int
+            The iteration number
+        values : list
+            List of the iteration values, in the order of the keys
+
+        Returns
+        ----------
+        None
+
+        """
+        if len(values) != len(self.keys):
+            raise Exception(
+                "The iteration values do not match the Monte Carlo history"
+            )
+        self._writer.writerow([it] + list(values))
+        self.n_rows += 1
+        if self.n_rows % self.flush_interval == 0:
+            self._file.flush()
+
+    def close(self):
+        """
+        Flushes and closes the file
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        if not self._file.closed:
+            self._file.close()
@@ -2,7 +2,12 @@ import os
 
 from relsad.network.components import MainController
 from relsad.network.systems import PowerSystem
-from relsad.results.storage import save_history
+from relsad.results.storage import (
+    ResultsFormat,
+    get_default_results_format,
+    save_history,
+    save_results,
+)
 from relsad.Time import TimeUnit
 from relsad.visualization.plotting import plot_history
 
@@ -72,10 +77,15 @@ def save_sequence_history(
     power_system: PowerSystem,
     time_unit: TimeUnit,
     save_dir: str,
+    results_format: ResultsFormat = None,
 ):
     """
     Saves the history from an sequence
 
+    In the Parquet and NPZ formats, the history of every object is saved
+    to one results file in long form. In the CSV format, the history is
+    saved to one file per attribute and object group
+
     Parameters
     ----------
     power_system : PowerSystem
@@ -84,6 +94,9 @@ def save_sequence_history(
         The time unit of the simulation
     save_dir : str
         The saving path
+    results_format : ResultsFormat, optional
+        The file format of the results, the default format is used if
+        None
 
     Returns
     ----------
@@ -92,20 +105,14 @@ def save_sequence_history(
     """
     if not os.path.isdir(save_dir):
         os.makedirs(save_dir)
-    # Power system
-    save_obj_history(
-        obj_list=[power_system],
-        time_unit=time_unit,
-        save_dir=os.path.join(save_dir, power_system.name),
-    )
-    # Child networks
-    for network in power_system.child_network_list:
-        save_obj_history(
-            obj_list=[network],
-            time_unit=time_unit,
-            save_dir=os.path.join(save_dir, network.name),
-        )
-    # Buses
+    if results_format is None:
+        results_format = get_default_results_format()
+    # Power system and child networks
+    network_save_dict = {
+        network.name: [network]
+        for network in [power_system] + power_system.child_network_list
+    }
+    # Components
     comp_save_dict = {
         "bus": power_system.buses,
         "ev_parks": power_system.ev_parks,
@@ -125,8 +132,23 @@ def save_sequence_history(
         "ict_line": power_system.ict_lines,
         "ict_node": power_system.ict_nodes,
     }
+    save_dict = {**network_save_dict, **comp_save_dict}
+
+    if results_format != ResultsFormat.CSV:
+        save_results(
+            entries=[
+                (obj.name, attribute, obj.get_history(attribute))
+                for obj_list in save_dict.values()
+                for obj in obj_list
+                for attribute in obj.history
+            ],
+            index_name=time_unit.name,
+            save_dir=save_dir,
+            results_format=results_format,
+        )
+        return
 
-    for obj_name, obj_list in comp_save_dict.items():
+    for obj_name, obj_list in save_dict.items():
         if len(obj_list) > 0:
             save_obj_history(
                 obj_list=obj_list,
@@ -4,7 +4,6 @@ from relsad.network.components import Bus, MicrogridMode
 from relsad.network.systems import PowerSystem, SubSystem, Transmission
 from relsad.Time import Time, TimeStamp, TimeUnit
 from relsad.topology.sub_systems import find_backup_lines_between_sub_systems
-from relsad.utils import subtract, unique
 
 
 def find_sub_systems(p_s: PowerSystem, curr_time: Time):
@@ -12,6 +11,9 @@ def find_sub_systems(p_s: PowerSystem, curr_time: Time):
     Function that finds the independent sub systems of the given power system
     and adds them to the sub_systems list of the power system
 
+    The sub systems are found with a depth first search over the
+    connected lines, visiting every bus and line once
+
     Parameters
     ----------
     p_s : PowerSystem
@@ -21,62 +23,81 @@ def find_sub_systems(p_s: PowerSystem, curr_time: Time):
 
     Returns
     ----------
-    None
+    backup_lines : list
+        List of the backup lines that were connected between the
+        sub systems, in the order they were connected
 
     """
 
     p_s.sub_systems = []
-    # Will only include connected lines
-    active_lines = [line for line in p_s.lines if line.connected]
-    used_buses = []
-    used_lines = []
-    sub_system = SubSystem()
-
-    while not (len(used_buses) + len(used_lines)) == (
-        len(p_s.buses) + len(active_lines)
-    ):
-        for bus in p_s.buses:
-            if bus not in unique(used_buses + sub_system.buses):
-                if (len(sub_system.buses) + len(sub_system.lines)) == 0:
-                    sub_system, used_buses = add_bus(
-                        p_s,
-                        bus,
-                        sub_system,
-                        used_buses,
-                    )
-                    (
-                        sub_system,
-                        used_buses,
-                        used_lines,
-                    ) = try_to_add_connected_lines(
-                        p_s,
-                        bus,
-                        sub_system,
-                        used_buses,
-                        used_lines,
-                    )
-                    p_s.sub_systems.append(sub_system)
-                    p_s.sub_systems = unique(p_s.sub_systems)
-                    if (len(used_buses) + len(used_lines)) == (
-                        len(p_s.buses) + len(active_lines)
-                    ):
-                        break
-                    sub_system = SubSystem()
-
+    # Child networks of each bus
+    bus_networks = get_bus_networks(p_s)
+    used_buses = set()
+    used_lines = set()
+
+    for bus in p_s.buses:
+        if bus not in used_buses:
+            sub_system = SubSystem()
+            sub_system, used_buses = add_bus(
+                p_s,
+                bus,
+                sub_system,
+                used_buses,
+                bus_networks,
+            )
+            sub_system, used_buses, used_lines = try_to_add_connected_lines(
+                p_s,
+                bus,
+                sub_system,
+                used_buses,
+                used_lines,
+                bus_networks,
+            )
+            p_s.sub_systems.append(sub_system)
+
+    backup_lines = []
     if len(p_s.sub_systems) > 1:
-        update_backup_lines_between_sub_systems(p_s, curr_time)
+        backup_lines = update_backup_lines_between_sub_systems(p_s, curr_time)
+    return backup_lines
+
+
+def get_bus_networks(p_s: PowerSystem):
+    """
+    Returns the child networks of each bus in the power system
+
+    Parameters
+    ----------
+    p_s : PowerSystem
+        A PowerSystem object
+
+    Returns
+    ----------
+    bus_networks : dict
+        Dictionary with the list of child networks of each bus,
+        the key is the bus
+
+    """
+    bus_networks = {}
+    for child_network in p_s.child_network_list:
+        for bus in child_network.buses:
+            bus_networks.setdefault(bus, []).append(child_network)
+    return bus_networks
 
 
 def try_to_add_connected_lines(
     p_s: PowerSystem,
     bus: Bus,
     sub_system: SubSystem,
-    used_buses: list,
-    used_lines: list,
+    used_buses: set,
+    used_lines: set,
+    bus_networks: dict = None,
 ):
     """
     Add lines to the sub system
 
+    The connected lines are followed depth first from the bus, and the
+    lines and buses that are reached are added to the sub system
+
     Parameters
     ----------
     p_s : PowerSystem
@@ -85,62 +106,45 @@ def try_to_add_connected_lines(
         A Bus object
     sub_system : SubSystem
         A SubSystem object
-    used_buses : list
-        List of used Bus elements
-    used_lines : list
-        List of used Line elements
+    used_buses : set
+        Set of used Bus elements
+    used_lines : set
+        Set of used Line elements
+    bus_networks : dict, optional
+        Dictionary with the list of child networks of each bus
 
     Returns
     ----------
     sub_system : SubSystem
         A SubSystem object
-    used_buses : list
-        List of used Bus elements
-    used_lines : list
-        List of used Line elements
+    used_buses : set
+        Set of used Bus elements
+    used_lines : set
+        Set of used Line elements
 
     """
-    for line in subtract(bus.connected_lines, used_lines):
-        if line.connected:
-            sub_system.add_line(line)
-            used_lines.append(line)
-            used_lines = unique(used_lines)
-            if line.tbus == bus:
-                sub_system, used_buses = add_bus(
-                    p_s,
-                    line.fbus,
-                    sub_system,
-                    used_buses,
-                )
-                (
-                    sub_system,
-                    used_buses,
-                    used_lines,
-                ) = try_to_add_connected_lines(
-                    p_s,
-                    line.fbus,
-                    sub_system,
-                    used_buses,
-                    used_lines,
-                )
-            else:
-                sub_system, used_buses = add_bus(
-                    p_s,
-                    line.tbus,
-                    sub_system,
-                    used_buses,
-                )
-                (
-                    sub_system,
-                    used_buses,
-                    used_lines,
-                ) = try_to_add_connected_lines(
-                    p_s,
-                    line.tbus,
-                    sub_system,
-                    used_buses,
-                    used_lines,
-                )
+    if bus_networks is None:
+        bus_networks = get_bus_networks(p_s)
+    stack = [(bus, iter(bus.connected_lines))]
+    while len(stack) > 0:
+        curr_bus, lines = stack[-1]
+        for line in lines:
+            if line.connected and line not in used_lines:
+                break
+        else:
+            stack.pop()
+            continue
+        sub_system.add_line(line)
+        used_lines.add(line)
+        next_bus = line.fbus if line.tbus == curr_bus else line.tbus
+        sub_system, used_buses = add_bus(
+            p_s,
+            next_bus,
+            sub_system,
+            used_buses,
+            bus_networks,
+        )
+        stack.append((next_bus, iter(next_bus.connected_lines)))
     return sub_system, used_buses, used_lines
 
 
@@ -148,7 +152,8 @@ def add_bus(
     p_s: PowerSystem,
     bus: Bus,
     sub_system: SubSystem,
-    used_buses: list,
+    used_buses: set,
+    bus_networks: dict = None,
 ):
     """
     Add buses to the sub system
@@ -161,24 +166,26 @@ def add_bus(
         A Bus object
     sub_system : SubSystem
         A SubSystem object
-    used_buses : list
-        List of used Bus elements
+    used_buses : set
+        Set of used Bus elements
+    bus_networks : dict, optional
+        Dictionary with the list of child networks of each bus
 
     Returns
     ----------
     sub_system : SubSystem
         A SubSystem object
-    used_buses : list
-        List of used Bus elements
+    used_buses : set
+        Set of used Bus elements
 
     """
-    if bus not in unique(used_buses + sub_system.buses):
+    if bus not in used_buses:
+        if bus_networks is None:
+            bus_networks = get_bus_networks(p_s)
         sub_system.add_bus(bus)
-        used_buses.append(bus)
-        used_buses = unique(used_buses)
-        for child_network in p_s.child_network_list:
-            if bus in child_network.buses:
-                sub_system.add_child_network(child_network)
+        used_buses.add(bus)
+        for child_network in bus_networks.get(bus, []):
+            sub_system.add_child_network(child_network)
     return sub_system, used_buses
 
 
@@ -196,7 +203,9 @@ def update_backup_lines_between_sub_systems(p_s: PowerSystem, curr_time: Time):
 
     Returns
     ----------
-    None
+    backup_lines : list
+        List of the backup lines that were connected between the
+        sub systems, in the order they were connected
 
     """
     update = False
@@ -212,8 +221,8 @@ def update_backup_lines_between_sub_systems(p_s: PowerSystem, curr_time: Time):
                         and not line.failed
                         and all(
                             [
-                                x.parent_network.controller.sectioning_time
-                                <= Time(0)
+                                x.parent_network.controller.sectioning_time.quantity
+                                <= 0
                                 for x in line.tbus.connected_lines
                                 + line.fbus.connected_lines
                             ]
@@ -229,7 +238,28 @@ def update_backup_lines_between_sub_systems(p_s: PowerSystem, curr_time: Time):
         if update:
             break
     if update:
-        find_sub_systems(p_s, curr_time)
+        return [line] + find_sub_systems(p_s, curr_time)
+    return []
+
+
+def connect_backup_lines(backup_lines: list):
+    """
+    Function that connects backup lines by closing their disconnectors
+
+    Parameters
+    ----------
+    backup_lines : list
+        List of the backup lines, in the order they will be connected
+
+    Returns
+    ----------
+    None
+
+    """
+    for line in backup_lines:
+        for discon in line.get_disconnectors():
+            if discon.is_open:
+                discon.close()
 
 
 def update_sub_system_slack(p_s: PowerSystem):
@@ -255,6 +285,70 @@ def update_sub_system_slack(p_s: PowerSystem):
                 break
 
 
+def get_sub_system_signature(p_s: PowerSystem):
+    """
+    Returns a signature of the state deciding the sub systems, the
+    connected backup lines and the slack buses of the power system,
+    that is the connection status of the lines, the fail status of the
+    backup lines and the sectioning status of the network controllers
+
+    Parameters
+    ----------
+    p_s : PowerSystem
+        A PowerSystem element
+
+    Returns
+    ----------
+    signature : tuple
+        The signature of the state
+
+    """
+    return (
+        tuple(line.connected for line in p_s.lines),
+        tuple(line.failed for line in p_s.lines if line.is_backup),
+        tuple(
+            network.controller.sectioning_time.quantity <= 0
+            for network in p_s.child_network_list
+            if hasattr(network, "controller")
+        ),
+    )
+
+
+def restore_sub_system_slack(p_s: PowerSystem):
+    """
+    Function that sets the current slack bus of the sub systems of the
+    power system again, giving the same result as update_sub_system_slack
+    when the sub systems are unchanged, without searching for the slack
+    buses
+
+    Parameters
+    ----------
+    p_s : PowerSystem
+        A PowerSystem element
+
+    Returns
+    ----------
+    None
+
+    """
+    for sub_system in p_s.sub_systems:
+        slack_bus = sub_system.slack
+        if slack_bus is None:
+            for bus in sub_system.buses:
+                bus.is_slack = False
+            continue
+        sub_system.buses[0].is_slack = False
+        battery = slack_bus.battery
+        if (
+            battery is not None
+            and battery.mode == MicrogridMode.LIMITED_SUPPORT
+            and battery.remaining_survival_time.quantity == 0
+            and not slack_bus.is_slack
+        ):
+            battery.start_survival_time()
+        slack_bus.set_slack()
+
+
 def set_slack(p_s: PowerSystem, sub_system: SubSystem):
     """
     Function that sets the slack bus of the power system
@@ -295,7 +389,7 @@ def set_slack(p_s: PowerSystem, sub_system: SubSystem):
             ):  # Battery in Microgrid
                 if (
                     bus.battery.mode == MicrogridMode.LIMITED_SUPPORT
-                    and bus.battery.remaining_survival_time == Time(0)
+                    and bus.battery.remaining_survival_time.quantity == 0
                     and not bus.is_slack
                 ):
                     bus.battery.start_survival_time()
@@ -333,6 +427,9 @@ def prepare_system(
      - Defining the simulation time increments
      - Interpolating load and production data based on
        the time increments
+     - Building the load, cost and production of every
+       time increment
+     - Preallocating the history arrays for the time increments
 
     Parameters
     ----------
@@ -369,6 +466,10 @@ def prepare_system(
     # Prepare load and production data
     power_system.prepare_load_data(time_array_indices)
     power_system.prepare_prod_data(time_array_indices)
+    power_system.prepare_profile_matrices()
+
+    # Preallocate the history arrays
+    power_system.reserve_history(len(time_array))
 
     return time_array
 
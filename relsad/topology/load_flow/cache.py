@@ -0,0 +1,134 @@
+from collections import OrderedDict
+
+from relsad.network.systems.PowerNetwork import PowerNetwork
+from relsad.topology.load_flow.bfs import is_cyclic
+
+
+class TopologyCache:
+    """
+    Bounded least recently used cache of compiled load flow topologies
+
+    The entries are keyed by the setup function, the slack bus and the
+    set of connected lines of a network. An entry holds the compiled
+    topology and the line directions found by the setup. When a network
+    with the same slack bus and connected lines is met again, the line
+    directions are restored and the compiled topology is reused, so the
+    radial check, the line orientation and the topology construction
+    are skipped
+
+    ...
+
+    Attributes
+    ----------
+    maxsize : int
+        The maximum number of cached topologies
+    entries : OrderedDict
+        The cached topologies and line directions, ordered from least
+        to most recently used
+    hits : int
+        The number of lookups where the topology was found in the cache
+    misses : int
+        The number of lookups where the topology had to be compiled
+
+    Methods
+    ----------
+    get_topology(network, setup)
+        Returns the compiled topology of a network
+    clear()
+        Removes all entries and resets the counters
+    """
+
+    def __init__(self, maxsize: int = 128):
+        if maxsize < 1:
+            raise Exception("The topology cache must hold at least one entry")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __str__(self):
+        return f"TopologyCache(hits={self.hits}, misses={self.misses})"
+
+    def __repr__(self):
+        return (
+            f"TopologyCache(maxsize={self.maxsize}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
+
+    def get_topology(self, network: PowerNetwork, setup: callable):
+        """
+        Returns the compiled topology of a network
+
+        On a miss, the network is checked for cycles and the topology
+        is compiled with the setup function. On a hit, the cached line
+        directions are restored. In both cases the slack bus is placed
+        first in the bus list of the network
+
+        Parameters
+        ----------
+        network : PowerNetwork
+            The analyzed network
+        setup : callable
+            Function that orients the lines and compiles the topology,
+            taking the bus list and the line list as arguments and
+            returning the topology and the updated bus list
+
+        Returns
+        ----------
+        topology
+            The compiled topology returned by the setup function
+
+        """
+        slack_bus = None
+        for bus in network.buses:
+            if bus.is_slack:
+                slack_bus = bus
+                break
+        key = (
+            setup,
+            slack_bus,
+            frozenset(line for line in network.lines if line.connected),
+        )
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            # Check if network is radial
+            if is_cyclic(network) is True:
+                raise Exception("The network is not radial, cannot run BFS")
+            topology, network.buses = setup(network.buses, network.lines)
+            directions = [
+                (line, line.fbus) for line in network.lines if line.connected
+            ]
+            self.entries[key] = (topology, directions)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+            return topology
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        topology, directions = entry
+        for line, fbus in directions:
+            if line.fbus != fbus:
+                line.change_direction()
+        ## Place slack bus first
+        bus_list = network.buses
+        i = bus_list.index(slack_bus)
+        bus_list[0], bus_list[i] = bus_list[i], bus_list[0]
+        return topology
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        None
+
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
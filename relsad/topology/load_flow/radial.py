@@ -0,0 +1,175 @@
+import numpy as np
+
+from relsad.network.components import Bus
+
+
+def orient_lines_from_slack_bus(
+    slack_bus: Bus,
+    bus_list: list,
+    line_list: list,
+):
+    """
+    Update line directions based on slack bus
+    (making slack bus parent of the radial tree)
+
+    Gives the same line directions as
+    update_line_direction_based_on_slack_bus, but looks up the
+    neighboring buses in a dictionary instead of searching through
+    all bus pairs
+
+    Parameters
+    ----------
+    slack_bus : Bus
+        Slack bus
+    bus_list : list
+        List containing buses
+    line_list : list
+        List containing lines
+
+    Returns
+    -------
+    None
+
+    """
+    position = {bus: idx for idx, bus in enumerate(bus_list)}
+    # The first line in the line list between each pair of buses
+    neighbors = {bus: {} for bus in bus_list}
+    for line in line_list:
+        fbus, tbus = line.fbus, line.tbus
+        if fbus in position and tbus in position and fbus != tbus:
+            neighbors[fbus].setdefault(tbus, line)
+            neighbors[tbus].setdefault(fbus, line)
+
+    target_buses = [slack_bus]
+    used_target_buses = set()
+    while len(target_buses) > 0:
+        new_target_buses = list()
+        found_buses = set()
+        for target_bus in target_buses:
+            if target_bus in used_target_buses:
+                continue
+            for bus in sorted(neighbors[target_bus], key=position.get):
+                if bus in used_target_buses:
+                    continue
+                if target_bus in bus.nextbus:
+                    neighbors[target_bus][bus].change_direction()
+                if bus not in found_buses:
+                    new_target_buses.append(bus)
+                    found_buses.add(bus)
+            used_target_buses.add(target_bus)
+        target_buses = new_target_buses
+
+
+class RadialTopology:
+    """
+    Radial tree of a power network compiled into index arrays
+
+    The buses are stored in topological order, starting with the
+    slack bus, so that every bus comes after its parent bus
+
+    ...
+
+    Attributes
+    ----------
+    buses : list
+        List of the buses in the radial tree in topological order
+    lines : list
+        List of the line feeding each bus, None for buses without
+        a feeding line
+    parent : np.ndarray
+        Index of the parent bus of each bus, -1 for the slack bus
+    levels : list
+        List of index arrays, one per depth in the radial tree
+    has_line : np.ndarray
+        Boolean array that is True for buses with a feeding line
+    rx : np.ndarray
+        Per unit resistance (first row) and reactance (second row) of
+        the line feeding each bus
+    zip : np.ndarray
+        The ZIP coefficients of each bus, one row per bus
+    parent_levels : list
+        List of the parent index arrays of the buses in each level
+    feeding_lines : list
+        List of the feeding lines of the buses with a feeding line
+    stored_buses : tuple
+        The arrays of the state store the buses were last found in and
+        the indices of the buses, None if not found in a state store
+    stored_lines : tuple
+        The arrays of the state store the feeding lines were last found
+        in and the indices of the lines, None if not found in a state
+        store
+    """
+
+    def __init__(self, slack_bus: Bus):
+        buses = [slack_bus]
+        parent = [-1]
+        depth = [0]
+        index = {slack_bus: 0}
+        # Breadth first traversal of the downstream buses
+        for idx, bus in enumerate(buses):
+            for child_bus in bus.nextbus:
+                if child_bus not in index:
+                    index[child_bus] = len(buses)
+                    buses.append(child_bus)
+                    parent.append(idx)
+                    depth.append(depth[idx] + 1)
+        self.buses = buses
+        self.lines = [bus.toline for bus in buses]
+        self.parent = np.array(parent, dtype=int)
+        # The buses are in breadth first order, sorted by depth
+        self.levels = np.split(
+            np.arange(len(buses)),
+            np.flatnonzero(np.diff(depth)) + 1,
+        )
+        self.has_line = np.array(
+            [line is not None for line in self.lines], dtype=bool
+        )
+        self.rx = np.array(
+            [
+                [0.0 if line is None else line.r_pu for line in self.lines],
+                [0.0 if line is None else line.x_pu for line in self.lines],
+            ]
+        )
+        self.zip = np.array([bus.ZIP for bus in buses], dtype=float)
+        self.parent_levels = [self.parent[level] for level in self.levels]
+        self.feeding_lines = [line for line in self.lines if line is not None]
+        self.stored_buses = None
+        self.stored_lines = None
+
+
+def compile_radial_topology(bus_list: list, line_list: list):
+    """
+    Function that orients the lines according to the slack bus and
+    compiles the radial tree into index arrays
+
+    Parameters
+    ----------
+    bus_list : list
+        List containing the bus elements
+    line_list : list
+        List containing the line elements
+
+    Returns
+    -------
+    topology : RadialTopology
+        The compiled radial topology
+    bus_list : list
+        Updated bus list with the slack bus first
+
+    """
+    ## Find slack bus
+    for i, bus in enumerate(bus_list):
+        if bus.is_slack:
+            slack_bus = bus
+            old = bus_list[0]
+            bus_list[0] = slack_bus
+            bus_list[i] = old
+            break
+
+    # Update directions based on slack bus
+    # (making slack bus parent of the radial tree)
+    orient_lines_from_slack_bus(slack_bus, bus_list, line_list)
+
+    topology = RadialTopology(slack_bus)
+
+    return topology, bus_list
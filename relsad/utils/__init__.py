@@ -4,6 +4,11 @@ from .compare import eq
 
 from .definitions import INF
 
+from .history import (
+    History,
+    HistoryColumn,
+)
+
 from .random import (
     get_random_instance,
     random_choice,
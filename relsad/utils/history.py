@@ -0,0 +1,421 @@
+"""
+This module contains the history containers
+"""
+
+from collections.abc import ItemsView, Mapping, ValuesView
+
+import numpy as np
+
+# Data type of the history arrays for each kind of value
+_DTYPES = {
+    "bool": np.bool_,
+    "int": np.int64,
+    "float": np.float64,
+    "object": object,
+}
+
+
+class _AnyType:
+    """
+    Collection that contains every type
+    """
+
+    def __contains__(self, value_type):
+        return True
+
+
+# Types of the values that are stored in the history arrays of each
+# kind without upgrading the data type
+_STORED_TYPES = {
+    "bool": frozenset([bool, np.bool_]),
+    "int": frozenset([int, np.int64]),
+    "float": frozenset([float, int, np.float64, np.int64]),
+    "object": _AnyType(),
+}
+
+
+def _get_kind(value):
+    """
+    Returns the kind of data type needed to store a value
+
+    Parameters
+    ----------
+    value : object
+        The value
+
+    Returns
+    ----------
+    kind : str
+        The kind of data type, one of "bool", "int", "float" and
+        "object"
+
+    """
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    return "object"
+
+
+def _get_common_kind(kind: str, other_kind: str):
+    """
+    Returns the kind of data type needed to store values of two kinds,
+    following the type inference of pandas, where integers and floats
+    are stored as floats and other mixed types as objects
+
+    Parameters
+    ----------
+    kind : str
+        The kind of data type
+    other_kind : str
+        The other kind of data type
+
+    Returns
+    ----------
+    kind : str
+        The common kind of data type
+
+    """
+    if kind == other_kind:
+        return kind
+    if {kind, other_kind} == {"int", "float"}:
+        return "float"
+    return "object"
+
+
+def _to_python(value):
+    """
+    Returns a value stored in a history array as a Python object
+
+    Parameters
+    ----------
+    value : object
+        The stored value
+
+    Returns
+    ----------
+    value : object
+        The value as a Python object
+
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class _ArrayBuffer:
+    """
+    Growable array with a data type that is upgraded to fit the stored
+    values
+
+    ...
+
+    Attributes
+    ----------
+    kind : str
+        The kind of data type of the array, None before the first value
+    array : np.ndarray
+        The array, with room for more values than the stored ones
+    """
+
+    def __init__(self, capacity: int):
+        self.kind = None
+        self.array = np.empty(0)
+        self._capacity = capacity
+        self._size = 0
+        self._stored_types = frozenset()
+
+    def set(self, idx: int, value):
+        """
+        Stores a value at an index in the array, growing the array and
+        upgrading its data type if needed
+
+        Parameters
+        ----------
+        idx : int
+            The index
+        value : object
+            The value
+
+        Returns
+        ----------
+        None
+
+        """
+        if idx < self._size and type(value) in self._stored_types:
+            self.array[idx] = value
+            return
+        kind = _get_kind(value)
+        if self.kind is None:
+            self.kind = kind
+            self.array = np.empty(
+                max(self._capacity, idx + 1, 16), dtype=_DTYPES[kind]
+            )
+        elif kind != self.kind:
+            common_kind = _get_common_kind(self.kind, kind)
+            if common_kind != self.kind:
+                self.kind = common_kind
+                self.array = self.array.astype(_DTYPES[common_kind])
+        if idx >= len(self.array):
+            array = np.empty(2 * len(self.array), dtype=self.array.dtype)
+            array[: len(self.array)] = self.array
+            self.array = array
+        self._size = len(self.array)
+        self._stored_types = _STORED_TYPES[self.kind]
+        self.array[idx] = value
+
+    def reserve(self, capacity: int):
+        """
+        Makes room for a number of values in the array
+
+        Parameters
+        ----------
+        capacity : int
+            The number of values
+
+        Returns
+        ----------
+        None
+
+        """
+        self._capacity = max(self._capacity, capacity)
+        if self.kind is not None and len(self.array) < capacity:
+            array = np.empty(capacity, dtype=self.array.dtype)
+            array[: len(self.array)] = self.array
+            self.array = array
+            self._size = capacity
+
+
+class HistoryColumn(Mapping):
+    """
+    History of one attribute, stored as a preallocated array of values
+    with a parallel array of times
+
+    The column is a mapping from time to value. Values are recorded in
+    time order by appending to the arrays, while a value recorded at
+    an earlier time replaces the value at that time, or is appended if
+    the time is new. The views of the times and values are iterated
+    directly from the arrays, which are also returned as they are by
+    get_times and get_values
+
+    ...
+
+    Attributes
+    ----------
+    n_values : int
+        The number of recorded values
+
+    Methods
+    ----------
+    get_times()
+        Returns the recorded times
+    get_values()
+        Returns the recorded values
+    reserve(capacity)
+        Makes room for a number of values
+    """
+
+    def __init__(self, capacity: int = 0):
+        self._times = _ArrayBuffer(capacity)
+        self._values = _ArrayBuffer(capacity)
+        self.n_values = 0
+        # Latest recorded time, later times are appended without search
+        self._max_time = None
+
+    def __repr__(self):
+        return f"HistoryColumn(n_values={self.n_values})"
+
+    def _find(self, time):
+        """
+        Returns the index of a time in the column, None if the time is
+        not recorded
+        """
+        if self.n_values == 0:
+            return None
+        if self._times.array[self.n_values - 1] == time:
+            return self.n_values - 1
+        idx = np.flatnonzero(self._times.array[: self.n_values] == time)
+        return idx[0] if len(idx) > 0 else None
+
+    def __getitem__(self, time):
+        idx = self._find(time)
+        if idx is None:
+            raise KeyError(time)
+        return _to_python(self._values.array[idx])
+
+    def __setitem__(self, time, value):
+        idx = self.n_values
+        times = self._times
+        values = self._values
+        if idx == 0 or time > self._max_time:
+            self._max_time = time
+            if (
+                idx < times._size
+                and idx < values._size
+                and type(time) in times._stored_types
+                and type(value) in values._stored_types
+            ):
+                # Append to arrays with room for the time and value
+                times.array[idx] = time
+                values.array[idx] = value
+                self.n_values = idx + 1
+                return
+        elif (found_idx := self._find(time)) is not None:
+            values.set(found_idx, value)
+            return
+        times.set(idx, time)
+        values.set(idx, value)
+        self.n_values = idx + 1
+
+    def __iter__(self):
+        return iter(self.get_times().tolist())
+
+    def __len__(self):
+        return self.n_values
+
+    def values(self):
+        return _HistoryValuesView(self)
+
+    def items(self):
+        return _HistoryItemsView(self)
+
+    def get_times(self):
+        """
+        Returns the recorded times
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        times : np.ndarray
+            The recorded times, in the order they were recorded
+
+        """
+        return self._times.array[: self.n_values]
+
+    def get_values(self):
+        """
+        Returns the recorded values
+
+        Parameters
+        ----------
+        None
+
+        Returns
+        ----------
+        values : np.ndarray
+            The recorded values, in the order they were recorded
+
+        """
+        return self._values.array[: self.n_values]
+
+    def reserve(self, capacity: int):
+        """
+        Makes room for a number of values
+
+        Parameters
+        ----------
+        capacity : int
+            The number of values
+
+        Returns
+        ----------
+        None
+
+        """
+        self._times.reserve(capacity)
+        self._values.reserve(capacity)
+
+
+class _HistoryValuesView(ValuesView):
+    """
+    View of the values of a history column, iterated directly from the
+    value array
+    """
+
+    def __iter__(self):
+        return iter(self._mapping.get_values().tolist())
+
+
+class _HistoryItemsView(ItemsView):
+    """
+    View of the times and values of a history column, iterated
+    directly from the time and value arrays
+    """
+
+    def __iter__(self):
+        return zip(
+            self._mapping.get_times().tolist(),
+            self._mapping.get_values().tolist(),
+        )
+
+
+class History(dict):
+    """
+    History of an object, a dictionary from attribute to history column
+
+    Setting an attribute to an empty dictionary starts a new, empty
+    column for the attribute, so the history is initialized in the
+    same way as a dictionary of dictionaries. A dictionary with values
+    is copied into a new column, while a history column is stored as it
+    is
+
+    ...
+
+    Attributes
+    ----------
+    capacity : int
+        The number of values the columns make room for
+
+    Methods
+    ----------
+    reserve(capacity)
+        Makes room for a number of values in every column
+    """
+
+    def __init__(self, capacity: int = 0):
+        super().__init__()
+        self.capacity = capacity
+
+    def __repr__(self):
+        return f"History(attributes={list(self)})"
+
+    def __reduce__(self):
+        return (
+            self.__class__,
+            (self.capacity,),
+            None,
+            None,
+            iter(self.items()),
+        )
+
+    def __setitem__(self, attribute: str, column):
+        if not isinstance(column, HistoryColumn):
+            new_column = HistoryColumn(self.capacity)
+            for time, value in column.items():
+                new_column[time] = value
+            column = new_column
+        super().__setitem__(attribute, column)
+
+    def reserve(self, capacity: int):
+        """
+        Makes room for a number of values in every column, including
+        the columns that are started later
+
+        Parameters
+        ----------
+        capacity : int
+            The number of values
+
+        Returns
+        ----------
+        None
+
+        """
+        self.capacity = capacity
+        for column in self.values():
+            column.reserve(capacity)
@@ -0,0 +1,100 @@
+import numpy as np
+
+from relsad.StatDist import (
+    GammaParameters,
+    NormalParameters,
+    StatDist,
+    StatDistType,
+    UniformParameters,
+)
+
+
+def get_stat_dists(buffer_size: int = 1000):
+    return [
+        StatDist(
+            stat_dist_type=StatDistType.UNIFORM_FLOAT,
+            parameters=UniformParameters(min_val=1, max_val=3),
+            buffer_size=buffer_size,
+        ),
+        StatDist(
+            stat_dist_type=StatDistType.UNIFORM_INT,
+            parameters=UniformParameters(min_val=1, max_val=10),
+            buffer_size=buffer_size,
+        ),
+        StatDist(
+            stat_dist_type=StatDistType.TRUNCNORMAL,
+            parameters=NormalParameters(
+                loc=1.25,
+                scale=1,
+                min_val=0.5,
+                max_val=2,
+            ),
+            buffer_size=buffer_size,
+        ),
+        StatDist(
+            stat_dist_type=StatDistType.GAMMA,
+            parameters=GammaParameters(shape=2, scale=1),
+            buffer_size=buffer_size,
+        ),
+    ]
+
+
+def test_draw_buffered():
+    for stat_dist in get_stat_dists(buffer_size=10):
+        random_instance = np.random.default_rng(1)
+        values = np.concatenate(
+            [stat_dist.draw(random_instance, size=1) for _ in range(25)]
+        )
+        # The single draws are handed out from blocks of 10 values
+        random_instance = np.random.default_rng(1)
+        blocks = np.concatenate(
+            [stat_dist.draw(random_instance, size=10) for _ in range(3)]
+        )
+        assert np.array_equal(values, blocks[:25])
+
+
+def test_draw_unbuffered():
+    stat_dist = get_stat_dists(buffer_size=1)[0]
+    random_instance = np.random.default_rng(1)
+    values = np.concatenate(
+        [stat_dist.draw(random_instance, size=1) for _ in range(5)]
+    )
+    # Every single draw is drawn directly from the random instance
+    random_instance = np.random.default_rng(1)
+    expected = np.concatenate(
+        [random_instance.uniform(low=1, high=3, size=1) for _ in range(5)]
+    )
+    assert np.array_equal(values, expected)
+
+
+def test_draw_random_instance_change():
+    for stat_dist in get_stat_dists():
+        stat_dist.draw(np.random.default_rng(2), size=1)
+        # The values buffered from the first random instance are not
+        # used with a new random instance
+        value = stat_dist.draw(np.random.default_rng(1), size=1)
+        expected = StatDist(
+            stat_dist_type=stat_dist.stat_dist_type,
+            parameters=stat_dist.parameters,
+        ).draw(np.random.default_rng(1), size=1)
+        assert np.array_equal(value, expected)
+
+
+def test_clear_buffer():
+    stat_dist = get_stat_dists()[0]
+    random_instance = np.random.default_rng(1)
+    value = stat_dist.draw(random_instance, size=1)
+    stat_dist.clear_buffer()
+    assert len(stat_dist._buffer) == 0
+    # A new block is drawn from the random instance
+    assert stat_dist.draw(random_instance, size=1) != value
+
+
+def test_draw_truncnormal_limits():
+    stat_dist = get_stat_dists()[2]
+    random_instance = np.random.default_rng(1)
+    values = np.concatenate(
+        [stat_dist.draw(random_instance, size=1) for _ in range(2500)]
+    )
+    assert values.min() >= 0.5
+    assert values.max() <= 2
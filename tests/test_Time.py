@@ -1,3 +1,5 @@
+import numpy as np
+
 from relsad.Time import Time, TimeStamp, TimeUnit
 from relsad.utils import eq
 
@@ -42,3 +44,21 @@ def test_get_years():
     week = Time(52.1424, TimeUnit.WEEK)
     year = week.get_years()
     assert eq(year, 1, tol=1e-6)
+
+
+def test_get_unit_quantity():
+    minute = Time(90, TimeUnit.MINUTE)
+    assert minute.get_unit_quantity(TimeUnit.MINUTE) == 90
+    assert minute.get_unit_quantity(TimeUnit.HOUR) == 1.5
+    assert minute > Time(1, TimeUnit.HOUR)
+    assert (minute - Time(1, TimeUnit.HOUR)).quantity == 30
+
+
+def test_quantity_type():
+    assert Time(np.float64(1.5)).quantity == 1.5
+    raised = False
+    try:
+        Time("1")
+    except Exception:
+        raised = True
+    assert raised
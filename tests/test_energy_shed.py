@@ -1,6 +1,21 @@
+import os
+import pickle
+
 import numpy as np
 
-from relsad.energy.shedding import shed_energy
+from relsad.energy import SheddingCache, shedding
+from relsad.energy.shedding import (
+    _build_A_matrix,
+    _gather_bounds,
+    _get_structure,
+    _shed_active_loads,
+    _shed_radial_loads,
+    shed_energy,
+)
+from relsad.examples.CINELDI.load_and_prod import set_network_load_and_prod
+from relsad.examples.CINELDI.network import (
+    initialize_network as initialize_cineldi,
+)
 from relsad.loadflow.ac import run_bfs_load_flow
 from relsad.network.components import (
     Battery,
@@ -19,7 +34,8 @@ from relsad.network.systems import (
     PowerSystem,
     Transmission,
 )
-from relsad.Time import Time, TimeUnit
+from relsad.simulation import Simulation
+from relsad.Time import Time, TimeStamp, TimeUnit
 from relsad.utils import eq
 
 
@@ -409,3 +425,293 @@ def test_energy_shed_isolated_production_low():
     # assert eq(B5.q_energy_shed_stack, 0.0, tol=1e-6)
     # assert eq(B6.p_energy_shed_stack, 0.0, tol=1e-6)
     # assert eq(B6.q_energy_shed_stack, 0.0, tol=1e-6)
+
+
+def test_build_A_matrix():
+    ps = initialize_network()
+
+    ps.get_comp("L4").disconnect()
+
+    A = _build_A_matrix(ps)
+
+    N_D = len(ps.buses)
+    N_L = len(ps.lines) - 1
+    assert A.shape == (N_D, N_D + N_L + N_D + 1)
+    assert A.format == "csr"
+    # One load, generation and slack coefficient per bus and
+    # two line coefficients per connected line
+    assert A.nnz == 3 * N_D + 2 * N_L
+    # L1 goes from B1 to B2
+    assert A[0, N_D] == -1
+    assert A[1, N_D] == 1
+
+
+def test_energy_shed_cache():
+    ps = initialize_network(
+        island_mode=True,
+        include_PV=True,
+    )
+
+    for bus, pload in zip(ps.buses, [0, 0.05, 0.04, 0.03, 0.02, 0.05]):
+        bus.add_load(pload=pload, qload=0)
+        bus.set_cost(1)
+    ps.get_comp("B1").set_slack()
+    ps.get_comp("PV").add_prod_data(pprod_data=[0.06], qprod_data=[0])
+    ps.set_prod(inc_idx=0)
+
+    run_bfs_load_flow(ps, maxit=5)
+
+    shedding_cache = SheddingCache(maxsize=1)
+    shed_stacks = []
+    for cache in [None, shedding_cache, shedding_cache]:
+        for bus in ps.buses:
+            bus.p_energy_shed_stack = 0
+        shed_energy(
+            power_system=ps,
+            dt=Time(1, TimeUnit.HOUR),
+            alpha=1e-7,
+            shedding_cache=cache,
+        )
+        shed_stacks.append([bus.p_energy_shed_stack for bus in ps.buses])
+
+    assert shedding_cache.misses == 1
+    assert shedding_cache.hits == 1
+    assert eq(sum(shed_stacks[0]), 0.13, tol=1e-6)
+    assert np.allclose(shed_stacks[0], shed_stacks[1])
+    assert np.allclose(shed_stacks[0], shed_stacks[2])
+
+    # The cache is pickled to the workers together with the network,
+    # where the entries are found for the copied components
+    ps_copy, cache_copy = pickle.loads(pickle.dumps((ps, shedding_cache)))
+    for bus in ps_copy.buses:
+        bus.p_energy_shed_stack = 0
+    shed_energy(
+        power_system=ps_copy,
+        dt=Time(1, TimeUnit.HOUR),
+        alpha=1e-7,
+        shedding_cache=cache_copy,
+    )
+    assert cache_copy.misses == 1
+    assert cache_copy.hits == 2
+    structure = next(iter(cache_copy.entries.values()))
+    assert all(
+        bus is bus_copy
+        for bus, bus_copy in zip(structure.buses, ps_copy.buses)
+    )
+    assert np.allclose(
+        shed_stacks[0], [bus.p_energy_shed_stack for bus in ps_copy.buses]
+    )
+
+
+def test_shed_radial_loads():
+    ps = initialize_network(
+        island_mode=True,
+        include_PV=True,
+    )
+
+    for bus, pload, cost in zip(
+        ps.buses,
+        [0, 0.05, 0.04, 0.03, 0.02, 0.05],
+        [1, 3, 1, 2, 5, 4],
+    ):
+        bus.add_load(pload=pload, qload=0)
+        bus.set_cost(cost)
+    ps.get_comp("B1").set_slack()
+    ps.get_comp("PV").add_prod_data(pprod_data=[0.06], qprod_data=[0])
+    ps.set_prod(inc_idx=0)
+
+    run_bfs_load_flow(ps, maxit=5)
+
+    structure = _get_structure(ps)
+    N_D = len(structure.buses)
+    c = np.zeros(structure.A.shape[1])
+    c[:N_D] = [bus.get_cost() for bus in structure.buses]
+    p_bounds, _ = _gather_bounds(ps, 1e-7, structure)
+    assert structure.radial
+
+    radial_shed = _shed_radial_loads(
+        structure=structure,
+        c=c,
+        bounds=p_bounds,
+    )
+    lp_shed = _shed_active_loads(
+        c=c,
+        A=structure.A,
+        p_b=p_bounds[:N_D, 1],
+        p_bounds=p_bounds,
+        buses=structure.buses,
+        lines=structure.lines,
+        alpha=1e-7,
+    )
+    assert np.allclose(radial_shed, lp_shed[:N_D], atol=1e-6)
+    # The most expensive loads are supplied by the PV, limited by
+    # the flow capacity of L5
+    assert eq(sum(radial_shed), 0.13, tol=1e-6)
+    assert eq(radial_shed[ps.buses.index(ps.get_comp("B6"))], 0, tol=1e-6)
+    assert eq(radial_shed[ps.buses.index(ps.get_comp("B5"))], 0.01, tol=1e-6)
+
+
+def test_shed_radial_loads_equal_cost():
+    ps = initialize_network(
+        island_mode=True,
+        include_PV=True,
+    )
+
+    for bus, pload in zip(ps.buses, [0, 0.05, 0.04, 0.03, 0.02, 0.05]):
+        bus.add_load(pload=pload, qload=0)
+        bus.set_cost(1)
+    ps.get_comp("B1").set_slack()
+    ps.get_comp("PV").add_prod_data(pprod_data=[0.06], qprod_data=[0])
+    ps.set_prod(inc_idx=0)
+
+    run_bfs_load_flow(ps, maxit=5)
+
+    structure = _get_structure(ps)
+    N_D = len(structure.buses)
+    c = np.zeros(structure.A.shape[1])
+    c[:N_D] = [bus.get_cost() for bus in structure.buses]
+    p_bounds, _ = _gather_bounds(ps, 1e-7, structure)
+
+    # The loads with equal cost compete for the generation of the PV,
+    # and the choice between them is left to linear programming
+    assert (
+        _shed_radial_loads(
+            structure=structure,
+            c=c,
+            bounds=p_bounds,
+        )
+        is None
+    )
+
+
+def run_cineldi(radial_solver: bool, monkeypatch):
+    if not radial_solver:
+        monkeypatch.setattr(
+            shedding,
+            "_shed_radial_loads",
+            lambda **kwargs: None,
+        )
+    ps = initialize_cineldi(
+        include_ICT=False,
+        fail_rate_line=2,
+        fail_rate_trafo=0.5,
+    )
+    ps = set_network_load_and_prod(
+        power_system=ps,
+        include_microgrid=True,
+        include_production=True,
+        data_dir=os.path.join(
+            "relsad",
+            "examples",
+            "load",
+            "data",
+        ),
+    )
+    sim = Simulation(ps, random_seed=2)
+    sim.run_sequential(
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=3,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_flag=False,
+    )
+    monkeypatch.undo()
+    return [bus.acc_interruptions for bus in ps.buses]
+
+
+def test_shed_radial_loads_cineldi(monkeypatch):
+    # The buses of CINELDI share cost functions, so that loads with
+    # equal cost are shed
+    radial_interruptions = run_cineldi(True, monkeypatch)
+    lp_interruptions = run_cineldi(False, monkeypatch)
+    assert sum(lp_interruptions) > 0
+    assert np.allclose(radial_interruptions, lp_interruptions, rtol=1e-9)
+
+
+def test_shed_radial_loads_meshed():
+    ps = initialize_network()
+    dn = ps.get_comp("B2").parent_network
+    L6 = Line(
+        name="L6",
+        fbus=ps.get_comp("B5"),
+        tbus=ps.get_comp("B6"),
+        r=0.5,
+        x=0.5,
+    )
+    dn.add_line(L6)
+
+    structure = _get_structure(ps)
+    c = np.zeros(structure.A.shape[1])
+    p_bounds, _ = _gather_bounds(ps, 1e-4, structure)
+    assert not structure.radial
+    assert (
+        _shed_radial_loads(
+            structure=structure,
+            c=c,
+            bounds=p_bounds,
+        )
+        is None
+    )
+
+
+def test_energy_shed_covered_demand():
+    ps = initialize_network()
+
+    for bus, pload in zip(ps.buses, [0, 0.05, 0.04, 0.03, 0.02, 0.05]):
+        bus.add_load(pload=pload, qload=0)
+        bus.set_cost(1)
+    ps.get_comp("B1").set_slack()
+
+    run_bfs_load_flow(ps, maxit=5)
+
+    # The trafo bus covers the demand
+    n_skipped = shed_energy(
+        power_system=ps,
+        dt=Time(1, TimeUnit.HOUR),
+        alpha=1e-7,
+    )
+    assert n_skipped == 1
+    assert sum(bus.p_energy_shed_stack for bus in ps.buses) == 0
+
+    # L3 limits the supply of B4 and B5
+    ps.get_comp("L3").capacity = 0.02
+    n_skipped = shed_energy(
+        power_system=ps,
+        dt=Time(1, TimeUnit.HOUR),
+        alpha=1e-7,
+    )
+    assert n_skipped == 0
+    assert eq(
+        sum(bus.p_energy_shed_stack for bus in ps.buses),
+        0.03,
+        tol=1e-6,
+    )
+
+    # With different costs the shedding is solved without linear
+    # programming
+    for bus in ps.buses:
+        bus.p_energy_shed_stack = 0
+    ps.get_comp("B4").set_cost(2)
+    n_skipped = shed_energy(
+        power_system=ps,
+        dt=Time(1, TimeUnit.HOUR),
+        alpha=1e-7,
+    )
+    assert n_skipped == 1
+    # B4 is supplied before B5, limited by the capacity of L3
+    assert eq(ps.get_comp("B4").p_energy_shed_stack, 0.01, tol=1e-6)
+    assert eq(ps.get_comp("B5").p_energy_shed_stack, 0.02, tol=1e-6)
@@ -1,7 +1,154 @@
-from relsad.network.components import Battery, Bus, EVPark
+import numpy as np
+
+from relsad.network.components import (
+    Battery,
+    BatteryType,
+    Bus,
+    EVFleet,
+    EVPark,
+)
+from relsad.Table import Table
 from relsad.Time import Time, TimeUnit
 from relsad.utils import eq
 
 
 def test_update():
     pass
+
+
+def dispatch_cars(cars, p, q, dt, v2g_flag):
+    for car in cars:
+        if v2g_flag or p < 0:
+            p, q = car.update_bus_load_and_prod(p, q, dt)
+    return p, q
+
+
+def test_fleet_dispatch():
+    random_instance = np.random.default_rng(0)
+    dt = Time(1, TimeUnit.HOUR)
+    for p, q in [
+        (5, 5),
+        (0.1, 0.05),
+        (5, -1),
+        (0.1, -1),
+        (-5, 5),
+        (-0.1, 0.05),
+        (-5, -1),
+        (-0.1, -1),
+        (0, 0.1),
+        (0, 0),
+    ]:
+        for v2g_flag in [True, False]:
+            soc_states = random_instance.uniform(0.2, 0.9, size=50)
+            bus = Bus(name="B1")
+            cars = [
+                Battery(
+                    name=f"ev{i}",
+                    bus=bus,
+                    inj_p_max=0.072,
+                    inj_q_max=0.072,
+                    E_max=0.7,
+                    SOC_min=0.2,
+                    SOC_max=0.9,
+                    battery_type=BatteryType.EV,
+                    SOC_start=soc_state,
+                )
+                for i, soc_state in enumerate(soc_states)
+            ]
+            fleet = EVFleet(
+                inj_p_max=0.072,
+                inj_q_max=0.072,
+                E_max=0.7,
+                SOC_min=0.2,
+                SOC_max=0.9,
+                n_battery=0.95,
+            )
+            fleet.set_SOC_states(soc_states)
+            # Dispatch twice to drain or fill the batteries
+            for _ in range(2):
+                p_car, q_car = dispatch_cars(cars, p, q, dt, v2g_flag)
+                p_fleet, q_fleet, pprod, qprod, pload, _ = fleet.dispatch(
+                    p, q, dt, v2g_flag
+                )
+                assert eq(p_car, p_fleet, tol=1e-12)
+                assert eq(q_car, q_fleet, tol=1e-12)
+                assert eq(pprod - pload, p - p_fleet, tol=1e-12)
+                assert eq(qprod, q - q_fleet, tol=1e-12)
+                assert np.allclose(
+                    [car.SOC for car in cars],
+                    fleet.get_SOC(),
+                    rtol=0,
+                    atol=1e-12,
+                )
+            assert eq(
+                sum(
+                    min(
+                        car.inj_p_max,
+                        (car.E_max * car.SOC_max - car.E_battery)
+                        / dt.get_hours(),
+                    )
+                    for car in cars
+                ),
+                fleet.get_demand(dt),
+                tol=1e-12,
+            )
+
+
+def test_fleet_dispatch_reactive_balance():
+    # With no active balance, the reactive discharge beyond the total
+    # capacity gives a negative active production, which changes the
+    # active balance of the next EV
+    dt = Time(1, TimeUnit.HOUR)
+    p, q = 0.0, 0.5
+    soc_states = np.full(5, 0.8)
+    bus = Bus(name="B1")
+    cars = [
+        Battery(
+            name=f"ev{i}",
+            bus=bus,
+            inj_p_max=0.01,
+            inj_q_max=0.02,
+            E_max=0.1,
+            SOC_min=0.2,
+            SOC_max=0.9,
+            battery_type=BatteryType.EV,
+            SOC_start=soc_state,
+        )
+        for i, soc_state in enumerate(soc_states)
+    ]
+    fleet = EVFleet(
+        inj_p_max=0.01,
+        inj_q_max=0.02,
+        E_max=0.1,
+        SOC_min=0.2,
+        SOC_max=0.9,
+        n_battery=0.95,
+    )
+    fleet.set_SOC_states(soc_states)
+    p_car, q_car = dispatch_cars(cars, p, q, dt, True)
+    p_fleet, q_fleet, _, _, _, _ = fleet.dispatch(p, q, dt, True)
+    assert eq(p_car, p_fleet, tol=1e-12)
+    assert eq(q_car, q_fleet, tol=1e-12)
+    assert np.allclose(
+        [car.SOC for car in cars],
+        fleet.get_SOC(),
+        rtol=0,
+        atol=1e-12,
+    )
+
+
+def test_fleet_reset():
+    bus = Bus(name="B1")
+    ev_park = EVPark(
+        name="EV1",
+        bus=bus,
+        num_ev_dist=Table(x=np.arange(24), y=np.full(24, 10)),
+    )
+    ev_park.add_random_instance(np.random.default_rng(0))
+    ev_park.draw_current_state(hour_of_day=0)
+    assert len(ev_park.fleet) == 10
+    ev_park.fleet.set_SOC_states(np.full(10, 0.5))
+    assert eq(ev_park.get_SOC(), 0.5)
+    ev_park.reset_status(save_flag=True)
+    assert len(ev_park.fleet) == 0
+    assert ev_park.get_SOC() == 0
@@ -1,6 +1,9 @@
 import numpy as np
 
-from relsad.loadflow.ac import run_bfs_load_flow
+from relsad.examples.IEEE33.network import (
+    initialize_network as initialize_ieee33,
+)
+from relsad.loadflow.ac import run_bfs_load_flow, run_vectorized_bfs_load_flow
 from relsad.network.components import (
     Battery,
     Bus,
@@ -735,3 +738,65 @@ def test_load_flow_active_reactive_production():
     assert eq(L3.qloss, 1.043074e-7, tol=1e-6)
     assert eq(L4.qloss, 4.172760e-7, tol=1e-6)
     assert eq(L5.qloss, 2.607630e-6, tol=1e-6)
+
+
+def test_vectorized_load_flow():
+    results = []
+    for load_flow in [run_bfs_load_flow, run_vectorized_bfs_load_flow]:
+        ps = initialize_network()
+        loads = {
+            "B1": (0, 0),
+            "B2": (-0.05, 0.005),
+            "B3": (0.04, -0.004),
+            "B4": (-0.03, 0.003),
+            "B5": (0.02, -0.002),
+            "B6": (-0.05, -0.005),
+        }
+        for name, (pload, qload) in loads.items():
+            ps.get_comp(name).add_load(pload=pload, qload=qload)
+        ps.get_comp("L4").disconnect()
+
+        load_flow(ps, maxit=60)
+
+        results.append(
+            [
+                (bus.vomag, bus.voang, bus.p_loss_downstream)
+                for bus in sorted(ps.buses, key=lambda bus: bus.name)
+            ]
+            + [
+                (line.ploss, line.qloss, line.get_line_load()[0])
+                for line in sorted(ps.lines, key=lambda line: line.name)
+            ]
+        )
+    assert np.allclose(results[0], results[1], rtol=0, atol=1e-12)
+
+
+def test_vectorized_load_flow_ieee33():
+    results = []
+    for load_flow in [run_bfs_load_flow, run_vectorized_bfs_load_flow]:
+        ps = initialize_ieee33(
+            include_microgrid=False,
+            include_backup=False,
+            include_ICT=False,
+        )
+        rng = np.random.default_rng(0)
+        for bus in ps.buses:
+            bus.add_load(
+                pload=rng.uniform(0, 0.2),
+                qload=rng.uniform(0, 0.1),
+            )
+        ps.get_comp("B1").set_slack()
+
+        load_flow(ps, maxit=10)
+
+        results.append(
+            [
+                (bus.vomag, bus.voang, bus.p_loss_downstream)
+                for bus in sorted(ps.buses, key=lambda bus: bus.name)
+            ]
+            + [
+                (line.ploss, line.qloss, line.get_line_load()[0])
+                for line in sorted(ps.lines, key=lambda line: line.name)
+            ]
+        )
+    assert np.allclose(results[0], results[1], rtol=0, atol=1e-12)
@@ -0,0 +1,73 @@
+import numpy as np
+from numpy.random import SeedSequence
+
+from relsad.simulation.monte_carlo.sampling import (
+    InversionGenerator,
+    IterationSeed,
+    SamplingStrategy,
+    get_iteration_random_instance,
+    get_iteration_seeds,
+)
+
+
+def test_inversion_generator():
+    random_instance = InversionGenerator(np.random.PCG64(0))
+    mirrored_instance = InversionGenerator(np.random.PCG64(0), mirrored=True)
+    uniforms = random_instance.random(1000)
+    mirrored_uniforms = mirrored_instance.random(1000)
+    assert np.all((mirrored_uniforms >= 0) & (mirrored_uniforms < 1))
+    assert np.allclose(uniforms + mirrored_uniforms, 1)
+    assert isinstance(random_instance.random(), float)
+
+    random_instance = InversionGenerator(np.random.PCG64(0))
+    values = random_instance.uniform(low=2, high=4, size=10000)
+    assert np.all((values >= 2) & (values < 4))
+    assert abs(values.mean() - 3) < 0.05
+    values = random_instance.integers(low=1, high=4, size=10000)
+    assert set(np.unique(values)) == {1, 2, 3}
+    values = random_instance.exponential(scale=2, size=10000)
+    assert abs(values.mean() - 2) < 0.1
+    values = random_instance.gamma(shape=2, scale=3, size=10000)
+    assert abs(values.mean() - 6) < 0.2
+
+    # Mirrored draws are negatively correlated
+    random_instance = InversionGenerator(np.random.PCG64(1))
+    mirrored_instance = InversionGenerator(np.random.PCG64(1), mirrored=True)
+    values = random_instance.exponential(size=1000)
+    mirrored_values = mirrored_instance.exponential(size=1000)
+    assert np.corrcoef(values, mirrored_values)[0, 1] < -0.5
+
+
+def test_get_iteration_seeds():
+    seeds = get_iteration_seeds(
+        SamplingStrategy.INDEPENDENT, SeedSequence(0), 4, 3
+    )
+    assert len(seeds) == 4
+    assert all(isinstance(seed, SeedSequence) for seed in seeds)
+
+    seeds = get_iteration_seeds(
+        SamplingStrategy.ANTITHETIC, SeedSequence(0), 5, 3
+    )
+    assert len(seeds) == 5
+    assert [seed.mirrored for seed in seeds] == [
+        False,
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert seeds[0].seed is seeds[1].seed
+    assert seeds[1].seed is not seeds[2].seed
+    first = get_iteration_random_instance(seeds[0]).random(10)
+    second = get_iteration_random_instance(seeds[1]).random(10)
+    assert np.allclose(first + second, 1)
+
+    iterations = 8
+    for strategy in [SamplingStrategy.LATIN_HYPERCUBE, SamplingStrategy.SOBOL]:
+        seeds = get_iteration_seeds(strategy, SeedSequence(0), iterations, 3)
+        assert all(isinstance(seed, IterationSeed) for seed in seeds)
+        uniforms = np.array([seed.uniforms for seed in seeds])
+        assert uniforms.shape == (iterations, 3)
+        # One point in each stratum of every dimension
+        strata = np.sort(np.floor(uniforms * iterations), axis=0)
+        assert np.all(strata == np.arange(iterations)[:, None])
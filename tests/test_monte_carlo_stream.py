@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+from relsad.simulation.monte_carlo.stream import (
+    MonteCarloHistoryWriter,
+    MonteCarloStatistics,
+    get_monte_carlo_history_keys,
+)
+
+
+def test_get_monte_carlo_history_keys():
+    save_dict = {
+        "ps": {"SAIFI": {}, "SAIDI": {}},
+        "B1": {"acc_p_energy_shed": {}},
+    }
+    assert get_monte_carlo_history_keys(save_dict) == [
+        ("ps", "SAIFI"),
+        ("ps", "SAIDI"),
+        ("B1", "acc_p_energy_shed"),
+    ]
+
+
+def test_monte_carlo_statistics():
+    keys = [("ps", "SAIFI"), ("ps", "CAIDI")]
+    rng = np.random.default_rng(0)
+    values = rng.random((50, 2))
+    values[::7, 1] = np.nan
+
+    statistics = MonteCarloStatistics(keys)
+    for row in values:
+        statistics.add(row)
+
+    assert np.allclose(statistics.mean, np.nanmean(values, axis=0))
+    assert np.allclose(
+        statistics.get_variance(), np.nanvar(values, axis=0, ddof=1)
+    )
+    assert np.allclose(statistics.min, np.nanmin(values, axis=0))
+    assert np.allclose(statistics.max, np.nanmax(values, axis=0))
+    assert statistics.get_statistics("ps", "CAIDI")["count"] == 42
+
+    raised = False
+    try:
+        statistics.add([1.0])
+    except Exception:
+        raised = True
+    assert raised
+
+
+def test_monte_carlo_statistics_targets():
+    keys = [("ps", "SAIFI"), ("ps", "CAIDI")]
+    rng = np.random.default_rng(0)
+    values = 1 + rng.random((100, 2))
+    values[:, 1] = 0
+
+    statistics = MonteCarloStatistics(keys)
+    assert not statistics.targets_met({("ps", "SAIFI"): 1})
+    for row in values:
+        statistics.add(row)
+
+    n = len(values)
+    mean = values[:, 0].mean()
+    sem = values[:, 0].std(ddof=1) / np.sqrt(n)
+    rse = statistics.get_rse()
+    assert np.isclose(rse[0], sem / mean)
+    # The relative standard error is undefined with a zero mean
+    assert np.isnan(rse[1])
+    lower, upper = statistics.get_confidence_interval(0.95)
+    assert np.isclose(lower[0], mean - 1.959964 * sem)
+    assert np.isclose(upper[0], mean + 1.959964 * sem)
+
+    assert statistics.targets_met({("ps", "SAIFI"): 2 * rse[0]})
+    assert not statistics.targets_met({("ps", "SAIFI"): rse[0] / 2})
+    assert not statistics.targets_met({("ps", "CAIDI"): 1})
+
+    raised = False
+    try:
+        statistics.targets_met({("ps", "ENS"): 1})
+    except Exception:
+        raised = True
+    assert raised
+
+
+def test_monte_carlo_history_writer(tmp_path):
+    keys = [("ps", "SAIFI"), ("B1", "acc_p_energy_shed")]
+    file_path = str(tmp_path / "monte_carlo" / "iterations.csv")
+    with MonteCarloHistoryWriter(file_path, keys, flush_interval=2) as writer:
+        writer.write(2, [0.5, 1])
+        writer.write(1, [0.25, 2])
+        writer.write(3, [0.75, 3])
+    assert writer.n_rows == 3
+
+    df = pd.read_csv(file_path, index_col="it")
+    assert df.columns.tolist() == ["ps/SAIFI", "B1/acc_p_energy_shed"]
+    assert df.index.tolist() == [2, 1, 3]
+    assert df.loc[1, "ps/SAIFI"] == 0.25
@@ -0,0 +1,159 @@
+import pickle
+
+import numpy as np
+
+from relsad.load.bus import CostFunction
+from relsad.network.components import (
+    Battery,
+    Bus,
+    CircuitBreaker,
+    Line,
+    ManualMainController,
+    Production,
+)
+from relsad.network.systems import Distribution, PowerSystem, Transmission
+from relsad.Time import Time
+
+
+def initialize_network():
+
+    C1 = ManualMainController(name="C1", sectioning_time=Time(0))
+
+    ps = PowerSystem(C1)
+
+    B1 = Bus(name="B1", n_customers=0)
+    B2 = Bus(name="B2", n_customers=2)
+    B3 = Bus(name="B3", n_customers=1)
+    B4 = Bus(name="B4", n_customers=1)
+
+    P1 = Production(name="P1", bus=B3, pmax=0.1, qmax=0.1)
+    P2 = Production(name="P2", bus=B4, pmax=1, qmax=1)
+    Battery(name="Bat1", bus=B4)
+
+    L1 = Line(name="L1", fbus=B1, tbus=B2, r=0.5, x=0.5)
+    L2 = Line(name="L2", fbus=B2, tbus=B3, r=0.5, x=0.5)
+    L3 = Line(name="L3", fbus=B3, tbus=B4, r=0.5, x=0.5)
+
+    CircuitBreaker("E1", L1)
+
+    tn = Transmission(ps, trafo_bus=B1)
+    dn = Distribution(parent_network=tn, connected_line=L1)
+    dn.add_buses([B2, B3, B4])
+    dn.add_lines([L2, L3])
+
+    household = CostFunction(A=8.8, B=14.7)
+    agriculture = CostFunction(A=21.4, B=17.5)
+    B2.add_load_data(
+        pload_data=np.array([0.01, 0.02, 0.03, 0.04]),
+        qload_data=np.array([0.02, 0.02, 0.01, 0.01]),
+        cost_function=household,
+    )
+    B2.add_load_data(
+        pload_data=np.array([0.05, 0.01, 0.02, 0.01]),
+        cost_function=agriculture,
+        scale=3,
+    )
+    B3.add_load_data(
+        pload_data=np.array([0.01, 0.02, 0.03, 0.04]),
+        cost_function=household,
+    )
+    P1.add_prod_data(pprod_data=np.array([0.05, 0.1, 0.15, 0.2]))
+    P2.add_prod_data(pprod_data=np.array([0.05, 0.1, 0.15, 0.2]), scale=2)
+    return ps
+
+
+def prepare_network(ps: PowerSystem):
+    time_indices = np.arange(4)
+    ps.prepare_load_data(time_indices)
+    ps.prepare_prod_data(time_indices)
+    ps.prepare_profile_matrices()
+
+
+def get_bus_state(ps: PowerSystem):
+    return [
+        (
+            bus.pload,
+            bus.qload,
+            bus.pload_pu,
+            bus.qload_pu,
+            bus.cost,
+            bus.pprod,
+            bus.qprod,
+            bus.pprod_pu,
+            bus.qprod_pu,
+        )
+        for bus in ps.buses
+    ] + [(prod.pprod, prod.qprod) for prod in ps.productions]
+
+
+def get_expected_state(ps: PowerSystem, inc_idx: int):
+    # The load and production set from the profiles of every component
+    for bus in ps.buses:
+        bus.set_load_and_cost(inc_idx)
+    for prod in ps.productions:
+        prod.set_prod(inc_idx)
+    for bus in ps.buses:
+        if bus.battery is not None or bus.ev_park is not None:
+            bus.reset_prod()
+    return get_bus_state(ps)
+
+
+def test_profile_matrices():
+    ps = initialize_network()
+    prepare_network(ps)
+    matrices = ps.profile_matrices
+    assert matrices.pload.shape == (4, 4)
+    assert matrices.pprod.shape == (2, 4)
+    assert np.allclose(matrices.pload[1], [0.32, 0.1, 0.18, 0.14])
+    assert np.allclose(matrices.cost, [1e8, 21.4 + 17.5, 8.8 + 14.7, 1e8])
+    # The production is limited by the capacity of the unit
+    assert np.allclose(matrices.pprod[0], [0.05, 0.1, 0.1, 0.1])
+    assert np.allclose(matrices.pprod[1], [0.1, 0.2, 0.3, 0.4])
+
+
+def test_set_load_and_prod():
+    ps = initialize_network()
+    prepare_network(ps)
+    for inc_idx in range(4):
+        ps.set_load_and_cost(inc_idx)
+        ps.set_prod(inc_idx)
+        state = get_bus_state(ps)
+        assert state == get_expected_state(ps, inc_idx)
+    # The generation at the bus with a battery is reset
+    assert ps.get_comp("B4").pprod == 0
+    assert ps.get_comp("P2").pprod == 0.4
+
+
+def test_set_load_and_prod_state_store():
+    ps = initialize_network()
+    prepare_network(ps)
+    ps.enable_state_store()
+    for inc_idx in range(4):
+        ps.set_load_and_cost(inc_idx)
+        ps.set_prod(inc_idx)
+        state = get_bus_state(ps)
+        assert state == get_expected_state(ps, inc_idx)
+
+
+def test_profile_matrices_reset():
+    ps = initialize_network()
+    prepare_network(ps)
+    ps.prepare_load_data(np.arange(4))
+    assert ps.profile_matrices is None
+    prepare_network(ps)
+    ps.add_bus(Bus(name="B5"))
+    assert ps.profile_matrices is None
+
+
+def test_profile_matrices_pickle():
+    ps = initialize_network()
+    prepare_network(ps)
+    data = pickle.dumps(ps)
+    # The matrices are rebuilt from the components when used
+    ps = pickle.loads(data)
+    assert ps.profile_matrices.pload is None
+    ps.set_load_and_cost(2)
+    ps.set_prod(2)
+    assert ps.profile_matrices.pload is not None
+    state = get_bus_state(ps)
+    assert state == get_expected_state(ps, 2)
@@ -0,0 +1,147 @@
+import os
+import pickle
+
+import numpy as np
+
+from relsad.load import MappedProfile, ProfileRegistry
+from relsad.network.components import Bus, Production
+from relsad.utils import interpolate
+
+
+def test_add_profile():
+    registry = ProfileRegistry()
+    profile_1 = np.array([1.0, 2.0, 3.0])
+    profile_2 = np.array([1.0, 2.0, 3.0])
+    profile_3 = np.array([1.0, 2.0, 4.0])
+
+    assert registry.add_profile(profile_1) == 0
+    assert registry.add_profile(profile_1) == 0
+    # Arrays with the same values are the same profile
+    assert registry.add_profile(profile_2) == 0
+    assert registry.add_profile(profile_3) == 1
+    assert len(registry) == 2
+    assert registry.get_profile(0) is profile_1
+
+
+def test_prepare_shared_profiles():
+    registry = ProfileRegistry()
+    B1 = Bus("B1")
+    B2 = Bus("B2")
+    B3 = Bus("B3")
+    load = np.array([1, 2, 3, 4, 5, 6])
+    B1.add_load_data(pload_data=load)
+    B2.add_load_data(pload_data=load.copy())
+    B3.add_load_data(pload_data=2 * load)
+    time_indices = np.linspace(0, 10, 100)
+    for bus in [B1, B2, B3]:
+        bus.prepare_load_data(time_indices, registry)
+
+    # Each distinct profile is prepared once
+    assert len(registry.prepared) == 3
+    assert B1.pload_data[0] is B2.pload_data[0]
+    assert B1.qload_data[0] is B3.qload_data[0]
+    assert B2.pload_profiles[0] is load
+    assert np.array_equal(
+        B3.pload_data[0],
+        interpolate(array=2 * load, time_indices=time_indices),
+    )
+
+
+def test_prepare_new_time_grid():
+    B1 = Bus("B1")
+    load = np.array([1, 3, 2, 5, 4, 6])
+    B1.add_load_data(pload_data=load)
+    B1.prepare_load_data(np.linspace(0, 10, 7))
+    B1.prepare_load_data(np.linspace(0, 10, 100))
+
+    # The load data are interpolated from the load profile
+    assert np.array_equal(
+        B1.pload_data[0],
+        interpolate(array=load, time_indices=np.linspace(0, 10, 100)),
+    )
+
+
+def test_load_and_prod_scale():
+    B1 = Bus("B1", n_customers=2)
+    P1 = Production("P1", B1, pmax=10, qmax=10)
+    B1.add_load_data(
+        pload_data=np.array([1.0, 2.0]),
+        qload_data=np.array([0.5, 1.0]),
+        scale=3,
+    )
+    P1.add_prod_data(pprod_data=np.array([1.0, 2.0]), scale=2)
+    time_indices = np.arange(2)
+    B1.prepare_load_data(time_indices)
+    P1.prepare_prod_data(time_indices)
+    B1.set_load_and_cost(1)
+    P1.set_prod(1)
+
+    assert B1.pload == 2.0 * 3 * 2
+    assert B1.qload == 1.0 * 3 * 2
+    assert P1.pprod == 4.0
+
+
+def test_memmap_profiles(tmp_path):
+    registry = ProfileRegistry(memmap_dir=str(tmp_path))
+    B1 = Bus("B1")
+    load = np.arange(1000.0)
+    B1.add_load_data(pload_data=load)
+    time_indices = np.arange(5000)
+    B1.prepare_load_data(time_indices, registry)
+
+    assert len(registry.file_paths) == 1
+    assert isinstance(B1.pload_data[0], MappedProfile)
+    assert np.array_equal(
+        B1.pload_data[0],
+        interpolate(array=load, time_indices=time_indices),
+    )
+
+    # The prepared profile is pickled as a reference to the file
+    data = pickle.dumps(B1.pload_data[0])
+    assert len(data) < B1.pload_data[0].nbytes / 10
+    profile = pickle.loads(data)
+    assert isinstance(profile, MappedProfile)
+    assert np.array_equal(profile, B1.pload_data[0])
+
+    # Arrays derived from the profile are pickled as arrays
+    scaled = pickle.loads(pickle.dumps(2 * B1.pload_data[0]))
+    assert np.array_equal(scaled, 2 * B1.pload_data[0])
+
+
+def test_memmap_profiles_removed(tmp_path):
+    registry = ProfileRegistry(memmap_dir=str(tmp_path))
+    B1 = Bus("B1")
+    B2 = Bus("B2")
+    load = np.arange(1000.0)
+    B1.add_load_data(pload_data=load)
+    B2.add_load_data(pload_data=2 * load)
+    B1.prepare_load_data(np.arange(5000), registry)
+    # Profiles added for the same time grid are written to a new file
+    B2.prepare_load_data(np.arange(5000), registry)
+    assert len(registry.file_paths) == 2
+    old_file_paths = registry.file_paths
+
+    # The files of the previous time grid are removed
+    time_indices = np.arange(2000)
+    for bus in [B1, B2]:
+        bus.prepare_load_data(time_indices, registry)
+    assert len(registry.file_paths) == 1
+    assert sorted(os.listdir(tmp_path)) == [
+        os.path.basename(registry.file_paths[0])
+    ]
+    assert not any(os.path.exists(path) for path in old_file_paths)
+    assert np.array_equal(
+        pickle.loads(pickle.dumps(B2.pload_data[0])),
+        interpolate(array=2 * load, time_indices=time_indices),
+    )
+
+    registry.close()
+    assert registry.file_paths == []
+    assert os.listdir(tmp_path) == []
+    # The profiles are prepared again after the registry is closed
+    B1.prepare_load_data(time_indices, registry)
+    assert len(os.listdir(tmp_path)) == 1
+    assert np.array_equal(
+        B1.pload_data[0],
+        interpolate(array=load, time_indices=time_indices),
+    )
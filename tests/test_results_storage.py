@@ -0,0 +1,103 @@
+import filecmp
+
+import numpy as np
+
+from relsad.results.storage import (
+    ResultsFormat,
+    ResultsWriter,
+    get_results_file,
+    read_results,
+    save_results,
+)
+from relsad.utils import HistoryColumn
+
+
+def test_save_and_read_results(tmp_path):
+    column = HistoryColumn()
+    column[0.5] = True
+    column[1.0] = False
+    entries = [
+        ("ps1", "ENS", {1: 0.5, 2: 1.5}),
+        ("B1", "ENS", {1: 0.25, 2: None}),
+        ("B1", "failed", column),
+    ]
+    for save_dir in [tmp_path / "a", tmp_path / "b"]:
+        file_path = save_results(
+            entries=entries,
+            index_name="it",
+            save_dir=str(save_dir),
+            results_format=ResultsFormat.NPZ,
+        )
+        assert get_results_file(str(save_dir)) == file_path
+    # The same results give the same file
+    assert filecmp.cmp(
+        tmp_path / "a" / "results.npz",
+        tmp_path / "b" / "results.npz",
+        shallow=False,
+    )
+
+    df = read_results(str(tmp_path / "a"))
+    assert df.columns.tolist() == ["component", "attribute", "it", "value"]
+    assert len(df) == 6
+    assert df["component"].tolist() == ["ps1"] * 2 + ["B1"] * 4
+    assert np.allclose(
+        df["value"].values,
+        [0.5, 1.5, 0.25, np.nan, 1.0, 0.0],
+        equal_nan=True,
+    )
+
+    df = read_results(
+        str(tmp_path / "a"),
+        components=["ps1", "B1"],
+        attributes=["ENS"],
+        wide=True,
+    )
+    assert df.index.tolist() == [1, 2]
+    assert df[("ps1", "ENS")].tolist() == [0.5, 1.5]
+    assert df[("B1", "ENS")].tolist()[0] == 0.25
+
+    raised = False
+    try:
+        read_results(str(tmp_path / "c"))
+    except Exception:
+        raised = True
+    assert raised
+
+
+def test_results_writer(tmp_path):
+    keys = [("ps1", "ENS"), ("B1", "ENS"), ("B1", "failed")]
+    rows = {
+        2: [0.5, 0.25, True],
+        1: [1.5, None, False],
+        3: [2.5, 0.75, True],
+    }
+    with ResultsWriter(
+        keys=keys,
+        index_name="it",
+        save_dir=str(tmp_path / "a"),
+        results_format=ResultsFormat.NPZ,
+        flush_interval=2,
+    ) as writer:
+        for it, values in rows.items():
+            writer.write(it, values)
+    assert writer.n_rows == 3
+    assert get_results_file(str(tmp_path / "a")) == writer.file_path
+    # The temporary file of the values is removed
+    assert len(list((tmp_path / "a").iterdir())) == 1
+
+    # The results are the same as when saved at once
+    save_results(
+        entries=[
+            (comp_name, attribute, {it: rows[it][idx] for it in rows})
+            for idx, (comp_name, attribute) in enumerate(keys)
+        ],
+        index_name="it",
+        save_dir=str(tmp_path / "b"),
+        results_format=ResultsFormat.NPZ,
+    )
+    written = read_results(str(tmp_path / "a"))
+    # The indices are in the order they are written
+    assert written["it"].tolist() == [2] * 3 + [1] * 3 + [3] * 3
+    assert read_results(str(tmp_path / "a"), wide=True).equals(
+        read_results(str(tmp_path / "b"), wide=True)
+    )
@@ -1,4 +1,8 @@
+import filecmp
+import os
+
 import numpy as np
+import pandas as pd
 
 from relsad.load.bus import CostFunction
 from relsad.loadflow.ac import run_bfs_load_flow
@@ -14,9 +18,26 @@ from relsad.network.components import (
     Production,
 )
 from relsad.network.systems import Distribution, PowerSystem, Transmission
-from relsad.simulation import Simulation
+from relsad.reliability.indices import CAIDI, ENS, SAIDI, SAIFI
+from relsad.results.storage import (
+    ResultsFormat,
+    get_default_results_format,
+    get_results_file,
+    read_results,
+)
+from relsad.simulation import (
+    LoadFlowBackend,
+    SamplingStrategy,
+    Simulation,
+    SimulationEngine,
+)
+from relsad.simulation.failure.batch import BatchFailureSampler
+from relsad.simulation.failure.event import EventSchedule
+from relsad.simulation.failure.importance import ImportanceFailureSampler
+from relsad.simulation.failure.table import FailProbabilityTable
+from relsad.simulation.monte_carlo.checkpoint import MonteCarloCheckpoint
 from relsad.Time import Time, TimeStamp, TimeUnit
-from relsad.utils import eq
+from relsad.utils import convert_yearly_fail_rate, eq
 
 
 def initialize_network():
@@ -197,3 +218,828 @@ def test_run_monte_carlo():
         time_unit=TimeUnit.HOUR,
         save_flag=False,
     )
+
+
+def test_run_monte_carlo_worker_pool(tmp_path):
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 50
+
+    sim = Simulation(ps, random_seed=0)
+
+    for debug in [True, False]:
+        sim.run_monte_carlo(
+            iterations=4,
+            start_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=1,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            stop_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=3,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            time_step=Time(1, TimeUnit.HOUR),
+            time_unit=TimeUnit.HOUR,
+            save_dir=str(tmp_path / str(debug)),
+            n_procs=2,
+            debug=debug,
+        )
+    n_files = 0
+    for root, _, files in os.walk(tmp_path / "True"):
+        for file in files:
+            n_files += 1
+            debug_file = os.path.join(root, file)
+            pool_file = debug_file.replace(
+                str(tmp_path / "True"), str(tmp_path / "False")
+            )
+            assert filecmp.cmp(debug_file, pool_file, shallow=False)
+    assert n_files > 0
+
+
+def test_run_monte_carlo_checkpoint(tmp_path):
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 50
+
+    sim = Simulation(ps, random_seed=0)
+    settings = {
+        "iterations": 6,
+        "start_time": TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        "stop_time": TimeStamp(
+            year=2019,
+            month=1,
+            day=3,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        "time_step": Time(1, TimeUnit.HOUR),
+        "time_unit": TimeUnit.HOUR,
+        "n_procs": 2,
+    }
+    sim.run_monte_carlo(save_dir=str(tmp_path / "reference"), **settings)
+    for debug in [True, False]:
+        save_dir = tmp_path / str(debug)
+        sim.run_monte_carlo(
+            save_dir=str(save_dir),
+            debug=debug,
+            checkpoint_interval=2,
+            **settings,
+        )
+        # Interrupt the simulation after four iterations
+        checkpoint_path = str(save_dir / "monte_carlo" / "checkpoint.pkl")
+        checkpoint = MonteCarloCheckpoint.load(checkpoint_path)
+        assert len(checkpoint.values) == 6
+        for it in [2, 5]:
+            del checkpoint.values[it]
+        checkpoint.save()
+        os.remove(get_results_file(str(save_dir / "monte_carlo")))
+        assert MonteCarloCheckpoint.load(
+            checkpoint_path
+        ).get_remaining_iterations() == [2, 5]
+
+        sim.run_monte_carlo(
+            save_dir=str(save_dir),
+            debug=debug,
+            resume=True,
+            **settings,
+        )
+        n_files = 0
+        for root, _, files in os.walk(tmp_path / "reference"):
+            for file in files:
+                n_files += 1
+                reference_file = os.path.join(root, file)
+                resumed_file = reference_file.replace(
+                    str(tmp_path / "reference"), str(save_dir)
+                )
+                assert filecmp.cmp(reference_file, resumed_file, shallow=False)
+        assert n_files > 0
+
+    # A simulation is only resumed with the settings of the checkpoint
+    for key, value in [
+        ("iterations", 8),
+        (
+            "stop_time",
+            TimeStamp(
+                year=2019,
+                month=1,
+                day=4,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+        ),
+        ("time_step", Time(2, TimeUnit.HOUR)),
+        ("save_iterations", [1]),
+    ]:
+        raised = False
+        try:
+            sim.run_monte_carlo(
+                save_dir=str(tmp_path / "True"),
+                resume=True,
+                **{**settings, key: value},
+            )
+        except Exception:
+            raised = True
+        assert raised
+    raised = False
+    try:
+        Simulation(
+            ps, random_seed=0, engine=SimulationEngine.EVENT
+        ).run_monte_carlo(
+            save_dir=str(tmp_path / "True"),
+            resume=True,
+            **settings,
+        )
+    except Exception:
+        raised = True
+    assert raised
+    # An equal time step in another unit gives the same time grid
+    sim.run_monte_carlo(
+        save_dir=str(tmp_path / "True"),
+        resume=True,
+        **{**settings, "time_step": Time(60, TimeUnit.MINUTE)},
+    )
+
+    for options in [{"stream": True}, {"max_time": 10}]:
+        message = None
+        try:
+            sim.run_monte_carlo(
+                save_dir=str(tmp_path / "stream"),
+                checkpoint_interval=2,
+                **settings,
+                **options,
+            )
+        except Exception as e:
+            message = str(e)
+        assert message == (
+            "Checkpoints are not supported in stream mode or in "
+            "adaptive mode"
+        )
+
+
+def test_run_monte_carlo_stream(tmp_path):
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 50
+
+    sim = Simulation(ps, random_seed=0)
+
+    for stream in [False, True]:
+        if stream:
+            # Streamed with the CSV results format
+            sim.results_format = ResultsFormat.CSV
+        sim.run_monte_carlo(
+            iterations=4,
+            start_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=1,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            stop_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=3,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            time_step=Time(1, TimeUnit.HOUR),
+            time_unit=TimeUnit.HOUR,
+            save_dir=str(tmp_path / str(stream)),
+            n_procs=2,
+            stream=stream,
+            chunksize=2,
+        )
+    merged = read_results(
+        str(tmp_path / "False" / "monte_carlo"),
+        components=["B2"],
+        attributes=["acc_p_energy_shed"],
+        wide=True,
+    )
+    streamed = pd.read_csv(
+        tmp_path / "True" / "monte_carlo" / "iterations.csv",
+        index_col="it",
+    ).sort_index()
+    assert streamed.index.tolist() == [1, 2, 3, 4]
+    assert np.allclose(
+        merged.iloc[:, 0].values,
+        streamed["B2/acc_p_energy_shed"].values,
+    )
+    statistics = sim.monte_carlo_statistics.get_statistics(
+        "B2", "acc_p_energy_shed"
+    )
+    assert statistics["count"] == 4
+    assert eq(statistics["mean"], merged.iloc[:, 0].mean())
+    assert eq(statistics["std"], merged.iloc[:, 0].std())
+    assert (tmp_path / "True" / "monte_carlo" / "statistics.csv").exists()
+
+    # Streamed with the default results format
+    sim.results_format = get_default_results_format()
+    sim.run_monte_carlo(
+        iterations=4,
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=3,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_dir=str(tmp_path / "default"),
+        n_procs=2,
+        stream=True,
+        chunksize=2,
+    )
+    save_dir = tmp_path / "default" / "monte_carlo"
+    assert not (save_dir / "iterations.csv").exists()
+    streamed = read_results(
+        str(save_dir),
+        components=["B2"],
+        attributes=["acc_p_energy_shed"],
+        wide=True,
+    ).sort_index()
+    assert streamed.index.tolist() == [1, 2, 3, 4]
+    assert np.allclose(merged.iloc[:, 0].values, streamed.iloc[:, 0].values)
+    statistics = read_results(
+        str(save_dir / "statistics"),
+        components=["B2"],
+        attributes=["acc_p_energy_shed"],
+        wide=True,
+    )
+    assert statistics.loc["count"].iloc[0] == 4
+    assert eq(statistics.loc["mean"].iloc[0], merged.iloc[:, 0].mean())
+
+
+def test_run_monte_carlo_results_format(tmp_path):
+    ps_names = {}
+    for results_format in [ResultsFormat.CSV, ResultsFormat.NPZ]:
+        # A new network for each run, sections disconnected at the end
+        # of a run are not reconnected when the network is reused
+        ps = initialize_network()
+        for line in ps.lines:
+            line.fail_rate_per_year = 500
+        ps_names[results_format] = ps.name
+        sim = Simulation(ps, random_seed=0, results_format=results_format)
+        sim.run_monte_carlo(
+            iterations=2,
+            start_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=1,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            stop_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=2,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            time_step=Time(1, TimeUnit.HOUR),
+            time_unit=TimeUnit.HOUR,
+            save_iterations=[1],
+            save_dir=str(tmp_path / results_format.name),
+            debug=True,
+        )
+    csv_dir = tmp_path / "CSV"
+    npz_dir = tmp_path / "NPZ"
+    csv_name = ps_names[ResultsFormat.CSV]
+    npz_name = ps_names[ResultsFormat.NPZ]
+    assert not (npz_dir / "monte_carlo" / npz_name).exists()
+
+    csv_ens = pd.read_csv(
+        csv_dir / "monte_carlo" / csv_name / "ENS.csv",
+        index_col="it",
+    )
+    npz_ens = read_results(
+        str(npz_dir / "monte_carlo"),
+        components=[npz_name],
+        attributes=["ENS"],
+        wide=True,
+    )
+    assert npz_ens.index.tolist() == csv_ens.index.tolist()
+    assert np.allclose(npz_ens.values, csv_ens.values)
+
+    csv_vomag = pd.read_csv(
+        csv_dir / "sequence" / "1" / "bus" / "vomag.csv",
+        index_col="HOUR",
+    )
+    npz_vomag = read_results(
+        str(npz_dir / "sequence" / "1"),
+        attributes=["vomag"],
+        wide=True,
+    )
+    assert len(csv_vomag) > 0
+    assert np.allclose(npz_vomag.index, csv_vomag.index)
+    for bus in ps.buses:
+        assert np.allclose(
+            npz_vomag[(bus.name, "vomag")].values,
+            csv_vomag[bus.name].values,
+        )
+
+
+def test_run_monte_carlo_adaptive(tmp_path):
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 50
+
+    sim = Simulation(ps, random_seed=0)
+    sim.run_monte_carlo(
+        iterations=100,
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=3,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_dir=str(tmp_path),
+        n_procs=2,
+        rse_targets={"ENS": 0.5},
+        batch_size=4,
+    )
+    statistics = sim.monte_carlo_statistics.get_statistics(ps.name, "ENS")
+    # The loose target is met before the iteration budget is used
+    assert statistics["count"] % 4 == 0
+    assert 4 <= statistics["count"] < 100
+    assert statistics["rse"] <= 0.5
+    assert statistics["ci_lower"] <= statistics["mean"]
+    assert statistics["mean"] <= statistics["ci_upper"]
+    streamed = read_results(str(tmp_path / "monte_carlo"), wide=True)
+    assert len(streamed) == statistics["count"]
+
+    raised = False
+    try:
+        sim.run_monte_carlo(
+            iterations=4,
+            start_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=1,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            stop_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=2,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            time_step=Time(1, TimeUnit.HOUR),
+            time_unit=TimeUnit.HOUR,
+            save_dir=str(tmp_path),
+            rse_targets={"unknown": 0.5},
+        )
+    except Exception:
+        raised = True
+    assert raised
+
+
+def test_run_sequential_event_engine(tmp_path):
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 100
+
+    sim = Simulation(ps, random_seed=0, engine=SimulationEngine.EVENT)
+
+    sim.run_sequential(
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=2,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_dir=str(tmp_path),
+    )
+    assert len(ps.history["p_energy_shed"]) > 0
+
+
+def test_event_schedule():
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 8760
+    ps.random_instance = np.random.default_rng(0)
+
+    schedule = EventSchedule(ps, TimeUnit.HOUR)
+    schedule.schedule(curr_time=0)
+    n_buses = len(ps.buses)
+    assert np.all(np.isinf(schedule.next_fail_time[:n_buses]))
+    assert np.all(np.isfinite(schedule.next_fail_time[n_buses:]))
+
+    line = ps.lines[0]
+    line.failed = True
+    schedule.schedule(curr_time=1)
+    assert np.isnan(schedule.next_fail_time[n_buses])
+
+    line.failed = False
+    schedule.schedule(curr_time=1)
+    assert schedule.next_fail_time[n_buses] > 1
+
+
+def test_event_schedule_initial_uniforms():
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 8760
+    ps.random_instance = np.random.default_rng(0)
+
+    n_entries = len(ps.buses) + len(ps.lines)
+    initial_uniforms = np.linspace(0, 0.9, n_entries)
+    schedule = EventSchedule(
+        ps, TimeUnit.HOUR, initial_uniforms=initial_uniforms
+    )
+    schedule.schedule(curr_time=0)
+    n_buses = len(ps.buses)
+    assert np.allclose(
+        schedule.next_fail_time[n_buses:],
+        -np.log1p(-initial_uniforms[n_buses:]),
+    )
+    assert schedule.initial_uniforms is None
+
+    raised = False
+    try:
+        EventSchedule(ps, TimeUnit.HOUR, initial_uniforms=np.zeros(1))
+    except Exception:
+        raised = True
+    assert raised
+
+
+def test_run_monte_carlo_sampling_strategies():
+    raised = False
+    try:
+        Simulation(
+            initialize_network(),
+            sampling_strategy=SamplingStrategy.SOBOL,
+        )
+    except Exception:
+        raised = True
+    assert raised
+
+    for strategy in SamplingStrategy:
+        histories = []
+        for _ in range(2):
+            ps = initialize_network()
+            for line in ps.lines:
+                line.fail_rate_per_year = 50
+
+            sim = Simulation(
+                ps,
+                random_seed=0,
+                engine=SimulationEngine.EVENT,
+                sampling_strategy=strategy,
+            )
+            sim.run_monte_carlo(
+                iterations=4,
+                start_time=TimeStamp(
+                    year=2019,
+                    month=1,
+                    day=1,
+                    hour=0,
+                    minute=0,
+                    second=0,
+                ),
+                stop_time=TimeStamp(
+                    year=2019,
+                    month=1,
+                    day=3,
+                    hour=0,
+                    minute=0,
+                    second=0,
+                ),
+                time_step=Time(1, TimeUnit.HOUR),
+                time_unit=TimeUnit.HOUR,
+                save_flag=False,
+                stream=True,
+                debug=True,
+            )
+            histories.append(
+                sim.monte_carlo_statistics.get_statistics(ps.name, "SAIDI")
+            )
+        assert histories[0]["count"] == 4
+        assert eq(histories[0]["mean"], histories[1]["mean"])
+
+
+def test_run_monte_carlo_event_engine():
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 100
+
+    sim = Simulation(ps, random_seed=0, engine=SimulationEngine.EVENT)
+
+    sim.run_monte_carlo(
+        iterations=5,
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=8,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_flag=False,
+    )
+
+
+def test_run_sequential_batch_engine(tmp_path):
+    histories = []
+    for _ in range(2):
+        ps = initialize_network()
+        for line in ps.lines:
+            line.fail_rate_per_year = 100
+
+        sim = Simulation(ps, random_seed=0, engine=SimulationEngine.BATCH)
+
+        sim.run_sequential(
+            start_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=1,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            stop_time=TimeStamp(
+                year=2019,
+                month=2,
+                day=1,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            time_step=Time(1, TimeUnit.HOUR),
+            time_unit=TimeUnit.HOUR,
+            save_dir=str(tmp_path),
+        )
+        histories.append(ps.history["p_energy_shed"])
+    assert len(histories[0]) > 0
+    assert histories[0] == histories[1]
+
+
+def test_batch_failure_sampler():
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 8760
+    ps.random_instance = np.random.default_rng(0)
+
+    sampler = BatchFailureSampler(ps)
+    dt = Time(1, TimeUnit.HOUR)
+    n_buses = len(ps.buses)
+    assert np.all(sampler.get_fail_probs(dt)[:n_buses] == 0)
+    assert np.allclose(sampler.get_fail_probs(dt)[n_buses:], 1)
+
+    sampler.update_fail_status(dt)
+    assert all(line.failed for line in ps.lines)
+    assert not any(bus.trafo_failed for bus in ps.buses)
+
+
+def test_fail_probability_table():
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 8760
+    ps.random_instance = np.random.default_rng(0)
+
+    time_array = np.array([1.0, 2.0, 3.0, 4.5])
+    table = FailProbabilityTable(ps, time_array, TimeUnit.HOUR)
+    assert table.step_sizes == [1.0, 1.5]
+    assert table.step_indices == [0, 0, 0, 1]
+    n_buses = len(ps.buses)
+    for inc_idx, step_size in zip([0, 3], [1.0, 1.5]):
+        dt = Time(step_size, TimeUnit.HOUR)
+        fail_probs = table.get_fail_probs(inc_idx, dt)
+        assert fail_probs[n_buses] == convert_yearly_fail_rate(
+            ps.lines[0].fail_rate_per_year, dt
+        )
+    # The time step does not match the time grid
+    assert table.get_fail_probs(3, Time(1, TimeUnit.HOUR)) is None
+    assert table.get_fail_probs(4, Time(1, TimeUnit.HOUR)) is None
+
+    table.update_fail_status(0, Time(1, TimeUnit.HOUR))
+    assert all(line.failed for line in ps.lines)
+    assert not any(bus.trafo_failed for bus in ps.buses)
+
+
+def test_importance_failure_sampler():
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 1
+    ps.random_instance = np.random.default_rng(0)
+
+    sampler = ImportanceFailureSampler(ps, importance_factors={Line: 8760})
+    dt = Time(1, TimeUnit.HOUR)
+    sampled_probs, _, _ = sampler.get_sampled_probs(dt)
+    n_buses = len(ps.buses)
+    assert np.all(sampled_probs[:n_buses] == 0)
+    assert np.allclose(sampled_probs[n_buses:], 1)
+
+    sampler.update_fail_status(dt)
+    assert all(line.failed for line in ps.lines)
+    p_fail = sampler.get_fail_probs(dt)[n_buses]
+    assert np.isclose(sampler.get_likelihood_ratio(), p_fail ** len(ps.lines))
+
+    raised = False
+    try:
+        ImportanceFailureSampler(ps, importance_factors={Line: 0})
+    except Exception:
+        raised = True
+    assert raised
+
+
+def test_run_monte_carlo_importance_engine(tmp_path):
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 5
+
+    raised = False
+    try:
+        Simulation(ps, engine=SimulationEngine.IMPORTANCE)
+    except Exception:
+        raised = True
+    assert raised
+
+    sim = Simulation(
+        ps,
+        random_seed=0,
+        engine=SimulationEngine.IMPORTANCE,
+        importance_factors={Line: 10},
+    )
+    sim.run_monte_carlo(
+        iterations=4,
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=3,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_dir=str(tmp_path),
+        debug=True,
+    )
+    ratios = read_results(
+        str(tmp_path / "monte_carlo"),
+        components=[ps.name],
+        attributes=["likelihood_ratio"],
+    )["value"]
+    assert len(ratios) == 4
+    assert np.all(ratios > 0)
+    assert not np.allclose(ratios, 1)
+
+
+def test_run_sequential_vectorized_load_flow(tmp_path):
+    histories = []
+    for load_flow_backend in [
+        LoadFlowBackend.BFS,
+        LoadFlowBackend.VECTORIZED_BFS,
+    ]:
+        ps = initialize_network()
+        for line in ps.lines:
+            line.fail_rate_per_year = 100
+
+        sim = Simulation(
+            ps,
+            random_seed=0,
+            load_flow_backend=load_flow_backend,
+        )
+
+        sim.run_sequential(
+            start_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=1,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            stop_time=TimeStamp(
+                year=2019,
+                month=1,
+                day=8,
+                hour=0,
+                minute=0,
+                second=0,
+            ),
+            time_step=Time(1, TimeUnit.HOUR),
+            time_unit=TimeUnit.HOUR,
+            save_dir=str(tmp_path),
+        )
+        histories.append(ps.history["p_energy_shed"])
+    assert len(histories[0]) > 0
+    assert histories[0].keys() == histories[1].keys()
+    assert np.allclose(
+        list(histories[0].values()), list(histories[1].values())
+    )
+
+
+def test_run_sequential_index_accumulators(tmp_path):
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 100
+
+    sim = Simulation(ps, random_seed=0)
+
+    sim.run_sequential(
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=8,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_dir=str(tmp_path),
+    )
+    assert len(ps.history["SAIFI"]) > 0
+    for network in [ps] + ps.child_network_list:
+        index_accumulator = ps.index_accumulators[network.name]
+        assert eq(index_accumulator.get_SAIFI(), SAIFI(network))
+        assert eq(index_accumulator.get_SAIDI(), SAIDI(network))
+        assert eq(index_accumulator.get_CAIDI(), CAIDI(network))
+        assert eq(index_accumulator.get_ENS(), ENS(network))
+    assert ENS(ps) > 0
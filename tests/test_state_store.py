@@ -0,0 +1,197 @@
+import pickle
+
+import numpy as np
+
+from relsad.energy import _gather_bounds, _get_structure
+from relsad.load.bus import CostFunction
+from relsad.loadflow.ac import run_bfs_load_flow, run_vectorized_bfs_load_flow
+from relsad.network.components import (
+    Bus,
+    CircuitBreaker,
+    Line,
+    ManualMainController,
+)
+from relsad.network.containers import StoredBus, StoredLine
+from relsad.network.systems import Distribution, PowerSystem, Transmission
+from relsad.simulation import Simulation
+from relsad.Time import Time, TimeStamp, TimeUnit
+from relsad.utils import eq
+
+
+def initialize_network():
+
+    C1 = ManualMainController(name="C1", sectioning_time=Time(0))
+
+    ps = PowerSystem(C1)
+
+    B1 = Bus(name="B1", n_customers=0, coordinate=[0, 0])
+    B2 = Bus(name="B2", n_customers=1, coordinate=[0, -1])
+    B3 = Bus(name="B3", n_customers=1, coordinate=[0, -2])
+    B4 = Bus(name="B4", n_customers=1, coordinate=[1, -3])
+
+    r = 0.5
+    x = 0.5
+
+    L1 = Line(name="L1", fbus=B1, tbus=B2, r=r, x=x)
+    L2 = Line(name="L2", fbus=B2, tbus=B3, r=r, x=x)
+    L3 = Line(name="L3", fbus=B3, tbus=B4, r=r, x=x)
+
+    CircuitBreaker("E1", L1)
+
+    tn = Transmission(ps, trafo_bus=B1)
+    dn = Distribution(parent_network=tn, connected_line=L1)
+    dn.add_buses([B2, B3, B4])
+    dn.add_lines([L2, L3])
+
+    household = CostFunction(
+        A=8.8,
+        B=14.7,
+    )
+    for bus in [B2, B3, B4]:
+        bus.add_load_data(
+            pload_data=np.ones(2) * 0.05,
+            cost_function=household,
+        )
+    return ps
+
+
+def test_enable_state_store():
+    ps = initialize_network()
+    B2 = ps.get_comp("B2")
+    L2 = ps.get_comp("L2")
+    B2.vomag = 0.9
+    L2.failed = True
+
+    store = ps.enable_state_store()
+    assert isinstance(B2, Bus)
+    assert isinstance(B2, StoredBus)
+    assert isinstance(L2, StoredLine)
+    assert B2.vomag == 0.9
+    assert L2.failed is True
+
+    idx = store.get_bus_indices([B2])[0]
+    assert store.get_bus_array("vomag")[idx] == 0.9
+    store.get_bus_array("vomag")[idx] = 0.95
+    assert B2.vomag == 0.95
+    B2.vomag = 0.97
+    assert store.get_bus_array("vomag")[idx] == 0.97
+    assert ps.failed_comp()
+
+    ps.reset_load_flow_data()
+    assert B2.vomag == 1.0
+
+    ps.disable_state_store()
+    assert type(B2) is Bus
+    assert type(L2) is Line
+    assert B2.vomag == 1.0
+    assert L2.failed is True
+
+
+def test_state_store_add_bus():
+    ps = initialize_network()
+    ps.enable_state_store()
+    raised = False
+    try:
+        ps.add_bus(Bus(name="B5"))
+    except Exception:
+        raised = True
+    assert raised
+
+
+def test_state_store_pickle():
+    ps = initialize_network()
+    ps.enable_state_store()
+    ps_copy = pickle.loads(pickle.dumps(ps))
+    B2 = ps_copy.get_comp("B2")
+    B2.vomag = 0.9
+    idx = ps_copy.state_store.get_bus_indices([B2])[0]
+    assert ps_copy.state_store.get_bus_array("vomag")[idx] == 0.9
+    assert ps.get_comp("B2").vomag == 1.0
+
+
+def test_state_store_load_flow():
+    results = []
+    for enable in [False, True]:
+        ps = initialize_network()
+        if enable:
+            ps.enable_state_store()
+        ps.set_load_and_cost(inc_idx=0)
+        run_bfs_load_flow(ps)
+        results.append([bus.vomag for bus in ps.buses])
+    assert all(eq(a, b) for a, b in zip(*results))
+
+
+def test_state_store_vectorized_load_flow():
+    results = []
+    for enable in [False, True]:
+        ps = initialize_network()
+        if enable:
+            ps.enable_state_store()
+        ps.set_load_and_cost(inc_idx=0)
+        for _ in range(2):
+            run_vectorized_bfs_load_flow(ps)
+        results.append(
+            [
+                (
+                    bus.vomag,
+                    bus.voang,
+                    bus.p_load_downstream,
+                    bus.q_loss_downstream,
+                )
+                for bus in ps.buses
+            ]
+            + [(line.ploss, line.qloss) for line in ps.lines]
+        )
+    assert results[0] == results[1]
+
+
+def test_state_store_gather_bounds():
+    results = []
+    for enable in [False, True]:
+        ps = initialize_network()
+        if enable:
+            ps.enable_state_store()
+        ps.get_comp("L3").capacity = 0.01
+        ps.set_load_and_cost(inc_idx=0)
+        run_vectorized_bfs_load_flow(ps)
+        structure = _get_structure(ps)
+        line_idx = len(structure.buses) + structure.lines.index(
+            ps.get_comp("L3")
+        )
+        results.append(_gather_bounds(ps, 1e-7, structure, ps.state_store))
+    # The bounds of the lines are found from the bus voltages in the
+    # arrays of the store
+    assert np.allclose(results[0][0], results[1][0], rtol=1e-12, atol=0)
+    assert np.allclose(results[0][1], results[1][1], rtol=1e-12, atol=0)
+    assert results[1][0][line_idx, 1] == 0.01
+
+
+def test_state_store_simulation():
+    ps = initialize_network()
+    for line in ps.lines:
+        line.fail_rate_per_year = 100
+    ps.enable_state_store()
+
+    sim = Simulation(ps, random_seed=0)
+    sim.run_monte_carlo(
+        iterations=2,
+        start_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=1,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        stop_time=TimeStamp(
+            year=2019,
+            month=1,
+            day=8,
+            hour=0,
+            minute=0,
+            second=0,
+        ),
+        time_step=Time(1, TimeUnit.HOUR),
+        time_unit=TimeUnit.HOUR,
+        save_flag=False,
+    )
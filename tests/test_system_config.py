@@ -19,9 +19,13 @@ from relsad.network.systems import (
     Transmission,
 )
 from relsad.simulation.system_config import (
+    connect_backup_lines,
     find_sub_systems,
+    get_sub_system_signature,
+    restore_sub_system_slack,
     set_slack,
     update_backup_lines_between_sub_systems,
+    update_sub_system_slack,
 )
 from relsad.Time import Time, TimeUnit
 from relsad.utils import eq
@@ -142,3 +146,92 @@ def test_find_sub_systems_fail():
     assert ps.get_comp("B4") in ps.sub_systems[0].buses
     assert ps.get_comp("B5") in ps.sub_systems[0].buses
     assert ps.get_comp("B6") in ps.sub_systems[0].buses
+
+
+def test_find_sub_systems_split():
+    ps = initialize_network()
+
+    curr_time = Time(0)
+
+    ps.get_comp("L2").disconnect()
+    ps.get_comp("L3").disconnect()
+    ps.get_comp("L6").fail(Time(1, TimeUnit.HOUR))
+
+    find_sub_systems(ps, curr_time)
+
+    assert [
+        [bus.name for bus in sub_system.buses] for sub_system in ps.sub_systems
+    ] == [["B1", "B2"], ["B3", "B6"], ["B4", "B5"]]
+    assert [
+        [line.name for line in sub_system.lines]
+        for sub_system in ps.sub_systems
+    ] == [["L1"], ["L5"], ["L4"]]
+    assert [
+        [type(network) for network in sub_system.child_network_list]
+        for sub_system in ps.sub_systems
+    ] == [
+        [Transmission, Distribution],
+        [Distribution, Distribution],
+        [Distribution, Distribution],
+    ]
+    assert ps.get_comp("E1") in ps.sub_systems[0].circuitbreakers
+
+
+def test_find_sub_systems_cyclic():
+    ps = initialize_network()
+
+    curr_time = Time(0)
+
+    ps.get_comp("L6").connect()
+
+    find_sub_systems(ps, curr_time)
+
+    assert len(ps.sub_systems) == 1
+    assert len(ps.sub_systems[0].buses) == len(ps.buses)
+    assert len(ps.sub_systems[0].lines) == len(ps.lines)
+    assert ps.get_comp("D1") in ps.sub_systems[0].disconnectors
+
+
+def test_find_sub_systems_backup_lines():
+    ps = initialize_network()
+
+    curr_time = Time(0)
+
+    L6 = ps.get_comp("L6")
+    ps.get_comp("L3").disconnect()
+    signature = get_sub_system_signature(ps)
+
+    backup_lines = find_sub_systems(ps, curr_time)
+
+    assert backup_lines == [L6]
+    assert L6.connected
+    assert get_sub_system_signature(ps) != signature
+
+    ps.get_comp("D1").open()
+    assert not L6.connected
+    assert get_sub_system_signature(ps) == signature
+
+    connect_backup_lines(backup_lines)
+    assert L6.connected
+    assert not ps.get_comp("D1").is_open
+
+
+def test_restore_sub_system_slack():
+    ps = initialize_network()
+
+    curr_time = Time(0)
+
+    ps.get_comp("L2").disconnect()
+    ps.get_comp("L3").disconnect()
+    ps.get_comp("L6").fail(Time(1, TimeUnit.HOUR))
+
+    find_sub_systems(ps, curr_time)
+    update_sub_system_slack(ps)
+    slack_buses = [sub_system.slack for sub_system in ps.sub_systems]
+    is_slack = [bus.is_slack for bus in ps.buses]
+
+    restore_sub_system_slack(ps)
+
+    assert slack_buses == [ps.get_comp("B1"), None, None]
+    assert [sub_system.slack for sub_system in ps.sub_systems] == slack_buses
+    assert [bus.is_slack for bus in ps.buses] == is_slack
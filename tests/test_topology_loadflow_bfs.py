@@ -15,7 +15,9 @@ from relsad.network.systems import (
     PowerSystem,
     Transmission,
 )
+from relsad.loadflow.ac import run_bfs_load_flow
 from relsad.topology.load_flow.bfs import is_cyclic
+from relsad.topology.load_flow.cache import TopologyCache
 from relsad.Time import Time, TimeUnit
 
 
@@ -130,3 +132,47 @@ def test_is_cyclic_3():
     L7.disconnect()
 
     assert is_cyclic(ps) is False
+
+
+def test_topology_cache():
+    ps = initialize_network()
+
+    L2 = ps.get_comp("L2")
+    L5 = ps.get_comp("L5")
+    L6 = ps.get_comp("L6")
+    L7 = ps.get_comp("L7")
+
+    L6.disconnect()
+    L7.disconnect()
+    for bus in ps.buses:
+        bus.add_load(pload=0.02, qload=0)
+
+    topology_cache = TopologyCache(maxsize=1)
+    run_bfs_load_flow(ps, topology_cache=topology_cache)
+    vomag = {bus.name: bus.vomag for bus in ps.buses}
+    assert topology_cache.hits == 0
+    assert topology_cache.misses == 1
+
+    L2.change_direction()
+    ps.reset_load_flow_data()
+    run_bfs_load_flow(ps, topology_cache=topology_cache)
+    assert topology_cache.hits == 1
+    assert topology_cache.misses == 1
+    assert L2.fbus.name == "B2"
+    assert ps.buses[0].is_slack
+    assert all(bus.vomag == vomag[bus.name] for bus in ps.buses)
+
+    L5.disconnect()
+    run_bfs_load_flow(ps, topology_cache=topology_cache)
+    assert topology_cache.hits == 1
+    assert topology_cache.misses == 2
+    assert len(topology_cache.entries) == 1
+
+    L6.connect()
+    L7.connect()
+    raised = False
+    try:
+        run_bfs_load_flow(ps, topology_cache=topology_cache)
+    except Exception:
+        raised = True
+    assert raised
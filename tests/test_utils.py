@@ -1,7 +1,13 @@
 import numpy as np
 
 from relsad.Time import Time, TimeUnit
-from relsad.utils import convert_yearly_fail_rate, eq, interpolate
+from relsad.utils import (
+    History,
+    HistoryColumn,
+    convert_yearly_fail_rate,
+    eq,
+    interpolate,
+)
 
 
 def test_eq():
@@ -47,3 +53,60 @@ def test_convert_yearly_fail_rate():
         ),
         0.07 / 8760 / 60 / 60,
     )
+
+
+def test_history():
+    history = History(capacity=4)
+    history["p"] = {}
+    assert isinstance(history["p"], HistoryColumn)
+    assert list(history) == ["p"]
+    for time in range(1, 7):
+        history["p"][time] = 2 * time
+    assert len(history["p"]) == 6
+    assert history["p"][3] == 6
+    assert history["p"] == {time: 2 * time for time in range(1, 7)}
+    # Recording at an earlier time replaces the value
+    history["p"][3] = 0
+    assert history["p"][3] == 0
+    assert len(history["p"]) == 6
+    # Recording at a new earlier time appends the value
+    history["p"][0.5] = 1
+    assert list(history["p"].keys()) == [1, 2, 3, 4, 5, 6, 0.5]
+    # Resetting an attribute starts an empty column
+    history["p"] = {}
+    assert len(history["p"]) == 0
+    raised = False
+    try:
+        history["p"][1]
+    except KeyError:
+        raised = True
+    assert raised
+
+
+def test_history_column_dtype():
+    column = HistoryColumn()
+    column[1] = 1
+    assert column.get_values().dtype == np.int64
+    column[2] = 0.5
+    assert column.get_values().dtype == np.float64
+    assert list(column.values()) == [1.0, 0.5]
+    column = HistoryColumn()
+    column[1] = True
+    assert column.get_values().dtype == np.bool_
+    column[2] = None
+    assert column.get_values().dtype == object
+    assert list(column.values()) == [True, None]
+
+
+def test_history_reserve():
+    history = History()
+    history["p"] = {}
+    history["p"][1] = 1.0
+    history.reserve(100)
+    history["q"] = {}
+    history["q"][1] = 1.0
+    for column in history.values():
+        column[2] = 2.0
+        assert len(column.get_values()) == 2
+        assert len(column._values.array) >= 100
+        assert column == {1: 1.0, 2: 2.0}